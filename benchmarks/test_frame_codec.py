@@ -0,0 +1,76 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import (
+    absolute_import, unicode_literals, print_function, division
+)
+
+import pytest
+
+from tchannel import frame
+from tchannel import messages
+from tchannel.io import BytesIO
+from tchannel.messages import CallRequestMessage
+
+
+@pytest.fixture(params=[0, 1024, 16 * 1024, 60 * 1024],
+                ids=lambda size: '%dB' % size)
+def payload(request):
+    # Messages are fragmented before they are framed, so a frame is at most
+    # 64 KiB.
+    return b'x' * request.param
+
+
+def message(payload):
+    return CallRequestMessage(
+        service=b'service',
+        headers={b'as': b'thrift', b'cn': b'caller'},
+        args=[b'endpoint', b'', payload],
+    )
+
+
+def encode(message):
+    payload = messages.RW[message.message_type].write(
+        message, BytesIO()
+    ).getvalue()
+    f = frame.Frame(
+        header=frame.FrameHeader(
+            message_type=message.message_type,
+            message_id=1,
+        ),
+        payload=payload,
+    )
+    return frame.frame_rw.write(f, BytesIO()).getvalue()
+
+
+def decode(body):
+    f = frame.frame_rw.read(BytesIO(body))
+    return messages.RW[f.header.message_type].read(BytesIO(f.payload))
+
+
+def test_encode(benchmark, payload):
+    benchmark(encode, message(payload))
+
+
+def test_decode(benchmark, payload):
+    body = encode(message(payload))
+    assert decode(body).args[2] == message(payload).args[2]
+
+    benchmark(decode, body)
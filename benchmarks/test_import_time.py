@@ -0,0 +1,49 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import (
+    absolute_import, unicode_literals, print_function, division
+)
+
+import subprocess
+import sys
+
+# Seconds ``import tchannel`` may take in a fresh interpreter. Deferring
+# thriftrw, crcmod and tornado.web brought it from ~300ms to ~130ms; this
+# catches any of them creeping back in.
+IMPORT_BUDGET = 0.25
+
+_SCRIPT = (
+    'import time; t = time.time(); import tchannel; print(time.time() - t)'
+)
+
+
+def _import_time():
+    return float(subprocess.check_output([sys.executable, '-c', _SCRIPT]))
+
+
+def test_import_tchannel(benchmark):
+    durations = []
+    benchmark.pedantic(
+        lambda: durations.append(_import_time()), rounds=10, iterations=1,
+    )
+
+    benchmark.extra_info['import_time'] = min(durations)
+    assert min(durations) < IMPORT_BUDGET
@@ -0,0 +1,46 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import (
+    absolute_import, unicode_literals, print_function, division
+)
+
+from tchannel.tornado.stream import InMemStream
+
+
+def write_read(chunks):
+    stream = InMemStream()
+    for chunk in chunks:
+        stream.write(chunk)
+    stream.close()
+
+    # Reads resolve immediately once the stream is closed.
+    read = 0
+    chunk = stream.read().result()
+    while chunk:
+        read += len(chunk)
+        chunk = stream.read().result()
+    return read
+
+
+def test_write_read(benchmark, payload):
+    chunks = [payload[i:i + 1024] for i in range(0, len(payload), 1024)]
+
+    assert benchmark(write_read, chunks) == len(payload)
@@ -0,0 +1,58 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import (
+    absolute_import, unicode_literals, print_function, division
+)
+
+from tchannel.messages import CallRequestMessage
+from tchannel.tornado.message_factory import MessageFactory
+
+
+def message(payload):
+    return CallRequestMessage(
+        service=b'service',
+        headers={b'as': b'raw'},
+        args=[b'endpoint', b'', payload],
+    )
+
+
+def test_fragment(benchmark, payload):
+    # fragment() consumes the args of the message, so every round needs a
+    # new one.
+    def setup():
+        return (MessageFactory(), message(payload)), {}
+
+    def fragment(factory, message):
+        return list(factory.fragment(message))
+
+    benchmark.pedantic(fragment, setup=setup, rounds=200)
+
+
+def test_build(benchmark, payload):
+    def setup():
+        fragments = list(MessageFactory().fragment(message(payload)))
+        return (MessageFactory(), fragments), {}
+
+    def build(factory, fragments):
+        for fragment in fragments:
+            factory.build(fragment)
+
+    benchmark.pedantic(build, setup=setup, rounds=200)
@@ -0,0 +1,79 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import (
+    absolute_import, unicode_literals, print_function, division
+)
+
+import random
+
+import pytest
+
+from tchannel.peer_heap import PeerHeap
+
+
+class FakePeer(object):
+
+    __slots__ = ('rank', 'order', 'index')
+
+    def __init__(self, rank):
+        self.rank = rank
+        self.order = 0
+        self.index = -1
+
+
+@pytest.fixture(params=[10, 1000, 100000], ids=lambda n: '%d-peers' % n)
+def heap(request):
+    heap = PeerHeap()
+    for _ in range(request.param):
+        heap.push_peer(FakePeer(random.randint(0, 1000)))
+    return heap
+
+
+def test_push_pop(benchmark, heap):
+    def push_pop():
+        heap.push_peer(heap.pop_peer())
+
+    benchmark(push_pop)
+
+
+def test_update(benchmark, heap):
+    def update():
+        peer = heap.peers[random.randint(0, heap.size() - 1)]
+        peer.rank = random.randint(0, 1000)
+        heap.update_peer(peer)
+
+    benchmark(update)
+
+
+def test_smallest_peer(benchmark, heap):
+    # worst case: only the largest peers match
+    threshold = sorted(p.rank for p in heap.peers)[-1]
+
+    benchmark(heap.smallest_peer, lambda p: p.rank >= threshold)
+
+
+def test_add_and_shuffle(benchmark, heap):
+    def add_remove():
+        peer = FakePeer(random.randint(0, 1000))
+        heap.add_and_shuffle(peer)
+        heap.remove_peer(peer)
+
+    benchmark(add_remove)
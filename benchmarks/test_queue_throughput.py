@@ -0,0 +1,62 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import (
+    absolute_import, unicode_literals, print_function, division
+)
+
+from tornado import gen, ioloop
+
+from tchannel._queue import Queue
+
+
+NUM_ITEMS = 1000
+
+
+def test_put_then_get(benchmark):
+    loop = ioloop.IOLoop.current()
+    queue = Queue()
+
+    @gen.coroutine
+    def put_then_get():
+        yield [queue.put(i) for i in range(NUM_ITEMS)]
+        for _ in range(NUM_ITEMS):
+            queue.get_nowait()
+
+    benchmark(lambda: loop.run_sync(put_then_get))
+
+
+def test_producer_consumer(benchmark):
+    loop = ioloop.IOLoop.current()
+    queue = Queue()
+
+    @gen.coroutine
+    def consume():
+        for _ in range(NUM_ITEMS):
+            yield queue.get()
+
+    @gen.coroutine
+    def produce():
+        consumer = consume()
+        for i in range(NUM_ITEMS):
+            yield queue.put(i)
+        yield consumer
+
+    benchmark(lambda: loop.run_sync(produce))
@@ -0,0 +1,89 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import (
+    absolute_import, unicode_literals, print_function, division
+)
+
+import pytest
+
+from tchannel import thrift
+from tchannel.serializer.json import JsonSerializer
+
+
+service = thrift.load(
+    path='examples/guide/keyvalue/service.thrift',
+    service='benchmark-server',
+)
+
+HEADERS = {'cn': 'caller', 'shard-key': 'key', 'request-id': '42'}
+
+
+@pytest.fixture(params=[1, 100, 10000], ids=lambda n: '%d-items' % n)
+def body(request):
+    return {'key-%d' % i: 'value-%d' % i for i in range(request.param)}
+
+
+def test_json_body(benchmark, body):
+    serializer = JsonSerializer()
+
+    def roundtrip():
+        return serializer.deserialize_body(serializer.serialize_body(body))
+
+    assert benchmark(roundtrip) == body
+
+
+def test_json_header(benchmark):
+    serializer = JsonSerializer()
+
+    def roundtrip():
+        return serializer.deserialize_header(
+            serializer.serialize_header(HEADERS)
+        )
+
+    assert benchmark(roundtrip) == HEADERS
+
+
+@pytest.mark.parametrize('size', [10, 1024, 64 * 1024])
+def test_thrift_body(benchmark, size):
+    request = service.KeyValue.setValue('key', 'x' * size)
+    serializer = request.get_serializer()
+    # deserializes the arguments, as a server would
+    args_serializer = type(serializer)(
+        serializer.module, type(request.call_args),
+    )
+
+    def roundtrip():
+        return args_serializer.deserialize_body(
+            serializer.serialize_body(request.call_args)
+        )
+
+    assert benchmark(roundtrip) == request.call_args
+
+
+def test_thrift_header(benchmark):
+    serializer = service.KeyValue.getValue('key').get_serializer()
+
+    def roundtrip():
+        return serializer.deserialize_header(
+            serializer.serialize_header(HEADERS)
+        )
+
+    assert benchmark(roundtrip) == HEADERS
@@ -68,7 +68,8 @@ setup(
     },
     entry_points={
         'console_scripts': [
-            'tcurl.py = tchannel.tcurl:start_ioloop'
+            'tcurl.py = tchannel.tcurl:start_ioloop',
+            'tchannel-bench = tchannel.bench:start',
         ]
     },
 )
@@ -47,7 +47,7 @@ class Node(object):
 class Queue(object):
     """An unbounded, thread-safe asynchronous queue."""
 
-    __slots__ = ('_get', '_put', '_lock')
+    __slots__ = ('_get', '_put', '_lock', '_size')
 
     # How this works:
     #
@@ -104,6 +104,13 @@ class Queue(object):
         self._put = Future()
         self._put.set_result(hole)
 
+        # Number of values put in the queue and not retrieved yet.
+        self._size = 0
+
+    def qsize(self):
+        """Number of values in the queue that haven't been retrieved yet."""
+        return self._size
+
     def put(self, value):
         """Puts an item into the queue.
 
@@ -126,6 +133,7 @@ class Queue(object):
                 return answer.set_exc_info(future.exc_info())
 
             old_hole = put.result()
+            self._size += 1
             old_hole.set_result(Node(value, new_hole))
             answer.set_result(None)
 
@@ -153,6 +161,7 @@ class Queue(object):
         node = hole.result()
         value = node.value
         new_hole, node.next = node.next, None
+        self._size -= 1
         new_get.set_result(new_hole)
         return value
 
@@ -176,6 +185,7 @@ class Queue(object):
             node = future.result()
             value = node.value
             new_hole, node.next = node.next, None
+            self._size -= 1
             new_get.set_result(new_hole)
             answer.set_result(value)
 
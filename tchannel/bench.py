@@ -0,0 +1,367 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+tchannel-bench: load generator for tchannel applications
+
+Calls are made either at a fixed rate (--rate), regardless of how long they
+take, or by a fixed number of concurrent callers (--concurrency), each making
+a new call as soon as the previous one is done.
+
+examples:
+
+    50 concurrent callers making JSON calls to "larry" for 30 seconds:
+
+      tchannel-bench --service larry --endpoint nyuck --concurrency 50 \\
+      --duration 30
+
+
+    1000 Thrift calls per second to "larry", from 4 processes:
+
+      tchannel-bench --thrift larry.thrift --service larry \\
+      --endpoint Larry::nyuck --body '{"nyuck": "nyuck"}' --rate 1000 \\
+      --processes 4
+"""
+
+from __future__ import absolute_import
+
+import argparse
+import collections
+import json
+import multiprocessing
+import sys
+import time
+
+import tornado.gen
+import tornado.ioloop
+
+from . import TChannel
+from . import thrift
+from .errors import TChannelError
+from .metrics import Histogram
+from .tcurl import Formatter
+from .tcurl import add_request_arguments
+from .tcurl import check_request_arguments
+
+#: Percentiles of the latency that are reported.
+PERCENTILES = (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('p999', 0.999))
+
+# How often calls are issued when running at a fixed rate, in seconds.
+_TICK = 0.005
+
+
+def parse_args(args=None):
+
+    args = args or sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=Formatter,
+    )
+
+    add_request_arguments(parser)
+
+    load_group = parser.add_argument_group('load')
+
+    load_group.add_argument(
+        "--rate", "-r",
+        dest="rate",
+        type=float,
+        default=None,
+        help=(
+            "Number of calls to make per second, across all processes. "
+            "Incompatible with --concurrency."
+        ),
+    )
+
+    load_group.add_argument(
+        "--concurrency", "-c",
+        dest="concurrency",
+        type=int,
+        default=None,
+        help=(
+            "Number of calls in flight at any time, per process. Defaults to "
+            "10 unless --rate is given."
+        ),
+    )
+
+    load_group.add_argument(
+        "--duration", "-d",
+        dest="duration",
+        type=float,
+        default=10.0,
+        help="Number of seconds to run for.",
+    )
+
+    load_group.add_argument(
+        "--processes", "-n",
+        dest="processes",
+        type=int,
+        default=1,
+        help="Number of processes to make calls from.",
+    )
+
+    parser.add_argument(
+        "--json",
+        dest="json",
+        action="store_true",
+        help="Print the results as JSON.",
+    )
+
+    args = parser.parse_args(args)
+    args = check_request_arguments(parser, args)
+
+    if args.rate is not None and args.concurrency is not None:
+        return parser.error("can't use --rate and --concurrency together")
+
+    if args.rate is None and args.concurrency is None:
+        args.concurrency = 10
+
+    if args.processes < 1:
+        return parser.error("--processes must be at least 1")
+
+    if args.thrift:
+        # Only the path is needed, and it can be sent to other processes.
+        args.thrift = args.thrift.name
+
+    return args
+
+
+class Stats(object):
+    """Results of a benchmark run.
+
+    Latencies of successful calls are recorded in microseconds; failed calls
+    are counted by error.
+    """
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors = collections.Counter()
+        self.elapsed = 0.0
+
+    @property
+    def calls(self):
+        return self.latency.count + sum(self.errors.values())
+
+    def record(self, started, future):
+        if future.exception() is None:
+            self.latency.record(int((time.time() - started) * 1000000))
+        else:
+            self.errors[_error_key(future.exception())] += 1
+
+    def merge(self, other):
+        self.latency.merge(other.latency)
+        self.errors.update(other.errors)
+        self.elapsed = max(self.elapsed, other.elapsed)
+
+    def to_dict(self):
+        return {
+            'calls': self.calls,
+            'successes': self.latency.count,
+            'elapsed': self.elapsed,
+            'throughput': self.calls / self.elapsed if self.elapsed else 0,
+            'latency_ms': _latency_ms(self.latency),
+            'errors': dict(self.errors),
+        }
+
+    def __getstate__(self):
+        latency = self.latency
+        return (
+            latency.buckets, latency.count, latency.sum, latency.max,
+            dict(self.errors), self.elapsed,
+        )
+
+    def __setstate__(self, state):
+        self.__init__()
+        latency = self.latency
+        (
+            latency.buckets, latency.count, latency.sum, latency.max,
+            errors, self.elapsed,
+        ) = state
+        self.errors.update(errors)
+
+
+def _latency_ms(latency):
+    result = {
+        name: latency.percentile(q) / 1000.0 for name, q in PERCENTILES
+    }
+    result['max'] = latency.max / 1000.0
+    result['mean'] = (
+        latency.sum / 1000.0 / latency.count if latency.count else 0.0
+    )
+    return result
+
+
+def _error_key(error):
+    if isinstance(error, TChannelError) and error.code is not None:
+        return '%s (0x%02x)' % (type(error).__name__, error.code)
+    return type(error).__name__
+
+
+def make_call(tchannel, args):
+    """Return a function that makes the call described by ``args``."""
+    if args.thrift:
+        thrift_service_name, thrift_method_name = args.endpoint.split('::')
+        thrift_module = thrift.load(
+            path=args.thrift,
+            service=args.service,
+            hostport=args.host,
+        )
+        thrift_method = getattr(
+            getattr(thrift_module, thrift_service_name), thrift_method_name
+        )
+        body = args.body or {}
+
+        return lambda: tchannel.thrift(
+            thrift_method(**body),
+            headers=args.headers,
+            timeout=args.timeout,
+        )
+
+    scheme = tchannel.raw if args.raw else tchannel.json
+    return lambda: scheme(
+        service=args.service,
+        endpoint=args.endpoint,
+        body=args.body,
+        headers=args.headers,
+        timeout=args.timeout,
+        hostport=args.host,
+    )
+
+
+@tornado.gen.coroutine
+def run(args, rate=None, concurrency=None):
+    """Make calls for ``args.duration`` seconds and return their Stats.
+
+    :param rate:
+        Number of calls to make per second.
+    :param concurrency:
+        Number of calls to keep in flight. Ignored if ``rate`` is given.
+    """
+    tchannel = TChannel(name='tchannel-bench')
+    call = make_call(tchannel, args)
+    stats = Stats()
+    io_loop = tornado.ioloop.IOLoop.current()
+
+    def issue():
+        started = time.time()
+        future = call()
+        io_loop.add_future(future, lambda f: stats.record(started, f))
+        return future
+
+    start = time.time()
+    deadline = start + args.duration
+
+    if rate:
+        in_flight = set()
+        issued = 0
+        now = start
+        while now < deadline:
+            for _ in xrange(int((now - start) * rate) - issued):
+                future = issue()
+                in_flight.add(future)
+                future.add_done_callback(in_flight.discard)
+                issued += 1
+            yield tornado.gen.sleep(_TICK)
+            now = time.time()
+        for future in list(in_flight):
+            try:
+                yield future
+            except Exception:
+                pass  # recorded by issue
+    else:
+        @tornado.gen.coroutine
+        def caller():
+            while time.time() < deadline:
+                try:
+                    yield issue()
+                except Exception:
+                    pass  # recorded by issue
+
+        yield [caller() for _ in xrange(concurrency)]
+
+    stats.elapsed = time.time() - start
+    tchannel.close()
+    raise tornado.gen.Return(stats)
+
+
+def _run_process(args):
+    io_loop = tornado.ioloop.IOLoop()
+    io_loop.make_current()
+    rate = args.rate / args.processes if args.rate else None
+    try:
+        return io_loop.run_sync(
+            lambda: run(args, rate=rate, concurrency=args.concurrency)
+        )
+    finally:
+        io_loop.close(all_fds=True)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.processes == 1:
+        stats = _run_process(args)
+    else:
+        pool = multiprocessing.Pool(args.processes)
+        try:
+            results = pool.map(_run_process, [args] * args.processes)
+        finally:
+            pool.close()
+            pool.join()
+
+        stats = Stats()
+        for result in results:
+            stats.merge(result)
+
+    result = stats.to_dict()
+    if args.json:
+        print json.dumps(result, indent=2, sort_keys=True)
+    else:
+        print format_result(result)
+    return result
+
+
+def format_result(result):
+    lines = [
+        'calls:      %d in %.2fs (%.1f/s)' % (
+            result['calls'], result['elapsed'], result['throughput'],
+        ),
+        'successes:  %d' % result['successes'],
+        'latency (ms):',
+    ]
+    latency = result['latency_ms']
+    for key in [name for name, _ in PERCENTILES] + ['max', 'mean']:
+        lines.append('  %-8s  %.3f' % (key, latency[key]))
+
+    if result['errors']:
+        lines.append('errors:')
+        for error, count in sorted(result['errors'].items()):
+            lines.append('  %-28s  %d' % (error, count))
+
+    return '\n'.join(lines)
+
+
+def start():  # pragma: no cover
+    main()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    start()
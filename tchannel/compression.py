@@ -0,0 +1,200 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+import io
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+try:
+    from lz4 import frame as lz4_frame
+except ImportError:  # pragma: no cover
+    lz4_frame = None
+
+__all__ = ['Compressor']
+
+ZLIB = 'zlib'
+ZSTD = 'zstd'
+LZ4 = 'lz4'
+
+#: Calls whose ``arg2`` and ``arg3`` add up to fewer bytes than this are sent
+#: uncompressed.
+DEFAULT_THRESHOLD = 1024
+
+#: Largest size, in bytes, that a compressed arg may decompress to.
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+
+# Decompressors return at most ``limit`` bytes of output, so that a small
+# payload can't expand to an unbounded size in memory.
+
+def _zlib_decompress(data, limit):
+    return zlib.decompressobj().decompress(data, limit)
+
+
+def _zstd_decompress(data, limit):  # pragma: no cover
+    reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data))
+    return reader.read(limit)
+
+
+def _lz4_decompress(data, limit):  # pragma: no cover
+    return lz4_frame.LZ4FrameDecompressor().decompress(data, max_length=limit)
+
+
+_CODECS = {ZLIB: (zlib.compress, _zlib_decompress)}
+
+if zstandard is not None:  # pragma: no cover
+    _CODECS[ZSTD] = (
+        lambda data: zstandard.ZstdCompressor().compress(data),
+        _zstd_decompress,
+    )
+
+if lz4_frame is not None:  # pragma: no cover
+    _CODECS[LZ4] = (lz4_frame.compress, _lz4_decompress)
+
+#: Value of the accept-compression transport header: every codec this process
+#: is able to decompress.
+ACCEPTED = ','.join(sorted(_CODECS))
+
+
+def is_available(codec):
+    """Whether the given codec is installed in this process."""
+    return codec in _CODECS
+
+
+def accepts(header, codec):
+    """Whether an accept-compression header value includes ``codec``.
+
+    :param header:
+        Comma-separated list of codecs, or None.
+    """
+    return bool(header) and codec in header.split(',')
+
+
+def decompress(codec, arg, max_size=DEFAULT_MAX_SIZE):
+    """Decompress a single arg that was compressed with ``codec``.
+
+    Empty args are never compressed and are returned as-is.
+
+    :param max_size:
+        Largest size, in bytes, of the decompressed arg.
+    :raises ValueError:
+        If the codec is not installed, ``arg`` is not valid compressed data,
+        or it decompresses to more than ``max_size`` bytes.
+    """
+    if not arg:
+        return arg
+
+    if codec not in _CODECS:
+        raise ValueError("Unsupported compression codec '%s'" % codec)
+
+    try:
+        data = _CODECS[codec][1](arg, max_size + 1)
+    except Exception as e:
+        raise ValueError(
+            "Failed to decompress %s payload: %s" % (codec, e)
+        )
+
+    if len(data) > max_size:
+        raise ValueError(
+            "Decompressed %s payload is larger than %d bytes"
+            % (codec, max_size)
+        )
+    return data
+
+
+class Compressor(object):
+    """Compresses ``arg2`` and ``arg3`` of calls above a size threshold.
+
+    .. code-block:: python
+
+        tchannel = TChannel('foo', compression=Compressor('zlib', 4096))
+
+    :param codec:
+        One of ``'zlib'``, ``'zstd'`` or ``'lz4'``. ``zstd`` and ``lz4``
+        require the ``zstandard`` and ``lz4`` packages.
+
+    :param threshold:
+        Smallest combined size, in bytes, of ``arg2`` and ``arg3`` worth
+        compressing.
+
+    :param max_size:
+        Largest size, in bytes, that a compressed ``arg2`` or ``arg3``
+        received by the channel may decompress to.
+    """
+
+    __slots__ = ('codec', 'threshold', 'max_size', '_compress')
+
+    def __init__(self, codec=ZLIB, threshold=DEFAULT_THRESHOLD,
+                 max_size=DEFAULT_MAX_SIZE):
+        if codec not in _CODECS:
+            raise ValueError(
+                "Compression codec '%s' is not available. Available codecs "
+                "are: %s" % (codec, ACCEPTED)
+            )
+
+        self.codec = codec
+        self.threshold = threshold
+        self.max_size = max_size
+        self._compress = _CODECS[codec][0]
+
+    def compress(self, arg2, arg3):
+        """Compress the given args if they are large enough.
+
+        Streams are left alone, and so are args that don't get any smaller.
+
+        :returns:
+            A tuple ``(arg2, arg3, codec)`` where ``codec`` is the codec used
+            to compress the returned args, or None if they are uncompressed.
+        """
+        if isinstance(arg2, unicode):
+            arg2 = arg2.encode('utf-8')
+        if isinstance(arg3, unicode):
+            arg3 = arg3.encode('utf-8')
+
+        if not isinstance(arg2, bytes) or not isinstance(arg3, bytes):
+            return arg2, arg3, None
+
+        size = len(arg2) + len(arg3)
+        if size < self.threshold:
+            return arg2, arg3, None
+
+        compressed2 = self._compress(arg2) if arg2 else arg2
+        compressed3 = self._compress(arg3) if arg3 else arg3
+        if len(compressed2) + len(compressed3) >= size:
+            return arg2, arg3, None
+
+        return compressed2, compressed3, self.codec
+
+
+def compressor_from(compression):
+    """Build a :py:class:`Compressor` from a ``compression`` option.
+
+    :param compression:
+        None, a codec name, or a :py:class:`Compressor`.
+    """
+    if compression is None or isinstance(compression, Compressor):
+        return compression
+    return Compressor(compression)
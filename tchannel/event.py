@@ -25,11 +25,17 @@ import collections
 import functools
 import logging
 import tornado
+import tornado.concurrent
+import tornado.gen
 
 from .enum import enum
 
 log = logging.getLogger('tchannel')
 
+# Returned by EventEmitter.fire when no hook needs to be waited on.
+_DONE = tornado.concurrent.Future()
+_DONE.set_result(None)
+
 
 """Types to represent system events"""
 EventType = enum(
@@ -46,6 +52,7 @@ EventType = enum(
     after_receive_error=0x41,
     after_send_error=0x42,
     on_exception=0x50,
+    on_close=0x60,
 )
 
 
@@ -125,6 +132,10 @@ class EventHook(object):
         """
         pass
 
+    def on_close(self):
+        """Called when the TChannel is closed."""
+        pass
+
 
 class EventEmitter(object):
     def __init__(self):
@@ -150,9 +161,43 @@ class EventEmitter(object):
                 event_value = getattr(EventType, event_type)
                 self.register_hook(func, event_value)
 
-    @tornado.gen.coroutine
     def fire(self, event, *args, **kwargs):
-        for hook in self.hooks[event]:
+        """Call the hooks registered for the given event.
+
+        Hooks are called synchronously, in order. If a hook returns a future,
+        the remaining hooks are called once it resolves. Firing an event
+        without hooks does nothing.
+
+        :returns:
+            A future that resolves once all hooks have been called. It is
+            already resolved unless one of the hooks returned a future.
+        """
+        hooks = self.hooks.get(event)
+        if not hooks:
+            return _DONE
+
+        for i, hook in enumerate(hooks):
+            try:
+                possible_future = hook(*args, **kwargs)
+            except Exception:
+                log.error("error calling hook", exc_info=sys.exc_info())
+                continue
+
+            if tornado.concurrent.is_future(possible_future):
+                return self._fire_async(
+                    possible_future, hooks[i + 1:], args, kwargs
+                )
+
+        return _DONE
+
+    @tornado.gen.coroutine
+    def _fire_async(self, future, hooks, args, kwargs):
+        try:
+            yield future
+        except Exception:
+            log.error("error calling hook", exc_info=sys.exc_info())
+
+        for hook in hooks:
             try:
                 possible_future = hook(*args, **kwargs)
                 if tornado.concurrent.is_future(possible_future):
@@ -31,8 +31,17 @@ MAX_MESSAGE_ID = 0xfffffffe
 # CallRequestMessage uses it as the default TTL value for the message.
 DEFAULT_TIMEOUT = 30  # seconds
 
+# Number of frames of a request relayed by TChannel.forward that are held in
+# memory before reading from the caller is paused.
+DEFAULT_FORWARD_BUFFER = 16
+
 TCHANNEL_LANGUAGE = 'python'
 
+# Directions of calls, as recorded by tchannel.metrics. They live here so that
+# tchannel.metrics, which imports tornado.web, is only imported by users.
+INBOUND = 'inbound'
+OUTBOUND = 'outbound'
+
 # python environment, eg 'CPython-2.7.10'
 TCHANNEL_LANGUAGE_VERSION = (
     platform.python_implementation() + '-' + platform.python_version()
@@ -18,8 +18,21 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+"""Health endpoint registered on every TChannel.
+
+``Meta`` and ``HealthStatus``, from ``meta.thrift``, are attributes of this
+package. ``meta.thrift`` is only compiled when they, or :py:func:`load_meta`,
+are first used.
+"""
+
 from __future__ import absolute_import
 
-from .health import health   # noqa
-from .health.meta import HealthStatus  # noqa
-from .health.meta import Meta  # noqa
+import sys
+
+from .health import _LazyHealthModule
+from .health import health  # noqa
+from .health import load_meta  # noqa
+
+_module = _LazyHealthModule(__name__, __doc__)
+_module.__dict__.update(sys.modules[__name__].__dict__)
+sys.modules[__name__] = _module
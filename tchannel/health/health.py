@@ -22,14 +22,42 @@ from __future__ import absolute_import
 
 import os
 import sys
+import types
 
 from .. import thrift
 
 
 base = os.path.dirname(__file__)
-meta = thrift.load(os.path.join(base, 'meta.thrift'))
-sys.modules[__name__ + '.meta'] = meta
+_meta = None
+
+
+def load_meta():
+    """Return the module compiled from ``meta.thrift``.
+
+    It is only compiled the first time this is called, usually when the
+    first TChannel registers its health endpoint, so that importing tchannel
+    doesn't parse Thrift.
+    """
+    global _meta
+    if _meta is None:
+        _meta = thrift.load(os.path.join(base, 'meta.thrift'))
+        sys.modules[__name__ + '.meta'] = _meta
+    return _meta
+
+
+class _LazyHealthModule(types.ModuleType):
+    """The ``tchannel.health`` package, whose ``Meta`` and ``HealthStatus``
+    attributes are loaded from ``meta.thrift`` when first accessed.
+
+    It is defined here rather than in the package, whose original module
+    object is discarded once it is replaced by this one.
+    """
+
+    def __getattr__(self, name):
+        if name in ('Meta', 'HealthStatus'):
+            return getattr(load_meta(), name)
+        raise AttributeError(name)
 
 
 def health(request):
-    return meta.HealthStatus(ok=True)
+    return load_meta().HealthStatus(ok=True)
@@ -0,0 +1,170 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Detection of handlers and callbacks blocking the IOLoop.
+
+All calls made and served by a TChannel are processed on a single IOLoop,
+so a handler making a blocking call stalls every connection.
+:py:class:`LoopMonitor` measures how late the IOLoop runs callbacks, and
+logs what the IOLoop is doing when it is blocked for too long.
+
+.. code-block:: python
+
+    registry = MetricsRegistry()
+    tchannel = TChannel('foo', metrics=registry)
+
+    monitor = LoopMonitor(registry)
+    monitor.start()
+
+The following metrics are recorded:
+
+- ``tchannel.loop.lag``: how late a probe scheduled every ``interval``
+  seconds runs, in milliseconds
+- ``tchannel.loop.blocked``: number of times the IOLoop did not run a
+  callback within ``threshold`` seconds
+
+Blocking is detected from a separate thread, which checks every
+``threshold / 2`` seconds that the IOLoop runs a callback in time. When it
+does not, the thread samples the stack of the IOLoop's thread and logs it as
+a warning, so the offending call shows up in the logs while it is still
+blocking. Every stall longer than ``1.5 * threshold`` is reported.
+"""
+
+from __future__ import absolute_import
+
+import logging
+import sys
+import threading
+import time
+import traceback
+
+import tornado.ioloop
+
+from .metrics import MetricsRegistry
+
+log = logging.getLogger('tchannel')
+
+__all__ = ['LoopMonitor']
+
+
+class LoopMonitor(object):
+    """Measures the scheduling delay of an IOLoop and reports blocking.
+
+    :param registry:
+        :py:class:`tchannel.metrics.MetricsRegistry` to record metrics in. A
+        new registry is used by default.
+    :param interval:
+        Number of seconds between the probes measuring the IOLoop's lag.
+    :param threshold:
+        Number of seconds after which the IOLoop is considered blocked.
+    """
+
+    def __init__(self, registry=None, interval=0.5, threshold=0.1):
+        if registry is None:
+            registry = MetricsRegistry()
+        self.registry = registry
+        self.interval = interval
+        self.threshold = threshold
+
+        self.lag = registry.histogram('tchannel.loop.lag', resolution=0.001)
+        self.blocked = registry.counter('tchannel.loop.blocked')
+
+        self._io_loop = None
+        self._thread_id = None
+        self._timeout = None
+        self._watchdog = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Start monitoring the current IOLoop.
+
+        Must be called from the IOLoop's thread.
+        """
+        if self._io_loop is not None:
+            return
+
+        self._io_loop = tornado.ioloop.IOLoop.current()
+        self._thread_id = threading.current_thread().ident
+        self._stopped = threading.Event()
+        self._schedule()
+
+        self._watchdog = threading.Thread(
+            target=self._watch, name='tchannel-loop-monitor'
+        )
+        self._watchdog.daemon = True
+        self._watchdog.start()
+
+    def stop(self):
+        """Stop monitoring.
+
+        Must be called from the IOLoop's thread.
+        """
+        if self._io_loop is None:
+            return
+
+        # The watchdog thread isn't joined: it may be waiting for this
+        # IOLoop, and exits on its own once it notices.
+        self._stopped.set()
+        self._io_loop.remove_timeout(self._timeout)
+        self._io_loop = self._timeout = self._watchdog = None
+
+    def _schedule(self):
+        expected = time.time() + self.interval
+        self._timeout = self._io_loop.call_at(
+            expected, self._probe, expected
+        )
+
+    def _probe(self, expected):
+        self.lag.record(max(time.time() - expected, 0) * 1000)
+        self._schedule()
+
+    def _watch(self):
+        io_loop = self._io_loop
+        stopped = self._stopped
+        # A stall must be noticed even if it starts right after a check, so
+        # checks are more frequent than the threshold.
+        period = self.threshold / 2.0
+        while not stopped.wait(period):
+            ran = threading.Event()
+            started = time.time()
+            io_loop.add_callback(ran.set)
+            if ran.wait(self.threshold):
+                continue
+            if stopped.is_set():
+                return
+
+            self._report(io_loop, started)
+
+            # Don't report the same stall again.
+            while not ran.wait(period):
+                if stopped.is_set():
+                    return
+
+    def _report(self, io_loop, started):
+        # Counted on the IOLoop, where the registry is flushed, once it's
+        # running again.
+        io_loop.add_callback(self.blocked.inc)
+
+        frame = sys._current_frames().get(self._thread_id)
+        stack = ''.join(traceback.format_stack(frame)) if frame else ''
+        log.warning(
+            'IOLoop blocked for more than %.3fs, in:\n%s',
+            time.time() - started, stack,
+        )
@@ -24,8 +24,6 @@ import random
 import zlib
 from collections import namedtuple
 
-import crcmod.predefined
-
 from .. import rw
 from ..enum import enum
 from ..errors import InvalidChecksumError
@@ -110,8 +108,21 @@ CHECKSUM_MSG_TYPES = [Types.CALL_REQ,
                       Types.CALL_RES,
                       Types.CALL_RES_CONTINUE]
 
-# generate crc32c func at import time
-crc32c = crcmod.predefined.mkCrcFun('crc-32c')
+_crc32c = None
+
+
+def _crc32c_fun():
+    # crcmod is only imported, and the crc32c function generated, once a
+    # crc32c checksum is needed.
+    global _crc32c
+    if _crc32c is None:
+        import crcmod.predefined
+        _crc32c = crcmod.predefined.mkCrcFun('crc-32c')
+    return _crc32c
+
+
+def crc32c(data, crc=0):
+    return _crc32c_fun()(data, crc)
 
 
 def compute_checksum(checksum_type, args, csum=0):
@@ -127,8 +138,9 @@ def compute_checksum(checksum_type, args, csum=0):
     elif checksum_type == ChecksumType.farm32:
         raise NotImplementedError()
     elif checksum_type == ChecksumType.crc32c:
+        crc = _crc32c_fun()
         for arg in args:
-            csum = crc32c(arg, csum)
+            csum = crc(arg, csum)
     else:
         raise InvalidChecksumError()
 
@@ -0,0 +1,571 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""In-process metrics for calls made and served by a TChannel.
+
+Calls are aggregated in a :py:class:`MetricsRegistry` and periodically
+flushed to one or more sinks by a :py:class:`MetricsReporter`.
+
+.. code-block:: python
+
+    registry = MetricsRegistry()
+    tchannel = TChannel('foo', metrics=registry)
+
+    reporter = MetricsReporter(registry, [StatsdSink(statsd), LogSink()])
+    reporter.start()
+
+For every ``(caller, service, endpoint, peer)`` combination, the following
+metrics are recorded for both ``inbound`` and ``outbound`` calls:
+
+- ``tchannel.<direction>.calls.success``
+- ``tchannel.<direction>.calls.app-errors``
+- ``tchannel.<direction>.calls.system-errors``, tagged with the error type
+- ``tchannel.<direction>.calls.latency``, in milliseconds
+- ``tchannel.<direction>.calls.request-bytes``
+- ``tchannel.<direction>.calls.response-bytes``
+
+A registry can be shared by TChannels running on different threads, like
+the IOLoops of a synchronous client with ``loops``.
+"""
+
+from __future__ import absolute_import
+
+import logging
+import re
+import threading
+
+import tornado.ioloop
+import tornado.web
+
+from . import glossary
+from .statsd import clean
+
+log = logging.getLogger('tchannel')
+
+__all__ = [
+    'MetricsRegistry',
+    'MetricsReporter',
+    'LogSink',
+    'PrometheusSink',
+    'PrometheusHandler',
+    'StatsdSink',
+]
+
+INBOUND = glossary.INBOUND
+OUTBOUND = glossary.OUTBOUND
+
+#: Percentiles reported for histograms.
+PERCENTILES = (0.5, 0.9, 0.99, 0.999)
+
+# Histogram buckets are exact below 2 ** _SUB_BITS. Above that, every power
+# of two is split in 2 ** (_SUB_BITS - 1) buckets, which bounds the error of
+# reported percentiles to ~6%.
+_SUB_BITS = 5
+_LINEAR = 1 << _SUB_BITS
+
+
+class _Unlocked(object):
+    """Stands in for the lock of metrics used from a single thread."""
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_UNLOCKED = _Unlocked()
+
+
+class Counter(object):
+    """A count of events since the last flush.
+
+    :param lock:
+        Lock held while the counter is updated, if it is updated from
+        several threads.
+    """
+
+    __slots__ = ('value', '_lock')
+
+    def __init__(self, value=0, lock=_UNLOCKED):
+        self.value = value
+        self._lock = lock
+
+    def inc(self, n=1):
+        with self._lock:
+            self.value += n
+
+    def empty(self):
+        return not self.value
+
+    def flush(self):
+        """Reset this counter and return a copy of it."""
+        with self._lock:
+            value, self.value = self.value, 0
+        return Counter(value)
+
+
+class Histogram(object):
+    """A distribution of values since the last flush.
+
+    Values are counted in log-linear buckets, like HdrHistogram, so that
+    recording a value is cheap and memory use doesn't depend on the number
+    of values recorded.
+
+    :param resolution:
+        Smallest difference between values that is distinguished.
+    :param lock:
+        Lock held while the histogram is updated, if it is updated from
+        several threads.
+    """
+
+    __slots__ = ('resolution', 'buckets', 'count', 'sum', 'max', '_lock')
+
+    def __init__(self, resolution=1, lock=_UNLOCKED):
+        self.resolution = resolution
+        self.buckets = {}
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+        self._lock = lock
+
+    def record(self, value):
+        v = int(value / self.resolution)
+        if v < _LINEAR:
+            index = max(v, 0)
+        else:
+            shift = v.bit_length() - _SUB_BITS
+            index = (shift << (_SUB_BITS - 1)) + (v >> shift)
+
+        with self._lock:
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, q):
+        """Approximate value below which a fraction ``q`` of values lie."""
+        if not self.count:
+            return 0
+
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                break
+
+        if index < _LINEAR:
+            upper = index
+        else:
+            shift = (index >> (_SUB_BITS - 1)) - 1
+            top = (index & ((1 << (_SUB_BITS - 1)) - 1)) | (_LINEAR >> 1)
+            upper = ((top + 1) << shift) - 1
+
+        return min(upper * self.resolution, self.max)
+
+    def empty(self):
+        return not self.count
+
+    def merge(self, other):
+        """Add the values recorded by another histogram to this one.
+
+        Both histograms must have the same resolution.
+        """
+        assert self.resolution == other.resolution
+        with self._lock:
+            for index, count in other.buckets.iteritems():
+                self.buckets[index] = self.buckets.get(index, 0) + count
+            self.count += other.count
+            self.sum += other.sum
+            self.max = max(self.max, other.max)
+
+    def flush(self):
+        """Reset this histogram and return a copy of it."""
+        copy = Histogram(self.resolution)
+        with self._lock:
+            copy.buckets, self.buckets = self.buckets, {}
+            copy.count, self.count = self.count, 0
+            copy.sum, self.sum = self.sum, 0
+            copy.max, self.max = self.max, 0
+        return copy
+
+
+class _CallMetrics(object):
+    __slots__ = (
+        'tags',
+        'success',
+        'app_errors',
+        'latency',
+        'request_bytes',
+        'response_bytes',
+    )
+
+
+class MetricsRegistry(object):
+    """Aggregates metrics in-process until they are flushed.
+
+    Metrics are identified by a name and a tuple of ``(key, value)`` tag
+    pairs. The metrics for each combination of call attributes are looked up
+    once and cached, so recording a call only updates counters in place.
+
+    Metrics may be recorded from several threads. They share a lock, which
+    is only held for the duration of an update.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, tags=()):
+        key = (name, tags)
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = self._metrics[key] = Counter(lock=self._lock)
+        return metric
+
+    def histogram(self, name, tags=(), resolution=1):
+        key = (name, tags)
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = self._metrics[key] = Histogram(
+                        resolution, lock=self._lock,
+                    )
+        return metric
+
+    def flush(self):
+        """Reset all metrics and return their values since the last flush.
+
+        :returns:
+            A list of ``(name, tags, metric)`` tuples for the metrics that
+            were recorded since the last flush.
+        """
+        with self._lock:
+            metrics = list(self._metrics.items())
+        return [
+            (name, tags, metric.flush())
+            for (name, tags), metric in metrics
+            if not metric.empty()
+        ]
+
+    def _call_metrics(self, direction, caller, service, endpoint, peer):
+        key = (direction, caller, service, endpoint, peer)
+        metrics = self._calls.get(key)
+        if metrics is not None:
+            return metrics
+
+        prefix = 'tchannel.%s.calls.' % direction
+        tags = (
+            ('caller', caller),
+            ('service', service),
+            ('endpoint', endpoint),
+            ('peer', peer),
+        )
+
+        metrics = _CallMetrics()
+        metrics.tags = tags
+        metrics.success = self.counter(prefix + 'success', tags)
+        metrics.app_errors = self.counter(prefix + 'app-errors', tags)
+        metrics.latency = self.histogram(prefix + 'latency', tags, 0.001)
+        metrics.request_bytes = self.histogram(prefix + 'request-bytes', tags)
+        metrics.response_bytes = self.histogram(
+            prefix + 'response-bytes', tags
+        )
+
+        self._calls[key] = metrics
+        return metrics
+
+    def record_call(
+        self,
+        direction,
+        caller,
+        service,
+        endpoint,
+        peer,
+        ok,
+        latency,
+        request_bytes=None,
+        response_bytes=None,
+    ):
+        """Record a completed call.
+
+        :param direction:
+            ``"inbound"`` or ``"outbound"``.
+        :param ok:
+            False if the call failed with an application error.
+        :param latency:
+            Duration of the call, in milliseconds.
+        :param request_bytes:
+            Size of the request's ``arg2`` and ``arg3``, if known.
+        :param response_bytes:
+            Size of the response's ``arg2`` and ``arg3``, if known.
+        """
+        metrics = self._call_metrics(
+            direction, caller, service, endpoint, peer
+        )
+
+        if ok:
+            metrics.success.inc()
+        else:
+            metrics.app_errors.inc()
+
+        metrics.latency.record(latency)
+        if request_bytes is not None:
+            metrics.request_bytes.record(request_bytes)
+        if response_bytes is not None:
+            metrics.response_bytes.record(response_bytes)
+
+    def record_error(
+        self, direction, caller, service, endpoint, peer, error_type
+    ):
+        """Record a call that failed with a system error."""
+        tags = self._call_metrics(
+            direction, caller, service, endpoint, peer
+        ).tags + (('type', error_type),)
+
+        self.counter(
+            'tchannel.%s.calls.system-errors' % direction, tags
+        ).inc()
+
+
+class MetricsReporter(object):
+    """Periodically flushes a :py:class:`MetricsRegistry` to sinks.
+
+    A sink is any object with a ``report`` method accepting the result of
+    :py:meth:`MetricsRegistry.flush`.
+
+    :param registry:
+        Registry to flush.
+    :param sinks:
+        List of sinks to report to.
+    :param interval:
+        Number of seconds between flushes.
+    """
+
+    def __init__(self, registry, sinks, interval=10.0):
+        self.registry = registry
+        self.sinks = sinks
+        self.interval = interval
+        self._callback = None
+
+    def start(self):
+        """Start flushing on the current IOLoop."""
+        if self._callback is None:
+            self._callback = tornado.ioloop.PeriodicCallback(
+                self.flush, self.interval * 1000
+            )
+            self._callback.start()
+
+    def stop(self):
+        """Stop flushing and flush what's left."""
+        if self._callback is not None:
+            self._callback.stop()
+            self._callback = None
+        self.flush()
+
+    def flush(self):
+        snapshot = self.registry.flush()
+        if not snapshot:
+            return
+
+        for sink in self.sinks:
+            try:
+                sink.report(snapshot)
+            except Exception:
+                log.exception('failed to report metrics to %r', sink)
+
+
+def _format_tags(tags):
+    return ','.join('%s=%s' % tag for tag in tags)
+
+
+class LogSink(object):
+    """Logs metrics, one line per metric.
+
+    :param logger:
+        Logger to use. Defaults to the ``tchannel`` logger.
+    :param level:
+        Level to log metrics at.
+    """
+
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or log
+        self.level = level
+
+    def report(self, snapshot):
+        for name, tags, metric in snapshot:
+            if isinstance(metric, Counter):
+                self.logger.log(
+                    self.level, '%s{%s} %s',
+                    name, _format_tags(tags), metric.value,
+                )
+            else:
+                self.logger.log(
+                    self.level, '%s{%s} count=%d %s max=%s',
+                    name, _format_tags(tags), metric.count,
+                    ' '.join(
+                        'p%s=%s' % (_percentile_name(q), metric.percentile(q))
+                        for q in PERCENTILES
+                    ),
+                    metric.max,
+                )
+
+
+def _percentile_name(q):
+    return ('%g' % (q * 100)).replace('.', '')
+
+
+class StatsdSink(object):
+    """Sends metrics to statsd.
+
+    Counters are sent as counts. Histograms are sent as gauges of their
+    percentiles and maximum, e.g. ``<key>.p99``, and a count of values.
+
+    :param statsd:
+        A statsd client providing ``count`` and ``gauge``.
+    """
+
+    def __init__(self, statsd):
+        self._statsd = statsd
+        self._keys = {}
+
+    def _key(self, name, tags):
+        key = self._keys.get((name, tags))
+        if key is None:
+            key = self._keys[(name, tags)] = '.'.join(
+                [name] + [clean(value, field) for field, value in tags]
+            )
+        return key
+
+    def report(self, snapshot):
+        for name, tags, metric in snapshot:
+            key = self._key(name, tags)
+            if isinstance(metric, Counter):
+                self._statsd.count(key, metric.value)
+                continue
+
+            self._statsd.count(key + '.count', metric.count)
+            for q in PERCENTILES:
+                self._statsd.gauge(
+                    '%s.p%s' % (key, _percentile_name(q)),
+                    metric.percentile(q),
+                )
+            self._statsd.gauge(key + '.max', metric.max)
+
+
+_PROMETHEUS_NAME_REXP = re.compile(r'[^a-zA-Z0-9_:]')
+
+
+def _prometheus_name(name):
+    return _PROMETHEUS_NAME_REXP.sub('_', name)
+
+
+def _prometheus_labels(tags, extra=()):
+    labels = [
+        '%s="%s"' % (
+            key,
+            ('%s' % (value or '')).replace('\\', r'\\')
+            .replace('"', r'\"').replace('\n', r'\n'),
+        )
+        for key, value in tags + extra
+    ]
+    return '{%s}' % ','.join(labels) if labels else ''
+
+
+class PrometheusSink(object):
+    """Exposes metrics in the Prometheus text format.
+
+    Counters are accumulated across flushes. Histograms are exposed as
+    summaries whose quantiles cover the last flush interval only.
+
+    Serve :py:meth:`render` to Prometheus, for example with
+    :py:class:`PrometheusHandler`.
+    """
+
+    def __init__(self):
+        self._counters = {}
+        self._summaries = {}
+
+    def report(self, snapshot):
+        for name, tags, metric in snapshot:
+            key = (_prometheus_name(name), tags)
+            if isinstance(metric, Counter):
+                self._counters[key] = (
+                    self._counters.get(key, 0) + metric.value
+                )
+            else:
+                _, total, count = self._summaries.get(key, (None, 0, 0))
+                quantiles = [(q, metric.percentile(q)) for q in PERCENTILES]
+                self._summaries[key] = (
+                    quantiles, total + metric.sum, count + metric.count
+                )
+
+    def render(self):
+        lines = []
+
+        typed = set()
+        for (name, tags), value in sorted(self._counters.items()):
+            if name not in typed:
+                typed.add(name)
+                lines.append('# TYPE %s counter' % name)
+            lines.append('%s%s %s' % (name, _prometheus_labels(tags), value))
+
+        for (name, tags), summary in sorted(self._summaries.items()):
+            quantiles, total, count = summary
+            if name not in typed:
+                typed.add(name)
+                lines.append('# TYPE %s summary' % name)
+            for q, value in quantiles:
+                lines.append('%s%s %s' % (
+                    name,
+                    _prometheus_labels(tags, (('quantile', q),)),
+                    value,
+                ))
+            labels = _prometheus_labels(tags)
+            lines.append('%s_sum%s %s' % (name, labels, total))
+            lines.append('%s_count%s %s' % (name, labels, count))
+
+        return '\n'.join(lines) + '\n'
+
+
+class PrometheusHandler(tornado.web.RequestHandler):
+    """Tornado handler serving a :py:class:`PrometheusSink`.
+
+    .. code-block:: python
+
+        app = tornado.web.Application([
+            ('/metrics', PrometheusHandler, {'sink': sink}),
+        ])
+    """
+
+    def initialize(self, sink):
+        self.sink = sink
+
+    def get(self):
+        self.set_header('Content-Type', 'text/plain; version=0.0.4')
+        self.write(self.sink.render())
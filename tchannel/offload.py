@@ -0,0 +1,126 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Serialization of large payloads on an executor.
+
+Serializing a large request or response takes long enough to hold up every
+other call on the IOLoop. An :py:class:`Offloader` moves the work for bodies
+above a size threshold to a ``concurrent.futures`` executor, and keeps small
+bodies inline, where an executor would only add latency.
+
+.. code-block:: python
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    tchannel = TChannel('foo', offload=Offloader(ThreadPoolExecutor(4)))
+
+The size of a body is not known until it is encoded, so encoding is
+offloaded when the previous body encoded for the same endpoint was above the
+threshold. Decoding is offloaded based on the size of the received body.
+
+Bodies of requests received by handlers are only decoded when the handler
+reads them. Use :py:meth:`tchannel.Request.read_body` to decode them on the
+executor:
+
+.. code-block:: python
+
+    @tchannel.json.register
+    @tornado.gen.coroutine
+    def upload(request):
+        document = yield request.read_body()
+
+A ``ProcessPoolExecutor`` sidesteps the GIL for codecs implemented in pure
+Python, but bodies and serializers are pickled to reach it, which rules out
+Thrift.
+"""
+
+from __future__ import absolute_import
+
+from tornado import gen
+
+__all__ = ['Offloader']
+
+#: Bodies smaller than this, in bytes, are serialized on the IOLoop.
+DEFAULT_THRESHOLD = 64 * 1024
+
+
+class Offloader(object):
+    """Serializes bodies above a size threshold on an executor.
+
+    Headers are always serialized inline.
+
+    :param executor:
+        A ``concurrent.futures.Executor``.
+    :param threshold:
+        Smallest size, in bytes, of bodies serialized on the executor.
+    """
+
+    __slots__ = ('executor', 'threshold', '_sizes')
+
+    def __init__(self, executor, threshold=DEFAULT_THRESHOLD):
+        self.executor = executor
+        self.threshold = threshold
+        # Size of the last payload encoded for every endpoint.
+        self._sizes = {}
+
+    @gen.coroutine
+    def serialize_body(self, endpoint, serializer, body):
+        """Serialize a body with ``serializer``.
+
+        :param endpoint:
+            Endpoint the body is sent to or from. Whether to offload is
+            decided by the size of the previous body serialized for it.
+        :returns:
+            A future for the serialized body.
+        """
+        if self._sizes.get(endpoint, 0) >= self.threshold:
+            body = yield self.executor.submit(
+                _serialize_body, serializer, body
+            )
+        else:
+            body = serializer.serialize_body(body)
+
+        self._sizes[endpoint] = len(body or b'')
+        raise gen.Return(body)
+
+    @gen.coroutine
+    def deserialize_body(self, serializer, body):
+        """Deserialize a body with ``serializer``.
+
+        :returns:
+            A future for the deserialized body.
+        """
+        if len(body or b'') >= self.threshold:
+            body = yield self.executor.submit(
+                _deserialize_body, serializer, body
+            )
+        else:
+            body = serializer.deserialize_body(body)
+        raise gen.Return(body)
+
+
+# Bound methods can't be pickled for process pools.
+
+def _serialize_body(serializer, body):
+    return serializer.serialize_body(body)
+
+
+def _deserialize_body(serializer, body):
+    return serializer.deserialize_body(body)
@@ -0,0 +1,122 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Opt-in timing of the stages of calls made and served by a TChannel.
+
+.. code-block:: python
+
+    profiler = Profiler()
+    tchannel = TChannel('foo', profiler=profiler)
+
+    # ... make and serve some calls ...
+
+    for stage, summary in sorted(profiler.summary().items()):
+        print stage, summary
+
+The duration of every stage is recorded in milliseconds, in a histogram of
+a :py:class:`tchannel.metrics.MetricsRegistry` named
+``tchannel.profile.<stage>``. Give the profiler the registry passed to the
+channel as ``metrics`` to report stages alongside call metrics with a
+:py:class:`tchannel.metrics.MetricsReporter`.
+
+The following stages are timed:
+
+- ``serialize``: serialization of request headers and bodies by the Thrift
+  and JSON arg schemes
+- ``deserialize``: deserialization of response headers and bodies by the
+  Thrift and JSON arg schemes
+- ``send``: an outgoing call, from choosing a peer to receiving the
+  response, retries included
+- ``write.queue``: time a frame waits in a connection's write queue
+- ``write``: writing a frame to the socket
+- ``read``: reading a frame off the socket once its size is known, and
+  decoding it
+- ``build``: assembling a request or response from its messages
+- ``handler``: running a registered handler, until the future it returns
+  is done
+
+Comparing ``handler`` to the other stages shows whether time is spent in
+application code or in the transport.
+
+Profiling adds a couple of ``time.time()`` calls per stage. When no profiler
+is given, stages are not timed at all.
+"""
+
+from __future__ import absolute_import
+
+import time
+
+from .metrics import MetricsRegistry
+from .metrics import PERCENTILES
+from .metrics import _percentile_name
+
+__all__ = ['Profiler']
+
+PREFIX = 'tchannel.profile.'
+
+
+class Profiler(object):
+    """Records the duration of the stages of calls.
+
+    :param registry:
+        :py:class:`tchannel.metrics.MetricsRegistry` to record durations in.
+        A new registry is used by default.
+    """
+
+    def __init__(self, registry=None):
+        if registry is None:
+            registry = MetricsRegistry()
+        self.registry = registry
+        self._stages = {}
+
+    def record(self, stage, started):
+        """Record that ``stage`` ran from ``started`` until now.
+
+        :param stage:
+            Name of the stage.
+        :param started:
+            Time at which the stage started, as returned by ``time.time()``.
+        """
+        histogram = self._stages.get(stage)
+        if histogram is None:
+            histogram = self._stages[stage] = self.registry.histogram(
+                PREFIX + stage, resolution=0.001,
+            )
+        histogram.record((time.time() - started) * 1000)
+
+    def summary(self):
+        """Summarize the durations recorded since the registry was flushed.
+
+        :returns:
+            A dict from stage names to dicts with the ``count``, ``max`` and
+            percentiles (``p50``, ``p90``, ``p99`` and ``p999``) of their
+            durations in milliseconds.
+        """
+        result = {}
+        # Other threads may record stages meanwhile.
+        for stage, histogram in self._stages.items():
+            if histogram.empty():
+                continue
+
+            summary = {'count': histogram.count, 'max': histogram.max}
+            for q in PERCENTILES:
+                summary['p' + _percentile_name(q)] = histogram.percentile(q)
+            result[stage] = summary
+        return result
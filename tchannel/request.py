@@ -22,12 +22,18 @@ from __future__ import (
     absolute_import, division, print_function, unicode_literals
 )
 
+from tornado import gen
+
 from . import schemes
 from . import transport as t
 
 __all__ = ['Request']
 
 
+# Marks a body or headers value that has not been deserialized yet.
+_PENDING = object()
+
+
 class Request(object):
     """A TChannel request.
 
@@ -58,17 +64,29 @@ class Request(object):
     :ivar timeout:
         Amount of time (in seconds) within which this request is expected to
         finish.
+
+    :ivar raw_body:
+        The serialized payload of this request as it was received, or None if
+        this request was not received over the wire.
+
+    :ivar raw_headers:
+        The serialized application headers of this request as they were
+        received, or None if this request was not received over the wire.
     """
 
     # TODO move over other props from tchannel.tornado.request
 
     __slots__ = (
-        'body',
-        'headers',
+        '_body',
+        '_headers',
         'service',
         'transport',
         'endpoint',
         'timeout',
+        'raw_body',
+        'raw_headers',
+        '_serializer',
+        '_offloader',
     )
 
     def __init__(
@@ -79,13 +97,97 @@ class Request(object):
         endpoint=None,
         service=None,
         timeout=None,
+        raw_body=None,
+        raw_headers=None,
+        serializer=None,
+        offloader=None,
     ):
-        self.body = body
-        self.headers = headers
+        """
+        :param serializer:
+            If given, ``body`` and ``headers`` are not used. Instead they are
+            deserialized from ``raw_body`` and ``raw_headers`` with this
+            serializer the first time they are accessed, so handlers that
+            never look at them never pay for deserialization.
+        :param offloader:
+            :py:class:`tchannel.offload.Offloader` used by
+            :py:meth:`read_body` to deserialize a large ``raw_body``.
+        """
+        if serializer is not None:
+            body = headers = _PENDING
+
+        self._body = body
+        self._headers = headers
         self.transport = transport
         self.endpoint = endpoint
         self.service = service
         self.timeout = timeout
+        self.raw_body = raw_body
+        self.raw_headers = raw_headers
+        self._serializer = serializer
+        self._offloader = offloader
+
+    @property
+    def body(self):
+        if self._body is _PENDING:
+            self._body = self._serializer.deserialize_body(self.raw_body)
+        return self._body
+
+    @gen.coroutine
+    def read_body(self):
+        """Deserialize the body without blocking the IOLoop.
+
+        Same as :py:attr:`body`, except that a large body is deserialized
+        on the executor of the channel's
+        :py:class:`tchannel.offload.Offloader`, if it has one.
+
+        .. code-block:: python
+
+            @tchannel.json.register
+            @tornado.gen.coroutine
+            def upload(request):
+                document = yield request.read_body()
+
+        :returns:
+            A future for the body.
+        """
+        if self._body is _PENDING and self._offloader is not None:
+            self._body = yield self._offloader.deserialize_body(
+                self._serializer, self.raw_body
+            )
+        raise gen.Return(self.body)
+
+    @body.setter
+    def body(self, value):
+        self._body = value
+
+    @property
+    def headers(self):
+        if self._headers is _PENDING:
+            self._headers = self._serializer.deserialize_header(
+                self.raw_headers
+            )
+        return self._headers
+
+    @headers.setter
+    def headers(self, value):
+        self._headers = value
+
+    def __getstate__(self):
+        # Pending values are deserialized here, so that the request can be
+        # handled in another process.
+        return dict(
+            body=self.body,
+            headers=self.headers,
+            transport=self.transport,
+            endpoint=self.endpoint,
+            service=self.service,
+            timeout=self.timeout,
+            raw_body=self.raw_body,
+            raw_headers=self.raw_headers,
+        )
+
+    def __setstate__(self, state):
+        self.__init__(**state)
 
 
 class TransportHeaders(object):
@@ -95,9 +197,11 @@ class TransportHeaders(object):
     # TODO retry_flags should be woke up past a string
 
     __slots__ = (
+        'accept_compression',
         'caller_name',
         'claim_at_start',
         'claim_at_finish',
+        'compression',
         'failure_domain',
         'retry_flags',
         'routing_delegate',
@@ -115,7 +219,9 @@ class TransportHeaders(object):
                  scheme=None,
                  speculative_exe=None,
                  shard_key=None,
-                 routing_delegate=None):
+                 routing_delegate=None,
+                 compression=None,
+                 accept_compression=None):
 
         if scheme is None:
             scheme = schemes.RAW
@@ -129,6 +235,8 @@ class TransportHeaders(object):
         self.scheme = scheme
         self.speculative_exe = speculative_exe
         self.shard_key = shard_key
+        self.compression = compression
+        self.accept_compression = accept_compression
 
     @classmethod
     def from_dict(cls, data):
@@ -142,6 +250,8 @@ class TransportHeaders(object):
             scheme=data.get(t.SCHEME),
             shard_key=data.get(t.SHARD_KEY),
             speculative_exe=data.get(t.SPECULATIVE_EXE),
+            compression=data.get(t.COMPRESSION),
+            accept_compression=data.get(t.ACCEPT_COMPRESSION),
         )
 
     def to_dict(self):
@@ -174,4 +284,10 @@ class TransportHeaders(object):
         if self.speculative_exe is not None:
             m[t.SPECULATIVE_EXE] = self.speculative_exe
 
+        if self.compression is not None:
+            m[t.COMPRESSION] = self.compression
+
+        if self.accept_compression is not None:
+            m[t.ACCEPT_COMPRESSION] = self.accept_compression
+
         return m
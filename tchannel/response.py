@@ -73,20 +73,23 @@ class TransportHeaders(object):
     __slots__ = (
         'failure_domain',
         'scheme',
+        'compression',
     )
 
-    def __init__(self, failure_domain=None, scheme=None):
+    def __init__(self, failure_domain=None, scheme=None, compression=None):
         if scheme is None:
             scheme = schemes.RAW
 
         self.failure_domain = failure_domain
         self.scheme = scheme
+        self.compression = compression
 
     @classmethod
     def from_dict(cls, data):
         return cls(
             failure_domain=data.get(t.FAILURE_DOMAIN),
             scheme=data.get(t.SCHEME),
+            compression=data.get(t.COMPRESSION),
         )
 
     def to_dict(self):
@@ -98,6 +101,9 @@ class TransportHeaders(object):
         if self.scheme is not None:
             m[t.SCHEME] = self.scheme
 
+        if self.compression is not None:
+            m[t.COMPRESSION] = self.compression
+
         return m
 
 
@@ -23,6 +23,8 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import time
+
 from tornado import gen
 
 from . import JSON
@@ -36,8 +38,16 @@ class JsonArgScheme(object):
 
     NAME = JSON
 
-    def __init__(self, tchannel):
+    def __init__(self, tchannel, json_backend=None):
+        """
+        :param tchannel:
+            TChannel through which requests are sent.
+        :param json_backend:
+            JSON library used to serialize headers and bodies. See
+            :py:func:`tchannel.serializer.json.get_backend`.
+        """
         self._tchannel = tchannel
+        self._serializer = JsonSerializer(json_backend)
         self.tracer = ClientTracer(channel=tchannel)
 
     @gen.coroutine
@@ -110,7 +120,7 @@ class JsonArgScheme(object):
 
         span, headers = self.tracer.start_span(
             service=service, endpoint=endpoint, headers=headers,
-            hostport=hostport, encoding='json'
+            hostport=hostport, encoding='json', trace=trace,
         )
 
         yield self._tchannel._dep_tchannel.event_emitter.fire(
@@ -120,9 +130,18 @@ class JsonArgScheme(object):
         )
 
         # serialize
-        serializer = JsonSerializer()
+        profiler = self._tchannel.profiler
+        if profiler is not None:
+            started = time.time()
+        serializer = self._serializer
+        offloader = self._tchannel.offloader
         headers = serializer.serialize_header(headers)
-        body = serializer.serialize_body(body)
+        if offloader is None:
+            body = serializer.serialize_body(body)
+        else:
+            body = yield offloader.serialize_body(endpoint, serializer, body)
+        if profiler is not None:
+            profiler.record('serialize', started)
 
         response = yield self._tchannel.call(
             scheme=self.NAME,
@@ -142,8 +161,17 @@ class JsonArgScheme(object):
         )
 
         # deserialize
+        if profiler is not None:
+            started = time.time()
         response.headers = serializer.deserialize_header(response.headers)
-        response.body = serializer.deserialize_body(response.body)
+        if offloader is None:
+            response.body = serializer.deserialize_body(response.body)
+        else:
+            response.body = yield offloader.deserialize_body(
+                serializer, response.body
+            )
+        if profiler is not None:
+            profiler.record('deserialize', started)
 
         raise gen.Return(response)
 
@@ -23,6 +23,8 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import time
+
 from tchannel.tracing import ClientTracer
 from tornado import gen
 
@@ -133,7 +135,8 @@ class ThriftArgScheme(object):
 
         span, headers = self.tracer.start_span(
             service=request.service, endpoint=request.endpoint,
-            headers=headers, hostport=hostport, encoding='thrift'
+            headers=headers, hostport=hostport, encoding='thrift',
+            trace=trace,
         )
 
         yield self._tchannel._dep_tchannel.event_emitter.fire(
@@ -144,6 +147,9 @@ class ThriftArgScheme(object):
         serializer = request.get_serializer()
 
         # serialize
+        profiler = self._tchannel.profiler
+        if profiler is not None:
+            started = time.time()
         try:
             headers = serializer.serialize_header(headers=headers)
         except (AttributeError, TypeError):
@@ -152,7 +158,15 @@ class ThriftArgScheme(object):
                 ' where keys and values are strings)'
             )
 
-        body = serializer.serialize_body(request.call_args)
+        offloader = self._tchannel.offloader
+        if offloader is None:
+            body = serializer.serialize_body(request.call_args)
+        else:
+            body = yield offloader.serialize_body(
+                request.endpoint, serializer, request.call_args
+            )
+        if profiler is not None:
+            profiler.record('serialize', started)
 
         # TODO There's only one yield. Drop in favor of future+callback.
         response = yield self._tchannel.call(
@@ -172,12 +186,19 @@ class ThriftArgScheme(object):
             caller_name=caller_name,
         )
 
+        if profiler is not None:
+            started = time.time()
         response.headers = serializer.deserialize_header(
             headers=response.headers
         )
-        body = serializer.deserialize_body(body=response.body)
+        if offloader is None:
+            body = serializer.deserialize_body(body=response.body)
+        else:
+            body = yield offloader.deserialize_body(serializer, response.body)
 
         response.body = request.read_body(body)
+        if profiler is not None:
+            profiler.record('deserialize', started)
         raise gen.Return(response)
 
     def register(self, thrift_module, **kwargs):
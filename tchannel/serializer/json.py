@@ -20,33 +20,102 @@
 
 from __future__ import absolute_import
 
+import importlib
 import json
 
 from tchannel.schemes import JSON
 
+#: Third-party JSON libraries that :py:func:`get_backend` will try, in order
+#: of preference, when asked for the fastest available backend.
+FAST_BACKENDS = ('ujson', 'simplejson')
+
+_STRING_TYPES = (str, unicode)
+
+_INVALID_HEADERS = (
+    'headers must be a map[string]string (a shallow dict '
+    'where keys and values are strings)'
+)
+
+
+def get_backend(backend=None):
+    """Resolve a JSON backend.
+
+    A backend is any object that provides ``dumps(obj)`` and ``loads(s)``
+    with the same semantics as the standard library ``json`` module.
+
+    :param backend:
+        One of,
+
+        ``None``
+            The standard library ``json`` module.
+        ``'auto'``
+            The first importable module out of :py:data:`FAST_BACKENDS`,
+            falling back to the standard library.
+        A module name
+            The module with the given name, e.g. ``'ujson'``.
+        An object
+            Used as-is.
+    :raises ImportError:
+        If the named module could not be imported.
+    """
+    if backend is None:
+        return json
+
+    if backend == 'auto':
+        for name in FAST_BACKENDS:
+            try:
+                return importlib.import_module(name)
+            except ImportError:
+                continue
+        return json
+
+    if isinstance(backend, basestring):
+        return importlib.import_module(backend)
+
+    assert callable(getattr(backend, 'dumps', None)), (
+        'JSON backend %r must provide dumps()' % backend
+    )
+    assert callable(getattr(backend, 'loads', None)), (
+        'JSON backend %r must provide loads()' % backend
+    )
+    return backend
+
 
 class JsonSerializer(object):
     name = JSON
 
+    def __init__(self, backend=None):
+        """
+        :param backend:
+            JSON backend used to encode and decode headers and bodies. See
+            :py:func:`get_backend` for accepted values.
+        """
+        backend = get_backend(backend)
+        self._dumps = backend.dumps
+        self._loads = backend.loads
+
     def serialize_header(self, headers):
-        headers = headers or {}
+        if not headers:
+            return '{}'
 
         for k, v in headers.iteritems():
+            # Exact type checks are much cheaper than isinstance checks
+            # against basestring; only fall back to the latter for
+            # subclasses.
+            if k.__class__ in _STRING_TYPES and v.__class__ in _STRING_TYPES:
+                continue
             if not (isinstance(k, basestring) and isinstance(v, basestring)):
-                raise ValueError(
-                    'headers must be a map[string]string (a shallow dict '
-                    'where keys and values are strings)'
-                )
+                raise ValueError(_INVALID_HEADERS)
 
-        return json.dumps(headers)
+        return self._dumps(headers)
 
     def deserialize_header(self, headers):
-        if not headers:
+        if not headers or headers == '{}':
             return {}
-        return json.loads(headers)
+        return self._loads(headers)
 
     def deserialize_body(self, obj):
-        return json.loads(obj)
+        return self._loads(obj)
 
     def serialize_body(self, obj):
-        return json.dumps(obj)
+        return self._dumps(obj)
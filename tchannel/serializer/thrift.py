@@ -23,67 +23,141 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import struct
+
 from tchannel.schemes import THRIFT
 
-from .. import io
-from .. import rw
+from ..errors import ReadError
+
+try:
+    from thrift.protocol import TBinaryProtocol
+    from thrift.transport import TTransport
+except ImportError:  # pragma: no cover
+    # thrift is only required for modules generated by the Apache Thrift
+    # compiler. Serializers for thriftrw modules never touch these.
+    TBinaryProtocol = TTransport = None
+
+try:
+    from thrift.protocol import fastbinary
+except ImportError:  # pragma: no cover
+    fastbinary = None
+
+
+_short = struct.Struct('>H')
+
+
+def _encode_headers(headers):
+    """Encode a header dictionary as ``nh:2 (k~2 v~2){nh}``.
+
+    This produces the same output as
+
+    .. code-block:: python
+
+        rw.headers(
+            rw.number(2),
+            rw.len_prefixed_string(rw.number(2)),
+            rw.len_prefixed_string(rw.number(2)),
+        )
+
+    but builds the payload in one pass without going through a stream.
+
+    :raises AttributeError:
+        If ``headers`` is not a dictionary or contains non-string keys or
+        values.
+    """
+    pack = _short.pack
+    items = headers.items()
+    parts = [pack(len(items))]
+    for k, v in items:
+        k = k.encode('utf-8')
+        v = v.encode('utf-8')
+        parts.append(pack(len(k)))
+        parts.append(k)
+        parts.append(pack(len(v)))
+        parts.append(v)
+    return b''.join(parts)
+
+
+def _decode_headers(payload):
+    """Decode headers produced by :py:func:`_encode_headers`.
+
+    :raises ReadError:
+        If the payload is truncated.
+    """
+    unpack_from = _short.unpack_from
+    size = len(payload)
+    result = {}
+    try:
+        (count,) = unpack_from(payload, 0)
+        offset = 2
+        for _ in range(count):
+            pair = []
+            for _ in (0, 1):
+                (length,) = unpack_from(payload, offset)
+                offset += 2
+                end = offset + length
+                if end > size:
+                    raise ReadError(
+                        "Expected %d bytes but got %d bytes." % (
+                            length, size - offset
+                        )
+                    )
+                pair.append(payload[offset:end].decode('utf-8'))
+                offset = end
+            result[pair[0]] = pair[1]
+    except struct.error as e:
+        raise ReadError("Failed to read headers: %s" % e)
+    return result
+
+
+def _spec_of(cls):
+    """Return the ``(cls, thrift_spec)`` tuple fastbinary expects."""
+    return (cls, getattr(cls, 'thrift_spec', None))
 
 
 class ThriftSerializer(object):
 
     name = THRIFT
 
-    _headers_rw = rw.headers(
-        rw.number(2),
-        rw.len_prefixed_string(rw.number(2)),
-        rw.len_prefixed_string(rw.number(2)),
-    )
+    # Cache of (cls, thrift_spec) tuples for call argument types, shared by
+    # all serializers so that each generated class is only inspected once.
+    _specs = {}
 
     def __init__(self, deserialize_type):
         self.deserialize_type = deserialize_type
+        self._deserialize_spec = _spec_of(deserialize_type)
 
     def serialize_header(self, headers):
         headers = headers or {}
-        result = self._headers_rw.write(headers, io.BytesIO()).getvalue()
-        return result
+        return _encode_headers(headers)
 
     def deserialize_header(self, headers):
-        headers = headers or {}
-        if headers:
-            headers = io.BytesIO(headers)
-            headers = self._headers_rw.read(headers)
-        result = dict(headers)
-
-        return result
+        if not headers:
+            return {}
+        return _decode_headers(headers)
 
     def serialize_body(self, call_args):
+        cls = call_args.__class__
+        spec = self._specs.get(cls)
+        if spec is None:
+            spec = self._specs[cls] = _spec_of(cls)
+
+        if fastbinary is not None and spec[1] is not None:
+            return fastbinary.encode_binary(call_args, spec)
 
-        # TODO - use fastbinary directly
-        #
-        # fastbinary.encode_binary(
-        #     call_args, (call_args.__class__, call_args.thrift_spec)
-        # )
-        # fastbinary.decode_binary(
-        #    result, TMemoryBuffer(body),(result_type, result_type.thrift_spec)
-        # )
-        #
-        from thrift.protocol import TBinaryProtocol
-        from thrift.transport import TTransport
         trans = TTransport.TMemoryBuffer()
         proto = TBinaryProtocol.TBinaryProtocolAccelerated(trans)
         call_args.write(proto)
-        result = trans.getvalue()
-
-        return result
+        return trans.getvalue()
 
     def deserialize_body(self, body):
-        from thrift.protocol import TBinaryProtocol
-        from thrift.transport import TTransport
+        result = self.deserialize_type()
         trans = TTransport.TMemoryBuffer(body)
-        proto = TBinaryProtocol.TBinaryProtocolAccelerated(trans)
 
-        result = self.deserialize_type()
-        result.read(proto)
+        if fastbinary is not None and self._deserialize_spec[1] is not None:
+            fastbinary.decode_binary(result, trans, self._deserialize_spec)
+        else:
+            result.read(TBinaryProtocol.TBinaryProtocolAccelerated(trans))
         return result
 
 
@@ -21,6 +21,10 @@
 from __future__ import absolute_import
 
 import re
+import threading
+from collections import OrderedDict
+
+import tornado.ioloop
 
 from .event import EventHook
 from .messages.error import ErrorMessage
@@ -28,68 +32,148 @@ from .tornado.response import StatusCode
 
 WILDCHAR_REXP = re.compile(r'[{}/\\:\s.]+')
 
+#: Default number of (caller, service, endpoint) prefixes cached by
+#: :py:class:`StatsdHook`.
+DEFAULT_PREFIX_CACHE_SIZE = 1024
 
-class StatsdHook(EventHook):
-    """Collect Statsd information in the tchannel req/resp."""
 
-    def __init__(self, statsd):
+class StatsdHook(EventHook):
+    """Collect Statsd information in the tchannel req/resp.
+
+    The hook may be called from several threads, like the IOLoops of a
+    synchronous client with ``loops``.
+    """
+
+    def __init__(
+        self,
+        statsd,
+        flush_interval=None,
+        prefix_cache_size=DEFAULT_PREFIX_CACHE_SIZE,
+    ):
         """
 
         :param statsd: instance of `StatsD <https://github.com/etsy/statsd>`
+
+        :param flush_interval:
+            If given, counts are aggregated in memory and sent to ``statsd``
+            every ``flush_interval`` seconds, and on :py:meth:`flush`, instead
+            of once per event. The timer runs on the IOLoop of the first
+            event, until the channel is closed.
+
+        :param prefix_cache_size:
+            Maximum number of cleaned-up ``(caller, service, endpoint)``
+            metric key suffixes to keep around.
         """
         self._statsd = statsd
+        self._suffixes = _LRUCache(prefix_cache_size)
+
+        self._flush_interval = flush_interval
+        self._flush_callback = None
+        self._closed = False
+        self._counts = {}
+        # Guards the suffix cache, the counts and the flush callback.
+        self._lock = threading.Lock()
+
+    def _count(self, statsd_name, request, error=None):
+        metadata = extract_metadata(request)
+        with self._lock:
+            suffix = self._suffixes.get(metadata)
+            if suffix is None:
+                suffix = self._suffixes[metadata] = _suffix(*metadata)
+
+        key = statsd_name + '.' + suffix
+        if error is not None:
+            key += '.' + _error_type(error)
+
+        if self._flush_interval is None:
+            self._statsd.count(key, 1)
+            return
+
+        with self._lock:
+            # Once closed, there is no timer left to send aggregated counts.
+            if not self._closed:
+                self._counts[key] = self._counts.get(key, 0) + 1
+                if self._flush_callback is None:
+                    self._flush_callback = tornado.ioloop.PeriodicCallback(
+                        self.flush, self._flush_interval * 1000
+                    )
+                    self._flush_callback.start()
+                return
+        self._statsd.count(key, 1)
 
-    def before_send_request(self, request):
-        statsd_name = "tchannel.outbound.calls.sent"
-        key = common_prefix(statsd_name, request)
+    def flush(self):
+        """Send the counts aggregated since the last flush."""
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        for key, value in counts.iteritems():
+            self._statsd.count(key, value)
+
+    def on_close(self):
+        """Stop the flush timer and send the counts aggregated so far."""
+        with self._lock:
+            self._closed = True
+            callback, self._flush_callback = self._flush_callback, None
+        if callback is not None:
+            # The timer belongs to the IOLoop it was started on, which may
+            # run on another thread.
+            callback.io_loop.add_callback(callback.stop)
+        self.flush()
 
-        self._statsd.count(key, 1)
+    def before_send_request(self, request):
+        self._count("tchannel.outbound.calls.sent", request)
 
     def after_receive_response(self, request, response):
         if response.code == StatusCode.ok:
             statsd_name = "tchannel.outbound.calls.success"
         else:
             statsd_name = "tchannel.outbound.calls.app-errors"
-        key = common_prefix(statsd_name, request)
 
-        self._statsd.count(key, 1)
+        self._count(statsd_name, request)
 
     def after_receive_system_error(self, request, error):
-        statsd_name = "tchannel.outbound.calls.system-errors"
-        prefix = common_prefix(statsd_name, request)
-        key = prefix + '.' + clean(
-            ErrorMessage.ERROR_CODES.get(error.code, None), 'type'
+        self._count(
+            "tchannel.outbound.calls.system-errors", request, error
         )
 
-        self._statsd.count(key, 1)
-
     def after_receive_system_error_per_attempt(self, request, error):
-        statsd_name = "tchannel.outbound.calls.per-attempt.system-errors"
-        prefix = common_prefix(statsd_name, request)
-        key = prefix + '.' + clean(
-            ErrorMessage.ERROR_CODES.get(error.code, None), 'type'
+        self._count(
+            "tchannel.outbound.calls.per-attempt.system-errors",
+            request,
+            error,
         )
 
-        self._statsd.count(key, 1)
-
     def on_operational_error_per_attempt(self, request, error):
-        statsd_name = "tchannel.outbound.calls.per-attempt.operational-errors"
-        prefix = common_prefix(statsd_name, request)
-        key = prefix + '.' + clean(
-            ErrorMessage.ERROR_CODES.get(error.code, None), 'type'
+        self._count(
+            "tchannel.outbound.calls.per-attempt.operational-errors",
+            request,
+            error,
         )
 
-        self._statsd.count(key, 1)
-
     def on_operational_error(self, request, error):
-        statsd_name = "tchannel.outbound.calls.operational-errors"
-
-        prefix = common_prefix(statsd_name, request)
-        key = prefix + '.' + clean(
-            ErrorMessage.ERROR_CODES.get(error.code, None), 'type'
+        self._count(
+            "tchannel.outbound.calls.operational-errors", request, error
         )
 
-        self._statsd.count(key, 1)
+
+class _LRUCache(OrderedDict):
+    """A dict that evicts its least recently read or written entries."""
+
+    def __init__(self, size):
+        super(_LRUCache, self).__init__()
+        self.size = size
+
+    def get(self, key, default=None):
+        try:
+            value = self.pop(key)
+        except KeyError:
+            return default
+        OrderedDict.__setitem__(self, key, value)
+        return value
+
+    def __setitem__(self, key, value):
+        OrderedDict.__setitem__(self, key, value)
+        if len(self) > self.size:
+            self.popitem(last=False)
 
 
 def extract_metadata(request):
@@ -101,20 +185,29 @@ def extract_metadata(request):
 
 
 def common_prefix(statsd_name, request):
-    (service, target_service, target_endpoint) = (
-        extract_metadata(request)
-    )
+    return statsd_name + '.' + _suffix(*extract_metadata(request))
+
 
-    return '.'.join([statsd_name,
-                     clean(service, 'service'),
+def _suffix(service, target_service, target_endpoint):
+    return '.'.join([clean(service, 'service'),
                      clean(target_service, 'target-service'),
                      clean(target_endpoint, 'target-endpoint')
                      ])
 
 
+def _error_type(error):
+    return _ERROR_TYPES.get(error.code, 'no-type')
+
+
 def clean(key, field):
     if not key:
         return 'no-' + field
     else:
 
         return WILDCHAR_REXP.sub('-', key)
+
+
+_ERROR_TYPES = dict(
+    (code, clean(name, 'type'))
+    for code, name in ErrorMessage.ERROR_CODES.items()
+)
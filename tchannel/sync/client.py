@@ -20,22 +20,57 @@
 
 from __future__ import absolute_import
 
-import logging
-
+import functools
+import itertools
+import os
+import sys
+import threading
+
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
 from threadloop import ThreadLoop
+from tornado import gen
 
 from tchannel import TChannel as AsyncTChannel
+from tchannel.offload import Offloader
+
+#: Number of threads running handlers, unless an executor is given.
+DEFAULT_MAX_WORKERS = 10
+
+
+class _ProcessLock(object):
+    """A lock that a forked process gets a new copy of.
+
+    A lock held by another thread when the process forks is never released
+    in the child, where that thread doesn't exist.
+    """
+
+    def __init__(self):
+        # Locks by pid. setdefault is atomic, so threads of a new process
+        # agree on its lock.
+        self._locks = {}
+
+    def _lock(self):
+        pid = os.getpid()
+        lock = self._locks.get(pid)
+        if lock is None:
+            lock = self._locks.setdefault(pid, threading.Lock())
+        return lock
+
+    def __enter__(self):
+        self._lock().acquire()
 
+    def __exit__(self, *exc_info):
+        self._lock().release()
 
-log = logging.getLogger('tchannel')
+
+_start_lock = _ProcessLock()
 
 
 class TChannel(AsyncTChannel):
     """Make synchronous TChannel requests.
 
-    This client does not support incoming requests -- it is a uni-directional
-    client only.
-
     The client is implemented on top of the Tornado-based implementation and
     offloads IO to a thread running an ``IOLoop`` next to your process.
 
@@ -83,6 +118,52 @@ class TChannel(AsyncTChannel):
     (``concurrent.futures`` is native to Python 3; ``pip install futures`` if
     you're using Python 2.x.)
 
+    Every call crosses over to the IOLoop's thread. To make many calls with a
+    single crossing, submit them as a batch with ``many``, which returns
+    their futures in order:
+
+    .. code-block:: python
+
+        futures = tchannel.thrift.many([
+            service.getItem('foo'),
+            service.getItem('bar'),
+        ], timeout=0.5)
+
+        futures = tchannel.json.many([
+            ('foo', 'endpoint', {'key': 'value'}),
+            ('bar', 'endpoint', {'key': 'value'}),
+        ])
+
+    A single IOLoop thread may become the bottleneck of a process making many
+    concurrent calls. With ``loops``, calls are spread across several
+    threads, each running its own IOLoop and connections.
+
+    Handlers are blocking functions. They run on a pool of threads, so a slow
+    handler doesn't hold up other requests, and their responses are written
+    by the IOLoop's thread:
+
+    .. code-block:: python
+
+        tchannel = TChannel(name='my-synchronous-service')
+
+        @tchannel.json.register
+        def hello(request):
+            return lookup(request.body['name'])
+
+        tchannel.listen()
+
+    CPU-bound handlers may run on a process pool instead, given as the
+    ``executor`` of the channel or of a single handler. Such handlers must be
+    module-level functions, and their requests are pickled, so Thrift
+    handlers can only run on threads.
+
+    .. code-block:: python
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        @tchannel.raw.register('resize', executor=ProcessPoolExecutor(4))
+        def resize(request):
+            return resize_image(request.body)
     """
 
     def __init__(
@@ -93,63 +174,353 @@ class TChannel(AsyncTChannel):
         known_peers=None,
         trace=False,
         threadloop=None,
+        json_backend=None,
+        compression=None,
+        metrics=None,
+        profiler=None,
+        offload=None,
+        loops=1,
+        executor=None,
     ):
         """Initialize a new TChannelClient.
 
         :param process_name:
             Name of the calling process. Used for logging purposes only.
+        :param json_backend:
+            JSON library used by the ``json`` arg scheme. See
+            :py:meth:`tchannel.TChannel.__init__`.
+        :param compression:
+            Compression for outgoing requests. See
+            :py:meth:`tchannel.TChannel.__init__`.
+        :param metrics:
+            A :py:class:`tchannel.metrics.MetricsRegistry` to record calls
+            in.
+        :param profiler:
+            A :py:class:`tchannel.profiling.Profiler` to record the duration
+            of the stages of calls in.
+        :param offload:
+            A :py:class:`tchannel.offload.Offloader` to serialize large
+            payloads on an executor instead of the IOLoop's thread.
+        :param loops:
+            Number of threads running an IOLoop to make calls from. Calls are
+            spread across them round-robin. The first one is ``threadloop``,
+            if given. ``metrics`` and ``profiler`` are shared by all of them,
+            and so are event hooks, which are called from every thread.
+            Each thread has its own ``offload``, using the same executor.
+            Requests are only served by the first one.
+        :param executor:
+            A ``concurrent.futures.Executor`` running registered handlers.
+            Defaults to a pool of ``DEFAULT_MAX_WORKERS`` threads.
         """
-        super(TChannel, self).__init__(
-            name,
+        kwargs = dict(
             hostport=hostport,
             process_name=process_name,
             known_peers=known_peers,
             trace=trace,
-
+            json_backend=json_backend,
+            compression=compression,
+            metrics=metrics,
+            profiler=profiler,
+            offload=offload,
         )
+        super(TChannel, self).__init__(name, **kwargs)
+        # Loops created here are stopped by close().
+        self._own_threadloop = threadloop is None
         self._threadloop = threadloop or ThreadLoop()
 
+        # Connections belong to an IOLoop, so every thread gets a TChannel.
+        channels = [self]
+        self._threadloops = [self._threadloop]
+        for _ in range(loops - 1):
+            if offload is not None:
+                # It remembers the size of bodies of this thread's calls.
+                kwargs['offload'] = Offloader(
+                    offload.executor, offload.threshold
+                )
+            channel = AsyncTChannel(name, **kwargs)
+            dep_tchannel = channel._dep_tchannel
+            dep_tchannel.event_emitter = self._dep_tchannel.event_emitter
+            dep_tchannel.hooks = self._dep_tchannel.hooks
+            channels.append(channel)
+            self._threadloops.append(ThreadLoop())
+        self._channels = channels
+        self.executor = executor or ThreadPoolExecutor(DEFAULT_MAX_WORKERS)
+
         self.advertise = self._wrap(self.advertise)
 
-        self.raw = _SyncScheme(self.raw, self._threadloop)
-        self.thrift = _SyncScheme(self.thrift, self._threadloop)
-        self.json = _SyncScheme(self.json, self._threadloop)
+        def context_provider_fn():
+            return self.context_provider
 
-    def register(self, *args, **kwargs):
-        _register(*args, **kwargs)
+        self.raw = _SyncScheme(
+            [c.raw for c in channels], self._threadloops, context_provider_fn
+        )
+        self.thrift = _SyncThriftScheme(
+            [c.thrift for c in channels], self._threadloops,
+            context_provider_fn, self._offload,
+        )
+        self.json = _SyncScheme(
+            [c.json for c in channels], self._threadloops, context_provider_fn
+        )
+
+    def listen(self, port=None):
+        """Start listening for requests on the IOLoop's thread.
+
+        Blocks until the channel is listening.
+        """
+        _submit(
+            self._threadloop, super(TChannel, self).listen, port
+        ).result()
+
+    def close(self):
+        """Close the channel and stop the threads running its IOLoops.
+
+        Blocks until the threads have stopped. A ``threadloop`` given to the
+        constructor is left running.
+        """
+        if self.is_closed():
+            return
+
+        for i, (channel, threadloop) in enumerate(
+            zip(self._channels, self._threadloops)
+        ):
+            if not threadloop.is_ready():
+                AsyncTChannel.close(channel)
+                continue
+            threadloop.submit(AsyncTChannel.close, channel).result()
+            if i > 0 or self._own_threadloop:
+                threadloop.stop()
+
+    def register(self, scheme, endpoint=None, handler=None, executor=None,
+                 **kwargs):
+        """Register a blocking handler.
+
+        Same as :py:meth:`tchannel.TChannel.register`, except for
+        ``executor``, which runs the handler instead of the channel's
+        executor if given.
+        """
+        def decorator(fn):
+            super(TChannel, self).register(
+                scheme, endpoint, self._offload(fn, executor), **kwargs
+            )
+            return fn
+
+        if handler is None:
+            return decorator
+        else:
+            return decorator(handler)
+
+    def _offload(self, handler, executor=None):
+        """Wrap ``handler`` to run on ``executor``, or the channel's.
+
+        On a thread, the handler runs with the span of the request as the
+        current span, so that calls it makes are part of the same trace.
+        Spans can't be pickled, so a handler run by a process pool has no
+        current span.
+        """
+        executor = executor or self.executor
+
+        if isinstance(executor, ProcessPoolExecutor):
+            @functools.wraps(handler)
+            def wrapper(request):
+                return executor.submit(handler, request)
+
+            return wrapper
+
+        @functools.wraps(handler)
+        def wrapper(request):
+            context_provider = self.context_provider
+            span = context_provider.get_current_span()
+            # Tornado resumes the dispatcher on the IOLoop's thread once the
+            # concurrent future is done.
+            return executor.submit(
+                _in_span, context_provider, span, handler, request
+            )
+
+        return wrapper
+
+    def thrift_many(self, requests, **kwargs):
+        """Make a batch of Thrift requests.
+
+        Same as ``thrift.many``.
+
+        :param requests:
+            Requests obtained by calling methods on the service objects of
+            :py:func:`tchannel.thrift.load`.
+        :param kwargs:
+            Arguments of :py:meth:`tchannel.schemes.ThriftArgScheme.__call__`
+            used for every request.
+        :returns:
+            A list of futures for the responses, in the order of ``requests``.
+        """
+        return self.thrift.many(requests, **kwargs)
+
+    def monitor_loop(self, monitor):
+        """Start a :py:class:`tchannel.loop_monitor.LoopMonitor` on the
+        thread running this client's IOLoop.
+
+        :returns:
+            A future that resolves once the monitor has started.
+        """
+        return _submit(self._threadloop, monitor.start)
 
     def _wrap(self, f):
         assert callable(f)
+        name = f.__name__
 
         def wrapper(*a, **kw):
+            # Every thread's TChannel needs peers; the future is the first
+            # one's.
+            for channel, threadloop in zip(
+                self._channels[1:], self._threadloops[1:]
+            ):
+                _submit(threadloop, getattr(channel, name), *a, **kw)
             return _submit(self._threadloop, f, *a, **kw)
 
         return wrapper
 
 
 class _SyncScheme(object):
-    """Wrapper for the API that in the async TChannel class."""
-    def __init__(self, scheme, threadloop):
-        self.scheme = scheme
-        self._threadloop = threadloop
+    """Wrapper for the API that in the async TChannel class.
+
+    :param schemes:
+        The arg scheme of the TChannel of every IOLoop thread.
+    :param threadloops:
+        The thread running each of those TChannels.
+    :param context_provider_fn:
+        Returns the context provider of the TChannel. Calls are made with
+        the calling thread's current span as their parent.
+    """
+    def __init__(self, schemes, threadloops, context_provider_fn):
+        self.schemes = schemes
+        self._threadloops = threadloops
+        self._context_provider_fn = context_provider_fn
+        self._counter = itertools.count()
+
+    @property
+    def scheme(self):
+        return self.schemes[0]
+
+    def _next(self):
+        # itertools.count is thread-safe in CPython.
+        i = next(self._counter) % len(self.schemes)
+        return self.schemes[i], self._threadloops[i]
 
     def __call__(self, *args, **kwargs):
-        return _submit(self._threadloop, self.scheme, *args, **kwargs)
+        scheme, threadloop = self._next()
+        context_provider = self._context_provider_fn()
+        return _submit(
+            threadloop, _in_span,
+            context_provider, context_provider.get_current_span(),
+            scheme, *args, **kwargs
+        )
+
+    def many(self, calls, **kwargs):
+        """Make a batch of calls with a single hop to an IOLoop thread.
+
+        :param calls:
+            The positional arguments of every call, as a tuple, or its only
+            positional argument if it isn't one.
+        :param kwargs:
+            Keyword arguments used for every call.
+        :returns:
+            A list of futures for the responses, in the order of ``calls``.
+        """
+        scheme, threadloop = self._next()
+        calls = [c if isinstance(c, tuple) else (c,) for c in calls]
+        futures = [Future() for _ in calls]
+        context_provider = self._context_provider_fn()
+        span = context_provider.get_current_span()
+
+        def execute():
+            for args, future in zip(calls, futures):
+                try:
+                    result = gen.maybe_future(scheme(*args, **kwargs))
+                except Exception:
+                    _set_exc_info(future, sys.exc_info())
+                else:
+                    result.add_done_callback(
+                        lambda f, future=future: _copy_future(f, future)
+                    )
+
+        _submit(threadloop, _in_span, context_provider, span, execute)
+        return futures
 
     def register(self, *args, **kwargs):
-        return _register(*args, **kwargs)
+        # The scheme registers with the TChannel, which offloads handlers.
+        return self.scheme.register(*args, **kwargs)
 
 
-def _register(*args, **kwargs):
-    log.info("Registration not yet supported for sync tchannel.")
+class _SyncThriftScheme(_SyncScheme):
+    """Thrift scheme of the synchronous TChannel.
 
-    def decorator(fn):
-        return fn
+    thriftrw services are registered with the dispatcher directly rather
+    than through the TChannel, so their handlers are offloaded here.
 
-    return decorator
+    :param offload:
+        Wraps a handler to run on an executor.
+    """
+    def __init__(self, schemes, threadloops, context_provider_fn, offload):
+        super(_SyncThriftScheme, self).__init__(
+            schemes, threadloops, context_provider_fn
+        )
+        self._offload = offload
+
+    def register(self, service, handler=None, method=None, executor=None,
+                 **kwargs):
+        from tchannel.thrift import rw as thriftrw
+
+        if not isinstance(service, thriftrw.Service):
+            return self.scheme.register(
+                service, handler=handler, executor=executor, **kwargs
+            )
+
+        def decorator(fn):
+            self.scheme.register(
+                service,
+                handler=self._offload(fn, executor),
+                method=method,
+            )
+            return fn
+
+        if handler is None:
+            return decorator
+        else:
+            return decorator(handler)
 
 
 def _submit(threadloop, func, *args, **kwargs):
     if not threadloop.is_ready():
-        threadloop.start()
+        # Channels may be shared by threads, which must not all start it.
+        with _start_lock:
+            if not threadloop.is_ready():
+                threadloop.start()
     return threadloop.submit(func, *args, **kwargs)
+
+
+def _in_span(context_provider, span, func, *args, **kwargs):
+    """Call ``func`` with ``span`` as the current span, if there is one.
+
+    The current span belongs to the thread, so it is lost when ``func`` runs
+    on another one.
+    """
+    if span is None:
+        return func(*args, **kwargs)
+    with context_provider.span_in_context(span):
+        return func(*args, **kwargs)
+
+
+def _copy_future(tornado_future, future):
+    """Copy the outcome of a Tornado future to a concurrent one."""
+    if tornado_future.exception() is None:
+        future.set_result(tornado_future.result())
+    else:
+        _set_exc_info(future, tornado_future.exc_info())
+
+
+def _set_exc_info(future, exc_info):
+    # The futures backport keeps the traceback on Python 2 if given
+    # explicitly.
+    if hasattr(future, 'set_exception_info'):
+        future.set_exception_info(*exc_info[1:])
+    else:
+        future.set_exception(exc_info[1])
@@ -22,13 +22,25 @@ from __future__ import (
     absolute_import, division, print_function, unicode_literals
 )
 
+import os
 from threading import local
 
 from tchannel.singleton import TChannel as TChannelSingleton
 from .client import TChannel as SyncTChannel
+from .client import _ProcessLock
 
 
 class TChannel(TChannelSingleton):
+    """Maintain a single synchronous TChannel instance per-thread.
+
+    Prepared with ``shared=True``, a single instance is shared by every
+    thread of the process instead: calls from all threads go through one
+    IOLoop thread, one set of connections and one peer heap.
+
+    .. code-block:: python
+
+        TChannel.prepare('my-app', shared=True)
+    """
 
     tchannel_cls = SyncTChannel
 
@@ -39,10 +51,53 @@ class TChannel(TChannelSingleton):
     args = None
     kwargs = None
 
+    shared = False
+    # (pid, tchannel) of the shared instance. A forked process gets its own,
+    # as the IOLoop thread doesn't survive the fork.
+    _shared = None
+    _lock = _ProcessLock()
+
+    @classmethod
+    def prepare(cls, *args, **kwargs):
+        """Set arguments to be used when instantiating a TChannel instance.
+
+        Arguments are the same as :py:meth:`tchannel.sync.TChannel.__init__`,
+        plus:
+
+        :param shared:
+            Whether to share one instance between all threads.
+        """
+        cls.shared = kwargs.pop('shared', False)
+        super(TChannel, cls).prepare(*args, **kwargs)
+
+    @classmethod
+    def reset(cls, *args, **kwargs):
+        """Undo call to prepare, useful for testing.
+
+        The shared instance is closed, which stops its IOLoop thread.
+        """
+        super(TChannel, cls).reset(*args, **kwargs)
+        cls.shared = False
+        shared, cls._shared = cls._shared, None
+        # The instance of the parent process has no thread in a fork.
+        if shared is not None and shared[0] == os.getpid():
+            shared[1].close()
+
     @classmethod
     def get_instance(cls):
         """Get a configured, thread-safe, singleton TChannel instance.
 
         :returns: tchannel.sync.TChannel
         """
-        return super(TChannel, cls).get_instance()
+        if not cls.shared:
+            return super(TChannel, cls).get_instance()
+
+        pid = os.getpid()
+        shared = cls._shared
+        if shared is not None and shared[0] == pid:
+            return shared[1]
+
+        with cls._lock:
+            if cls._shared is None or cls._shared[0] != pid:
+                cls._shared = (pid, cls.tchannel_cls(*cls.args, **cls.kwargs))
+            return cls._shared[1]
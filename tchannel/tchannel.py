@@ -24,22 +24,31 @@ from __future__ import (
 
 import json
 import logging
+import time
 
 from threading import Lock
 
 from tornado import gen
 
+from . import compression
 from . import schemes
 from . import transport
 from . import retry
 from . import tracing
 from .errors import AlreadyListeningError, ServiceNameIsRequiredError
+from .errors import TChannelError
+from .errors import UnexpectedError
+from .glossary import DEFAULT_FORWARD_BUFFER
 from .glossary import DEFAULT_TIMEOUT
 from .health import health
-from .health import Meta
+from .health import load_meta
+from .messages.error import ErrorMessage
+from .glossary import OUTBOUND
 from .response import Response, TransportHeaders
 from .tornado import TChannel as DeprecatedTChannel
 from .tornado.dispatch import RequestDispatcher as DeprecatedDispatcher
+from .tornado.response import StatusCode
+from .tornado.stream import InMemStream
 from .tracing import TracingContextProvider
 
 log = logging.getLogger('tchannel')
@@ -85,7 +94,9 @@ class TChannel(object):
 
     def __init__(self, name, hostport=None, process_name=None,
                  known_peers=None, trace=True, reuse_port=False,
-                 context_provider=None, tracer=None):
+                 context_provider=None, tracer=None, json_backend=None,
+                 compression=None, metrics=None, profiler=None,
+                 offload=None):
         """
         **Note:** In general only one ``TChannel`` instance should be used at a
         time. Multiple ``TChannel`` instances are not advisable and could
@@ -100,6 +111,42 @@ class TChannel(object):
             An optional host/port to serve on, e.g., ``"127.0.0.1:5555``. If
             not provided an ephemeral port will be used. When advertising on
             Hyperbahn you callers do not need to know your port.
+
+        :param json_backend:
+            JSON library used by the ``json`` arg scheme, both for outgoing
+            calls and registered handlers. Either a module name such as
+            ``"ujson"``, ``"auto"`` to pick the fastest installed library, or
+            an object providing ``dumps`` and ``loads``. Defaults to the
+            standard library ``json`` module.
+
+        :param compression:
+            Opt in to compressing ``arg2`` and ``arg3`` on the wire. Either a
+            codec name (``"zlib"``, or ``"zstd"`` and ``"lz4"`` if the
+            ``zstandard`` and ``lz4`` packages are installed) or a
+            :py:class:`tchannel.compression.Compressor` for a non-default
+            size threshold or maximum decompressed size. Outgoing requests
+            above the threshold are compressed once the peer they are sent
+            to has advertised the codec in the ``ae`` header of a response,
+            and responses are compressed for callers that accept the codec.
+            Without this setting, the channel doesn't advertise ``ae`` and
+            rejects compressed requests.
+
+        :param metrics:
+            A :py:class:`tchannel.metrics.MetricsRegistry` to record counts,
+            latencies and payload sizes of calls made and served by this
+            channel in. Use a :py:class:`tchannel.metrics.MetricsReporter` to
+            flush it to statsd, Prometheus or logs.
+
+        :param profiler:
+            A :py:class:`tchannel.profiling.Profiler` to record the duration
+            of each stage of calls made and served by this channel in, from
+            serialization to the socket and back. Stages are not timed by
+            default.
+
+        :param offload:
+            A :py:class:`tchannel.offload.Offloader` to serialize and
+            deserialize large requests and responses on an executor instead
+            of the IOLoop.
         """
         if not name:
             raise ServiceNameIsRequiredError
@@ -118,17 +165,27 @@ class TChannel(object):
             reuse_port=reuse_port,
             _from_new_api=True,
             context_provider_fn=lambda: self.context_provider,
+            json_backend=json_backend,
+            compression=compression,
+            metrics=metrics,
+            profiler=profiler,
+            offload=offload,
         )
 
         self.name = name
 
         # set arg schemes
         self.raw = schemes.RawArgScheme(self)
-        self.json = schemes.JsonArgScheme(self)
+        self.json = schemes.JsonArgScheme(self, json_backend=json_backend)
         self.thrift = schemes.ThriftArgScheme(self)
         self._listen_lock = Lock()
-        # register default health endpoint
-        self.thrift.register(Meta)(health)
+        # register default health and introspection endpoints
+        self.thrift.register(load_meta().Meta)(health)
+        # Bypass self.register, which subclasses like the sync client may
+        # override to disable registration.
+        TChannel.register(
+            self, schemes.JSON, 'introspect', handler=self._introspect
+        )
 
         # advertise_response is the Future containing the response of calling
         # advertise().
@@ -139,10 +196,71 @@ class TChannel(object):
     def is_listening(self):
         return self._dep_tchannel.is_listening()
 
+    def introspect(self):
+        """Describe the state of this TChannel, for debugging.
+
+        This is also served by the ``introspect`` JSON endpoint.
+
+        .. code:: python
+
+            {
+                "name": "foo",
+                "hostport": "127.0.0.1:4040",
+                "listening": True,
+                "closed": False,
+                "peers": [
+                    {
+                        "hostport": "127.0.0.1:5050",
+                        "rank": 1,
+                        "chosen_count": 12,
+                        "total_outbound_pendings": 1,
+                        "connections": [
+                            {
+                                "direction": "out",
+                                "remote_process_name": "bar[1234]",
+                                "closed": False,
+                                "outbound_pending_calls": 1,
+                                "oldest_outbound_pending_age": 0.012,
+                                "total_outbound_pendings": 1,
+                                "tombstones": 0,
+                                "bytes_read": 2048,
+                                "bytes_written": 4096,
+                                "read_queue": 0,
+                                "write_queue": 0,
+                                "incoming_calls_queue": 0,
+                            }
+                        ],
+                    }
+                ],
+            }
+
+        ``oldest_outbound_pending_age`` is the number of seconds since the
+        oldest call still waiting for a response on that connection was
+        sent, or None.
+
+        :rtype: dict
+        """
+        return self._dep_tchannel.introspect()
+
+    def _introspect(self, request):
+        return self.introspect()
+
     @property
     def hooks(self):
         return self._dep_tchannel.hooks
 
+    @property
+    def profiler(self):
+        return self._dep_tchannel.profiler
+
+    @property
+    def offloader(self):
+        return self._dep_tchannel.offloader
+
+    @property
+    def trace(self):
+        return self._dep_tchannel.trace
+
     @property
     def tracer(self):
         return self._dep_tchannel.tracer
@@ -212,19 +330,67 @@ class TChannel(object):
         if routing_delegate:
             transport_headers[transport.ROUTING_DELEGATE] = routing_delegate
 
-        response = yield operation.send(
-            arg1=arg1,
-            arg2=arg2,
-            arg3=arg3,
-            headers=transport_headers,
-            retry_limit=retry_limit,
-            ttl=timeout,
-        )
+        if self._dep_tchannel.compressor is not None:
+            # The request itself is compressed once the peer it is sent to
+            # has advertised the codec in its responses.
+            transport_headers[transport.ACCEPT_COMPRESSION] = (
+                compression.ACCEPTED
+            )
+
+        metrics = self._dep_tchannel.metrics
+        if metrics is not None:
+            start = time.time()
+
+        try:
+            response = yield operation.send(
+                arg1=arg1,
+                arg2=arg2,
+                arg3=arg3,
+                headers=transport_headers,
+                retry_limit=retry_limit,
+                ttl=timeout,
+            )
+        except TChannelError as e:
+            if metrics is not None:
+                metrics.record_error(
+                    OUTBOUND, transport_headers[transport.CALLER_NAME],
+                    service, arg1, None,
+                    ErrorMessage.ERROR_CODES.get(e.code, None),
+                )
+            raise
 
         # unwrap response
         body = yield response.get_body()
         headers = yield response.get_header()
         t = TransportHeaders.from_dict(response.headers)
+
+        if metrics is not None:
+            connection = response.connection
+            metrics.record_call(
+                OUTBOUND, transport_headers[transport.CALLER_NAME],
+                service, arg1,
+                connection and '%s:%s' % (
+                    connection.remote_host, connection.remote_host_port,
+                ),
+                response.code == StatusCode.ok,
+                (time.time() - start) * 1000,
+                _args_size(arg2, arg3),
+                len(headers) + len(body),
+            )
+
+        if t.compression is not None:
+            compressor = self._dep_tchannel.compressor
+            max_size = compression.DEFAULT_MAX_SIZE
+            if compressor is not None:
+                max_size = compressor.max_size
+            try:
+                headers = compression.decompress(
+                    t.compression, headers, max_size
+                )
+                body = compression.decompress(t.compression, body, max_size)
+            except ValueError as e:
+                raise UnexpectedError(description=str(e))
+            t.compression = None
         result = Response(
             body=body,
             headers=headers,
@@ -234,6 +400,113 @@ class TChannel(object):
 
         raise gen.Return(result)
 
+    @gen.coroutine
+    def forward(
+        self,
+        request,
+        service=None,
+        hostport=None,
+        timeout=None,
+        retry_limit=None,
+        max_buffered=DEFAULT_FORWARD_BUFFER,
+    ):
+        """Relay an inbound request to another TChannel service.
+
+        The request's ``arg2`` and ``arg3`` are sent as-is, without being
+        deserialized or re-serialized, along with its transport headers (so
+        the original caller name and arg scheme are preserved). The returned
+        :py:class:`tchannel.Response` contains the response's ``arg2`` and
+        ``arg3`` as streams; returning it from a handler relays it back to
+        the caller frame by frame.
+
+        For the request to be relayed without being read into memory first,
+        register the handler with ``streaming=True``:
+
+        .. code:: python
+
+            @tchannel.register(TChannel.FALLBACK, streaming=True)
+            def relay(request):
+                return tchannel.forward(request, hostport='127.0.0.1:4040')
+
+        While a request is streamed in, at most ``max_buffered`` frames of
+        its ``arg2`` and ``arg3`` are held in memory. Once they are, frames
+        are no longer read from the caller's connection until the
+        destination accepts more. TChannel has no per-request flow control,
+        so this pauses every call coming in over that connection. The
+        response is relayed without such a bound.
+
+        :param request:
+            :py:class:`tchannel.Request` received by a handler.
+        :param string service:
+            Name of the service to forward to. Defaults to the service the
+            request was addressed to.
+        :param string hostport:
+            A 'host:port' value to forward the request to. If omitted, a known
+            peer is chosen.
+        :param float timeout:
+            Timeout for the forwarded request. Defaults to the request's own
+            timeout. Ignored if the request is still being streamed in.
+        :param int retry_limit:
+            How many times to retry the request. Defaults to 0 since callers
+            retry on their own. Requests that are still being streamed in are
+            never retried.
+        :param int max_buffered:
+            Number of frames of the request held in memory before reading
+            from the caller is paused, or None for no bound.
+
+        :rtype: Response
+        """
+        if request.transport is not None:
+            transport_headers = request.transport.to_dict()
+        else:
+            transport_headers = {}
+
+        # Prefer the payload as it was received if the handler was given a
+        # deserialized request.
+        arg2 = request.raw_headers
+        if arg2 is None:
+            arg2 = request.headers
+        arg3 = request.raw_body
+        if arg3 is None:
+            arg3 = request.body
+
+        streams = [
+            arg for arg in (arg2, arg3) if isinstance(arg, InMemStream)
+        ]
+        for stream in streams:
+            stream.set_max_buffered(max_buffered)
+
+        operation = self._dep_tchannel.request(
+            service=service or request.service,
+            hostport=hostport,
+            arg_scheme=transport_headers.get(transport.SCHEME),
+            retry=transport_headers.get(transport.RETRY_FLAGS),
+        )
+
+        try:
+            response = yield operation.send(
+                arg1=request.endpoint,
+                arg2=arg2,
+                arg3=arg3,
+                headers=transport_headers,
+                retry_limit=retry_limit or 0,
+                ttl=timeout or request.timeout,
+            )
+        finally:
+            # Nothing reads what's left of a request that failed, so the
+            # caller's connection must not stay paused on it.
+            for stream in streams:
+                stream.set_max_buffered(None)
+
+        result = Response(
+            body=response.get_body_s(),
+            headers=response.get_header_s(),
+            transport=TransportHeaders.from_dict(response.headers),
+            status=response.code,
+        )
+
+        raise gen.Return(result)
+
     def listen(self, port=None):
         with self._listen_lock:
             if self._dep_tchannel.is_listening():
@@ -389,3 +662,10 @@ class TChannel(object):
         # hold and end up in a deadlock.
         future.add_done_callback(_on_advertise)
         return future
+
+
+def _args_size(arg2, arg3):
+    """Size of the given args, or None if they aren't strings."""
+    if isinstance(arg2, basestring) and isinstance(arg3, basestring):
+        return len(arg2) + len(arg3)
+    return None
@@ -38,15 +38,28 @@ examples:
 
       tcurl.py --thrift larry.thrift --service larry --endpoint Larry::nyuck \\
       --body '{"nyuck": "nyuck"}'
+
+
+    Send every JSON body in bodies.jsonl to "larry", 20 at a time:
+
+      tcurl.py --service larry --endpoint nyuck --body-file bodies.jsonl \\
+      --concurrency 20
+
+
+    Smoke test "larry" with 100 identical requests:
+
+      tcurl.py --service larry --endpoint nyuck --body '{}' --requests 100
 """
 
 from __future__ import absolute_import
 
 import argparse
+import itertools
 import logging
 import json
 import os
 import sys
+import time
 import traceback
 
 import tornado.ioloop
@@ -74,6 +87,75 @@ def parse_args(args=None):
         formatter_class=Formatter,
     )
 
+    add_request_arguments(parser)
+
+    parser.add_argument(
+        "--health",
+        action="store_true",
+        help=(
+            "Perform a health check against the given service. This overrides "
+            "--endpoint."
+        ),
+    )
+
+    batch_group = parser.add_argument_group('batch')
+
+    batch_group.add_argument(
+        "--requests",
+        dest="requests",
+        type=int,
+        default=None,
+        help=(
+            "Number of requests to make. With --body-file, at most this many "
+            "lines are sent. Each result is printed as a line of JSON, "
+            "followed by a latency summary on stderr."
+        ),
+    )
+
+    batch_group.add_argument(
+        "--body-file", "-f",
+        dest="body_file",
+        type=argparse.FileType('r'),
+        default=None,
+        help=(
+            "Send one request per line of this file, or of stdin if it is "
+            "'-'. Lines are JSON blobs unless --raw was specified. "
+            "Incompatible with --body."
+        ),
+    )
+
+    batch_group.add_argument(
+        "--concurrency", "-c",
+        dest="concurrency",
+        type=int,
+        default=1,
+        help="Number of requests in flight at any time.",
+    )
+
+    parser.add_argument(
+        "-v", "--verbose",
+        dest="verbose",
+        action="store_true",
+        help="Say more.",
+    )
+
+    args = parser.parse_args(args)
+
+    if args.body_file and args.body is not None:
+        return parser.error("can't use --body-file and --body together")
+
+    if args.requests is not None and args.requests < 1:
+        return parser.error("--requests must be at least 1")
+
+    if args.concurrency < 1:
+        return parser.error("--concurrency must be at least 1")
+
+    return check_request_arguments(parser, args)
+
+
+def add_request_arguments(parser):
+    """Add the arguments describing the request to make to ``parser``."""
+
     parser.add_argument(
         "--service", "-s",
         dest="service",
@@ -130,22 +212,6 @@ def parse_args(args=None):
         ),
     )
 
-    parser.add_argument(
-        "--health",
-        action="store_true",
-        help=(
-            "Perform a health check against the given service. This overrides "
-            "--endpoint."
-        ),
-    )
-
-    parser.add_argument(
-        "-v", "--verbose",
-        dest="verbose",
-        action="store_true",
-        help="Say more.",
-    )
-
     thrift_group = parser.add_argument_group('thrift')
 
     thrift_group.add_argument(
@@ -168,7 +234,9 @@ def parse_args(args=None):
         ),
     )
 
-    args = parser.parse_args(args)
+
+def check_request_arguments(parser, args):
+    """Validate and decode the request arguments parsed by ``parser``."""
 
     if not args.raw:
         try:
@@ -210,6 +278,28 @@ def main(argv=None):
         )
         args.endpoint = "Meta::health"
 
+    call = _make_call(tchannel, args)
+
+    if args.body_file or args.requests is not None:
+        stats = yield _run_batch(args, call)
+        tchannel.close()
+        if stats.errors:
+            sys.exit(1)
+        raise tornado.gen.Return(stats.to_dict())
+
+    result = yield _catch_errors(call(args.body), verbose=args.verbose)
+
+    if not args.raw:
+        print json.dumps(result.body, default=_dictify)
+    else:
+        print result.body
+
+    raise tornado.gen.Return(result)
+
+
+def _make_call(tchannel, args):
+    """Return a function making the request described by ``args`` with the
+    given body."""
     if args.thrift:
 
         thrift_service_name, thrift_method_name = args.endpoint.split('::')
@@ -222,51 +312,93 @@ def main(argv=None):
         thrift_service = getattr(thrift_module, thrift_service_name)
         thrift_method = getattr(thrift_service, thrift_method_name)
 
-        body = args.body or {}
-
-        result = yield _catch_errors(
-            tchannel.thrift(
-                thrift_method(**body),
-                headers=args.headers,
-                timeout=args.timeout,
-            ),
-            verbose=args.verbose,
-        )
-
-    elif args.raw:
-
-        result = yield _catch_errors(
-            tchannel.raw(
-                service=args.service,
-                endpoint=args.endpoint,
-                body=args.body,
-                headers=args.headers,
-                timeout=args.timeout,
-                hostport=args.host,
-            ),
-            verbose=args.verbose,
+        return lambda body: tchannel.thrift(
+            thrift_method(**(body or {})),
+            headers=args.headers,
+            timeout=args.timeout,
         )
 
-    else:
-
-        result = yield _catch_errors(
-            tchannel.json(
-                service=args.service,
-                endpoint=args.endpoint,
-                body=args.body,
-                headers=args.headers,
-                timeout=args.timeout,
-                hostport=args.host,
-            ),
-            verbose=args.verbose,
-        )
+    scheme = tchannel.raw if args.raw else tchannel.json
+    return lambda body: scheme(
+        service=args.service,
+        endpoint=args.endpoint,
+        body=body,
+        headers=args.headers,
+        timeout=args.timeout,
+        hostport=args.host,
+    )
 
-    if not args.raw:
-        print json.dumps(result.body, default=_dictify)
-    else:
-        print result.body
 
-    raise tornado.gen.Return(result)
+@tornado.gen.coroutine
+def _run_batch(args, call):
+    """Make a request for every body given by ``args`` over the same channel,
+    ``args.concurrency`` at a time.
+
+    A line of JSON is printed for every request as it completes, and a
+    summary of the latencies and errors is printed on stderr at the end.
+
+    :returns:
+        The :py:class:`tchannel.bench.Stats` of the requests.
+    """
+    # tchannel.bench imports the argument parsing from this module.
+    from .bench import Stats
+    from .bench import format_result
+
+    stats = Stats()
+    bodies = enumerate(_read_bodies(args))
+
+    @tornado.gen.coroutine
+    def send(body):
+        if args.body_file and not args.raw:
+            body = json.loads(body)
+        response = yield call(body)
+        raise tornado.gen.Return(response)
+
+    @tornado.gen.coroutine
+    def caller():
+        for index, body in bodies:
+            started = time.time()
+            future = send(body)
+            try:
+                response = yield future
+            except Exception, e:
+                result = {'error': '%s: %s' % (type(e).__name__, e)}
+                if args.verbose:
+                    traceback.print_exc(file=sys.stderr)
+            else:
+                result = {'body': _printable(response.body, args.raw)}
+            stats.record(started, future)
+
+            result['request'] = index
+            result['latency_ms'] = (time.time() - started) * 1000.0
+            print json.dumps(result, default=_dictify, sort_keys=True)
+
+    start = time.time()
+    yield [caller() for _ in xrange(args.concurrency)]
+    stats.elapsed = time.time() - start
+
+    print >> sys.stderr, format_result(stats.to_dict())
+    raise tornado.gen.Return(stats)
+
+
+def _read_bodies(args):
+    if not args.body_file:
+        return itertools.repeat(args.body, args.requests)
+
+    return itertools.islice(_lines(args.body_file), args.requests)
+
+
+def _lines(f):
+    for line in f:
+        line = line.rstrip('\r\n')
+        if line:
+            yield line
+
+
+def _printable(body, raw):
+    if raw and isinstance(body, str):
+        return body.decode('utf-8', 'replace')
+    return body
 
 
 @tornado.gen.coroutine
@@ -26,9 +26,9 @@ VCR
 API is heavily inspired by the `vcrpy <https://github.com/kevin1024/vcrpy/>`_
 library.
 
-This allows recording TChannel requests and their responses into YAML files
-during integration tests and replaying those recorded responses when the tests
-are run next time.
+This allows recording TChannel requests and their responses into YAML (or
+JSON lines) files during integration tests and replaying those recorded
+responses when the tests are run next time.
 
 The simplest way to use this is with the :py:func:`use_cassette` function.
 
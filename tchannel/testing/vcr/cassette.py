@@ -25,6 +25,9 @@ import os.path
 import json
 
 from itertools import chain
+from itertools import count
+from collections import OrderedDict
+from collections import defaultdict
 from collections import deque
 from collections import namedtuple
 from copy import deepcopy
@@ -62,15 +65,6 @@ class Interaction(namedtuple('Interaction', 'request response')):
         )
 
 
-def attrmatcher(name):
-    "A matcher that matches if the given attribute is equal for both values."
-
-    def matcher(left, right):
-        return getattr(left, name) == getattr(right, name)
-
-    return matcher
-
-
 def filter_headers(hs):
     return {
         k: v for k, v in hs.iteritems()
@@ -78,68 +72,83 @@ def filter_headers(hs):
     }
 
 
-def json_headers_matcher(l, r):
-    try:
-        left = json.loads(l)  # raises ValueError
-        right = json.loads(r)
+def attrkey(name):
+    "A key that is the value of the given attribute."
 
-        if not isinstance(left, dict) or not isinstance(right, dict):
-            return left == right
+    def key(request):
+        return getattr(request, name)
 
-        return filter_headers(left) == filter_headers(right)
-    except ValueError:
-        # fall back to matching values
-        return l == r
+    return key
+
+
+def transport_headers_key(request):
+    return tuple((h.key, h.value) for h in request.transportHeaders)
 
 
-def thrift_headers_matcher(l, r):
-    serializer = ThriftSerializer(None)
+def _freeze(value):
+    """Make a decoded JSON value hashable.
+
+    Two frozen values are equal if and only if the values are, so ``1`` and
+    ``1.0`` stay equal.
+    """
+    if isinstance(value, dict):
+        return frozenset((k, _freeze(v)) for k, v in value.iteritems())
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def json_headers_key(headers):
     try:
-        left = serializer.deserialize_header(l)
-        right = serializer.deserialize_header(r)
+        value = json.loads(headers)
+    except ValueError:
+        return headers
+
+    if isinstance(value, dict):
+        value = filter_headers(value)
+    return ('json', _freeze(value))
+
 
-        return filter_headers(left) == filter_headers(right)
+def thrift_headers_key(headers):
+    try:
+        value = ThriftSerializer(None).deserialize_header(headers)
     except Exception:
-        return l == r
+        return headers
+
+    return ('thrift', frozenset(filter_headers(value).iteritems()))
 
 
-_HEADER_MATCHERS = {
-    proxy.ArgScheme.JSON: json_headers_matcher,
-    proxy.ArgScheme.THRIFT: thrift_headers_matcher,
+_HEADER_KEYS = {
+    proxy.ArgScheme.JSON: json_headers_key,
+    proxy.ArgScheme.THRIFT: thrift_headers_key,
 }
 
 
-def headers_matcher(left, right):
-    """A matcher that matches if the headers match.
+def headers_key(request):
+    """A key equal for two requests if their headers match.
 
-    This ignores the tracing headers if we know how to parse the application
-    headers.
+    Tracing headers are ignored if we know how to parse the application
+    headers. Otherwise the headers are matched as-is.
     """
-    if left.argScheme != right.argScheme:
-        return False
+    k = _HEADER_KEYS.get(request.argScheme)
+    if k is None:
+        return request.argScheme, request.headers
+    return request.argScheme, k(request.headers)
 
-    m = _HEADER_MATCHERS.get(left.argScheme)
-    if m is None:
-        # We don't know how to parse these headers. Just match the headers
-        # as-is.
-        return left.headers == right.headers
-    return m(left.headers, right.headers)
 
-
-# A dictionary from matcher name to matcher.
-#
-# A matcher is a function that takes two arguments and returns true if they
-# match.
+# A dictionary from matcher name to a function that takes a request and
+# returns a hashable key. Two requests match if their keys are equal for
+# every matcher; interactions are indexed by these keys.
 #
 # The dictionary contains all known matchers.
-_MATCHERS = {
-    n: attrmatcher(n) for n in (
+_KEYS = {
+    n: attrkey(n) for n in (
         'serviceName', 'hostPort', 'endpoint', 'body', 'argScheme',
-        'transportHeaders',
     )
 }
 
-_MATCHERS['headers'] = headers_matcher
+_KEYS['transportHeaders'] = transport_headers_key
+_KEYS['headers'] = headers_key
 
 
 DEFAULT_MATCHERS = (
@@ -166,7 +175,12 @@ class Cassette(object):
             be considered equal.
         :param serializer:
             An object with a ``dump(obj)`` and a ``load(str)`` method used to
-            serialize and deserialize the cassette.
+            serialize and deserialize the cassette. Defaults to
+            :py:mod:`tchannel.testing.vcr.yaml`. If its ``streaming``
+            attribute is True, like :py:mod:`tchannel.testing.vcr.jsonl`'s,
+            it also has ``load_stream(file)`` and ``append(file,
+            interactions, version)`` methods: interactions are read from the
+            file as they are needed and new ones are appended to it.
         """
         # TODO move documentation around
         record_mode = record_mode or RecordMode.ONCE
@@ -186,15 +200,21 @@ class Cassette(object):
         if matchers is None:
             matchers = DEFAULT_MATCHERS
 
-        self._matchers = []
+        self._keys = []
         for m in matchers:
             try:
-                self._matchers.append(_MATCHERS[m])
+                self._keys.append(_KEYS[m])
             except KeyError:
                 raise KeyError('%s is not a known matcher' % m)
 
         self._record_mode = record_mode
-        self._available = deque()
+        # Interactions that haven't been played, in order, by sequence
+        # number; and the sequence numbers of these by request key.
+        self._available = OrderedDict()
+        self._index = defaultdict(deque)
+        self._sequence = count()
+        # Interactions of a streamed cassette that haven't been read yet.
+        self._pending = None
         self._played = deque()
         self._recorded = deque()
         self._cache = Cassette._cache
@@ -224,24 +244,62 @@ class Cassette(object):
     @property
     def data(self):
         """Get all known data for this cassette."""
-
+        self._read_pending()
         return deque(
-            chain(self._played, self._available, self._recorded)
+            chain(self._played, self._available.values(), self._recorded)
         )
 
-    def _match(self, left, right):
-        return all(m(left, right) for m in self._matchers)
+    def _key(self, request):
+        return tuple(k(request) for k in self._keys)
+
+    @property
+    def _streamed(self):
+        return getattr(self.serializer, 'streaming', False) is True
 
-    def _find(self, request, haystack=None):
-        "A generator that returns yields matching interactions for a request"
+    def _make_available(self, interactions):
+        self._available = OrderedDict()
+        self._index = defaultdict(deque)
+        for interaction in interactions:
+            self._add_available(interaction)
 
-        haystack = haystack or self._available
+    def _add_available(self, interaction):
+        n = next(self._sequence)
+        self._available[n] = interaction
+        self._index[self._key(interaction.request)].append(n)
 
-        for interaction in haystack:
-            if self._match(request, interaction.request):
-                yield interaction
+    def _find(self, request):
+        """Sequence numbers of available interactions matching a request.
+
+        Pending interactions are read until one matches.
+        """
+        key = self._key(request)
+        numbers = self._index.get(key)
+        while not numbers and self._pending is not None:
+            interaction = next(self._pending, None)
+            if interaction is None:
+                self._pending = None
+            else:
+                self._add_available(interaction)
+                numbers = self._index.get(key)
+        return numbers
+
+    def _read_pending(self):
+        if self._pending is not None:
+            for interaction in self._pending:
+                self._add_available(interaction)
+            self._pending = None
+
+    def _check_version(self, version):
+        if int(version) != VERSION:
+            raise UnsupportedVersionError(
+                'Cassette at "%s" is an unsupported version of the '
+                'format: version %s' % (self.path, str(version))
+            )
 
     def _load(self):
+        if self._streamed:
+            return self._load_stream()
+
         file_hash = None
         try:
             with open(self.path, 'rb') as f:
@@ -250,7 +308,7 @@ class Cassette(object):
                 file_hash = sha256(data).hexdigest()
                 cached = self._cache.get((self.path, file_hash))
                 if cached is not None:
-                    self._available = deepcopy(cached)
+                    self._make_available(deepcopy(cached))
                     return
         except IOError:
             return  # nothing to read
@@ -259,22 +317,41 @@ class Cassette(object):
         if not (data and 'interactions' in data):
             return  # file was probably empty
 
-        if int(data['version']) != VERSION:
-            raise UnsupportedVersionError(
-                'Cassette at "%s" is an unsupported version of the '
-                'format: version %s' % (self.path, str(data['version']))
-            )
+        self._check_version(data['version'])
 
-        self._available = [
+        interactions = [
             Interaction.to_native(i) for i in data['interactions']
         ]
         if file_hash is not None:
-            self._cache[(self.path, file_hash)] = deepcopy(self._available)
+            self._cache[(self.path, file_hash)] = deepcopy(interactions)
+        self._make_available(interactions)
+
+    def _load_stream(self):
+        try:
+            f = open(self.path, 'rb')
+        except IOError:
+            return  # nothing to read
+
+        self.existed = True
+        try:
+            version, interactions = self.serializer.load_stream(f)
+            if version is None:
+                f.close()
+                return  # file was empty
+            self._check_version(version)
+        except Exception:
+            f.close()
+            raise
+
+        self._pending = _read(f, interactions)
 
     def save(self):
         if not self._recorded:
             return
 
+        if self._streamed:
+            return self._append()
+
         # Order:
         # - things that were played in the order that were played
         # - things that haven't been played yet -- assuming the record mode
@@ -282,7 +359,7 @@ class Cassette(object):
         # - things that were recorded in this session
         interactions = deque(self._played)
         if self._record_mode.save_unplayed:
-            interactions.extend(self._available)
+            interactions.extend(self._available.values())
         interactions.extend(self._recorded)
 
         data = self.serializer.dump(
@@ -300,18 +377,42 @@ class Cassette(object):
             f.write(data)
 
         self._played = deque()
-        self._available = interactions
+        self._make_available(interactions)
         self._recorded = deque()
 
+    def _append(self):
+        # Unless unplayed interactions are forgotten, the recorded ones are
+        # all that's missing from the file.
+        if self._record_mode.save_unplayed:
+            mode, interactions = 'ab', self._recorded
+        else:
+            mode, interactions = 'wb', chain(self._played, self._recorded)
+
+        cassette_dir = os.path.dirname(self.path)
+        if not os.path.isdir(cassette_dir):
+            os.makedirs(cassette_dir)
+
+        if self._pending is not None:
+            self._pending.close()
+            self._pending = None
+
+        with open(self.path, mode) as f:
+            self.serializer.append(
+                f, [i.to_primitive() for i in interactions], VERSION
+            )
+
+        # Everything in the file is available again, as with other formats.
+        self._played = deque()
+        self._recorded = deque()
+        self._make_available(())
+        existed = self.existed
+        self._load_stream()
+        self.existed = existed
+
     def can_replay(self, request):
         if not self._record_mode.replayable:
             return False
-        try:
-            next(self._find(request))
-        except StopIteration:
-            return False
-        else:
-            return True
+        return bool(self._find(request))
 
     def replay(self, request):
         assert self._record_mode.replayable, (
@@ -319,15 +420,15 @@ class Cassette(object):
             'requests'
         )
 
-        for interaction in self._find(request):
-            # TODO request matchers
-            self._available.remove(interaction)
-            self._played.append(interaction)
-            return interaction.response
+        numbers = self._find(request)
+        if not numbers:
+            raise RequestNotFoundError(
+                'Could not find a recorded response for %s' % repr(request)
+            )
 
-        raise RequestNotFoundError(
-            'Could not find a recorded response for %s' % repr(request)
-        )
+        interaction = self._available.pop(numbers.popleft())
+        self._played.append(interaction)
+        return interaction.response
 
     def record(self, request, response):
         assert not self.write_protected, (
@@ -335,3 +436,11 @@ class Cassette(object):
             'new requests'
         )
         self._recorded.append(Interaction(request, response))
+
+
+def _read(f, interactions):
+    """Convert interactions read from a file as they are consumed, and close
+    the file once they all are."""
+    with f:
+        for interaction in interactions:
+            yield Interaction.to_native(interaction)
@@ -26,18 +26,21 @@ import wrapt
 import sys
 
 from .cassette import Cassette
-from .patch import Patcher, force_reset
+from .patch import InProcessPatcher, Patcher, force_reset
 from .server import VCRProxyService
 
 
 class _CassetteContext(object):
     """Lets use_cassette be used as a context manager and a decorator."""
 
-    def __init__(self, path, record_mode, inject, matchers):
+    def __init__(self, path, record_mode, inject, matchers, serializer,
+                 in_process):
         self.path = path
         self.record_mode = record_mode
         self.inject = inject
         self.matchers = matchers
+        self.serializer = serializer
+        self.in_process = in_process
 
         self._exit_stack = contextlib2.ExitStack()
 
@@ -47,9 +50,14 @@ class _CassetteContext(object):
                 path=self.path,
                 record_mode=self.record_mode,
                 matchers=self.matchers,
+                serializer=self.serializer,
             )
         )
 
+        if self.in_process:
+            self._exit_stack.enter_context(InProcessPatcher(cassette))
+            return cassette
+
         server = self._exit_stack.enter_context(
             VCRProxyService(cassette=cassette, unpatch=force_reset)
         )
@@ -95,7 +103,8 @@ class _CassetteContext(object):
                 return function(*args, **kwargs)
 
 
-def use_cassette(path, record_mode=None, inject=False, matchers=None):
+def use_cassette(path, record_mode=None, inject=False, matchers=None,
+                 serializer=None, in_process=False):
     """Use or create a cassette to record/replay TChannel requests.
 
     This may be used as a context manager or a decorator.
@@ -159,6 +168,17 @@ def use_cassette(path, record_mode=None, inject=False, matchers=None):
         ``endpoint``, ``headers``, ``body``, and ``argScheme``.
         :py:data:`tchannel.testing.vcr.DEFAULT_MATCHERS` is a tuple of all
         these matchers.
+    :param serializer:
+        Format of the cassette. Defaults to YAML,
+        :py:mod:`tchannel.testing.vcr.yaml`. Large cassettes are faster to
+        load and record in the JSON lines format of
+        :py:mod:`tchannel.testing.vcr.jsonl`, which is read as interactions
+        are replayed and appended to as they are recorded.
+    :param in_process:
+        If True, requests are replayed from and recorded into the cassette
+        as they are sent, rather than through a proxy server running in
+        another thread. This saves a round trip over the network for every
+        request. Cassettes are the same in both cases.
     """
 
     return _CassetteContext(
@@ -166,6 +186,8 @@ def use_cassette(path, record_mode=None, inject=False, matchers=None):
         record_mode=record_mode,
         inject=inject,
         matchers=matchers,
+        serializer=serializer,
+        in_process=in_process,
     )
 
     # TODO create some sort of configurable VCR object which implements
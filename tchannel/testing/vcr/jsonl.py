@@ -0,0 +1,127 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""JSON lines cassette format.
+
+The first line of a cassette holds its version and every following line one
+interaction:
+
+.. code-block:: none
+
+    {"version": 1}
+    {"request": {...}, "response": {...}}
+    {"request": {...}, "response": {...}}
+
+Unlike YAML, interactions can be parsed one at a time as they are replayed,
+and new interactions are appended to the file rather than rewriting it.
+
+.. code-block:: python
+
+    from tchannel.testing.vcr import jsonl
+
+    with vcr.use_cassette('tests/data/foo.jsonl', serializer=jsonl):
+        # ...
+
+Binary values that aren't valid UTF-8 are stored base64-encoded.
+"""
+
+from __future__ import absolute_import
+
+import base64
+import json
+
+#: Cassettes in this format are read and written incrementally.
+streaming = True
+
+_BINARY = '$binary'
+
+
+def _encode(value):
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.iteritems()}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, bytes):
+        try:
+            return value.decode('utf-8')
+        except UnicodeDecodeError:
+            return {_BINARY: base64.b64encode(value)}
+    return value
+
+
+def _decode(obj):
+    if len(obj) == 1 and _BINARY in obj:
+        return base64.b64decode(obj[_BINARY])
+    return obj
+
+
+def _dumps(obj):
+    return json.dumps(_encode(obj), sort_keys=True) + '\n'
+
+
+def _loads(line):
+    return json.loads(line, object_hook=_decode)
+
+
+def load(s):
+    """Load a whole cassette."""
+    lines = [line for line in s.splitlines() if line.strip()]
+    if not lines:
+        return None
+    return {
+        'version': _loads(lines[0])['version'],
+        'interactions': [_loads(line) for line in lines[1:]],
+    }
+
+
+def dump(d):
+    """Dump a whole cassette."""
+    return _dumps({'version': d['version']}) + ''.join(
+        _dumps(i) for i in d['interactions']
+    )
+
+
+def load_stream(f):
+    """Start reading a cassette from a file.
+
+    :returns:
+        A tuple of the version of the cassette, or None if the file is empty,
+        and an iterator of its interactions, parsed as they are consumed.
+    """
+    lines = (line for line in f if line.strip())
+    header = next(lines, None)
+    if header is None:
+        return None, iter(())
+    return _loads(header)['version'], (_loads(line) for line in lines)
+
+
+def append(f, interactions, version):
+    """Append interactions to a cassette file opened for appending.
+
+    The version line is written first if the file is empty.
+    """
+    f.seek(0, 2)
+    if f.tell() == 0:
+        f.write(_dumps({'version': version}))
+    for interaction in interactions:
+        f.write(_dumps(interaction))
+
+
+__all__ = ['load', 'dump', 'load_stream', 'append']
@@ -29,6 +29,7 @@ from tornado import gen
 from tchannel import schemes
 from tchannel.errors import TChannelError
 from tchannel.tornado import TChannel
+from tchannel.tornado.peer import PeerClientOperation
 from tchannel.tornado.response import Response
 from tchannel.tornado.stream import maybe_stream
 from tchannel.tornado.stream import read_full
@@ -37,6 +38,7 @@ from . import proxy
 
 
 _TChannel_request = TChannel.request
+_PeerClientOperation_send = PeerClientOperation.send
 
 
 @contextlib2.contextmanager
@@ -165,3 +167,104 @@ class Patcher(object):
                 return function(*args, **kwargs)
 
         return new_function
+
+
+class InProcessPatcher(object):
+    """Monkey patches ``PeerClientOperation.send`` to replay requests from a
+    cassette, or make and record them, without going through a
+    :py:class:`tchannel.testing.vcr.server.VCRProxyService`.
+
+    Requests and responses are recorded exactly as the proxy records them,
+    so cassettes can be used with either.
+    """
+
+    def __init__(self, cassette):
+        """
+        :param cassette:
+            Cassette being played.
+        """
+        self.cassette = cassette
+        self._exit_stack = contextlib2.ExitStack()
+
+    @gen.coroutine
+    def send(self, operation, arg1, arg2, arg3,
+             headers=None,
+             retry_limit=None,
+             ttl=None):
+        arg1, arg2, arg3 = map(maybe_stream, [arg1, arg2, arg3])
+
+        endpoint = yield read_full(arg1)
+        arg_scheme = operation.headers['as']
+
+        headers = headers or {}
+        headers.setdefault('as', arg_scheme)
+
+        service = operation.service
+        if isinstance(service, bytes):
+            service = service.decode('utf-8')
+
+        request = proxy.Request(
+            serviceName=service,
+            hostPort=operation._hostport or '',
+            knownPeers=operation.tchannel.peers.hosts,
+            endpoint=endpoint.decode('utf-8'),
+            headers=(yield read_full(arg2)),
+            body=(yield read_full(arg3)),
+            argScheme=getattr(proxy.ArgScheme, arg_scheme.upper()),
+            transportHeaders=[
+                proxy.TransportHeader(bytes(k), bytes(v))
+                for k, v in headers.items()
+            ],
+        )
+
+        cassette = self.cassette
+        if cassette.can_replay(request):
+            vcr_response = cassette.replay(request)
+            if operation.tracing_span is not None:
+                operation.tracing_span.finish()
+        elif cassette.write_protected:
+            raise proxy.CannotRecordInteractionsError(
+                'Could not find a matching response for request %s and the '
+                'record mode %s prevents new interactions from being '
+                'recorded. Your test may be performing an unexpected '
+                'request.' % (str(request), cassette.record_mode)
+            )
+        else:
+            response = yield _PeerClientOperation_send(
+                operation,
+                endpoint,
+                request.headers,
+                request.body,
+                headers=headers,
+                retry_limit=retry_limit,
+                ttl=ttl,
+            )
+            vcr_response = proxy.Response(
+                code=response.status_code,
+                headers=(yield response.get_header()),
+                body=(yield response.get_body()),
+            )
+            cassette.record(request, vcr_response)
+
+        raise gen.Return(Response(
+            code=vcr_response.code,
+            argstreams=[
+                maybe_stream(endpoint),
+                maybe_stream(vcr_response.headers),
+                maybe_stream(vcr_response.body),
+            ],
+        ))
+
+    def _patch_send(self):
+
+        @wraps(_PeerClientOperation_send)
+        def send(operation, *args, **kwargs):
+            return self.send(operation, *args, **kwargs)
+
+        return mock.patch.object(PeerClientOperation, 'send', send)
+
+    def __enter__(self):
+        self._exit_stack.enter_context(self._patch_send())
+
+    def __exit__(self, *args):
+        self._exit_stack.close()
@@ -0,0 +1,178 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""On-disk cache of parsed Thrift IDLs.
+
+Most of the time :py:func:`tchannel.thrift.load` spends on an IDL goes to
+parsing it. With a cache directory, the parsed IDL is pickled there, keyed
+by a hash of its contents and of the version of ``thriftrw``, and later
+loads of the same IDL, from this or any other process, skip parsing.
+
+.. code-block:: python
+
+    from tchannel import thrift
+    from tchannel.thrift import cache
+
+    cache.set_default_dir('/var/cache/myservice/thrift')
+
+    donuts = thrift.load('donuts.thrift', service='donuts')
+
+The cache directory must only be writable by trusted users: its contents are
+unpickled.
+"""
+
+from __future__ import absolute_import
+
+import hashlib
+import logging
+import os
+import tempfile
+
+import thriftrw
+from six.moves import cPickle as pickle
+from thriftrw.loader import Loader
+
+log = logging.getLogger('tchannel')
+
+__all__ = ['set_default_dir', 'get_loader']
+
+# Part of every key, so that entries written by another version of thriftrw
+# or with another pickle protocol are never used.
+_VERSION = ('thriftrw-%s-%d' % (
+    thriftrw.__version__, pickle.HIGHEST_PROTOCOL,
+)).encode('ascii')
+
+# Releases of thriftrw whose Loader parses IDLs with
+# ``loader.compiler.parser``, which isn't part of its public API.
+_SUPPORTED = (1,)
+
+_default_dir = None
+
+# Loaders by cache directory. Each caches compiled modules by path, like
+# thriftrw's default loader.
+_loaders = {}
+
+
+def set_default_dir(path):
+    """Cache IDLs loaded by :py:func:`tchannel.thrift.load` in ``path``.
+
+    :param path:
+        Directory to cache parsed IDLs in. It is created if it doesn't exist.
+        ``None`` disables the cache.
+    """
+    global _default_dir
+    _default_dir = path
+
+
+def get_loader(cache_dir=None):
+    """Get the ``thriftrw.Loader`` caching parsed IDLs in ``cache_dir``.
+
+    :param cache_dir:
+        Cache directory. Defaults to the directory set with
+        :py:func:`set_default_dir`.
+    :returns:
+        A ``thriftrw.Loader``, or None if there is no cache directory or
+        IDLs can't be cached with the installed version of thriftrw.
+    """
+    cache_dir = cache_dir or _default_dir
+    if cache_dir is None:
+        return None
+
+    cache_dir = os.path.abspath(cache_dir)
+    loader = _loaders.get(cache_dir)
+    if loader is None and cache_dir not in _loaders:
+        loader = _caching_loader(cache_dir)
+        _loaders[cache_dir] = loader
+    return loader
+
+
+def _caching_loader(cache_dir):
+    major = thriftrw.__version__.split('.')[0]
+    compiler = None
+    if major.isdigit() and int(major) in _SUPPORTED:
+        loader = Loader()
+        compiler = getattr(loader, 'compiler', None)
+    if not hasattr(compiler, 'parser'):
+        log.warning(
+            'not caching Thrift IDLs in %s: unsupported thriftrw %s',
+            cache_dir, thriftrw.__version__,
+        )
+        return None
+
+    compiler.parser = CachingParser(compiler.parser, cache_dir)
+    return loader
+
+
+class CachingParser(object):
+    """Wraps a ``thriftrw`` parser to cache the programs it parses on disk.
+
+    :param parser:
+        Parser to use for IDLs that aren't cached yet.
+    :param cache_dir:
+        Directory to cache parsed programs in.
+    """
+
+    def __init__(self, parser, cache_dir):
+        self.parser = parser
+        self.cache_dir = cache_dir
+
+    def parse(self, contents):
+        if isinstance(contents, bytes):
+            data = contents
+        else:
+            data = contents.encode('utf-8')
+        key = hashlib.sha1(_VERSION + b'\0' + data).hexdigest()
+        path = os.path.join(self.cache_dir, key + '.pickle')
+
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (IOError, OSError):
+            pass  # not cached yet
+        except Exception:
+            log.warning('ignoring corrupt Thrift cache entry %s', path,
+                        exc_info=True)
+
+        program = self.parser.parse(contents)
+        try:
+            self._write(path, program)
+        except (IOError, OSError):
+            log.warning('failed to cache parsed Thrift IDL in %s',
+                        self.cache_dir, exc_info=True)
+        return program
+
+    def _write(self, path, program):
+        if not os.path.isdir(self.cache_dir):
+            try:
+                os.makedirs(self.cache_dir)
+            except OSError:
+                if not os.path.isdir(self.cache_dir):
+                    raise
+
+        # Write to a temporary file renamed into place, so that concurrent
+        # processes never read a partial entry.
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(program, f, pickle.HIGHEST_PROTOCOL)
+            os.rename(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
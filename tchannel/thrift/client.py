@@ -173,7 +173,8 @@ def generate_method(service_module, service_name, method_name):
 
         tracer = tracing.ClientTracer(channel=self.tchannel)
         span, headers = tracer.start_span(
-            service=service_name, endpoint=method_name, headers={}
+            service=service_name, endpoint=method_name, headers={},
+            trace=self.trace,
         )
 
         body = serializer.serialize_body(call_args)
@@ -24,7 +24,6 @@ import sys
 import types
 from functools import partial
 
-import thriftrw
 from tornado import gen
 from tornado.util import raise_exc_info
 
@@ -37,7 +36,8 @@ from tchannel.serializer.thrift import ThriftRWSerializer
 from .module import ThriftRequest
 
 
-def load(path, service=None, hostport=None, module_name=None):
+def load(path, service=None, hostport=None, module_name=None,
+         cache_dir=None):
     """Loads the Thrift file at the specified path.
 
     The file is compiled in-memory and a Python module containing the result
@@ -141,6 +141,11 @@ def load(path, service=None, hostport=None, module_name=None):
     :param str module_name:
         Name used for the generated Python module. Defaults to the name of the
         Thrift file.
+    :param str cache_dir:
+        Directory in which parsed Thrift files are cached, across processes.
+        Defaults to the directory set with
+        :py:func:`tchannel.thrift.cache.set_default_dir`, if any. See
+        :py:mod:`tchannel.thrift.cache`.
     """
     # TODO replace with more specific exceptions
     # assert service, 'service is required'
@@ -150,7 +155,16 @@ def load(path, service=None, hostport=None, module_name=None):
     if not path.endswith('.thrift'):
         service, path = path, service
 
-    module = thriftrw.load(path=path, name=module_name)
+    # thriftrw builds its parser when it's imported, so it's only imported
+    # once a Thrift file is loaded.
+    import thriftrw
+    from . import cache
+
+    loader = cache.get_loader(cache_dir)
+    if loader is None:
+        module = thriftrw.load(path=path, name=module_name)
+    else:
+        module = loader.load(path=path, name=module_name)
     return TChannelThriftModule(service, module, hostport)
 
 
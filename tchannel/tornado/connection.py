@@ -24,6 +24,7 @@ import logging
 import os
 import socket
 import sys
+import time
 
 import tornado.gen
 import tornado.iostream
@@ -127,6 +128,9 @@ class TornadoConnection(object):
         # Map from message ID to futures for responses of outgoing calls.
         self._outbound_pending_call = {}
 
+        # Map from message ID to the time at which outgoing calls were sent.
+        self._outbound_pending_started = {}
+
         # Total number of pending outbound requests and responses.
         self.total_outbound_pendings = 0
 
@@ -137,13 +141,14 @@ class TornadoConnection(object):
         self._handshake_performed = False
 
         self.tchannel = tchannel
+        self.profiler = tchannel.profiler if tchannel is not None else None
         self._close_cb = None
         # callback that will be called when there is a change in the outbound
         # pending request/response lists.
         self._outbound_pending_change_cb = None
 
-        self.reader = Reader(self.connection)
-        self.writer = Writer(self.connection)
+        self.reader = Reader(self.connection, self.profiler)
+        self.writer = Writer(self.connection, self.profiler)
 
         connection.set_close_callback(self._on_close)
 
@@ -178,6 +183,7 @@ class TornadoConnection(object):
                 )
             )
         self._outbound_pending_call = {}
+        self._outbound_pending_started = {}
 
         try:
             while True:
@@ -206,6 +212,16 @@ class TornadoConnection(object):
             if self.closed:
                 return
 
+            # Stop reading frames while a bounded argstream (e.g. one being
+            # relayed by TChannel.forward) waits for its reader.
+            blocked = (
+                self.request_message_factory.blocked() or
+                self.response_message_factory.blocked()
+            )
+            if blocked is not None:
+                io_loop.add_future(blocked, lambda f: _step())
+                return
+
             io_loop.add_future(self.reader.get(), _on_message)
 
         def _on_message(future):
@@ -240,7 +256,11 @@ class TornadoConnection(object):
                 _handle_error_message(message)
                 return
 
+            if self.profiler is not None:
+                started = time.time()
             response = self.response_message_factory.build(message)
+            if self.profiler is not None:
+                self.profiler.record('build', started)
 
             # keep continue message in the list pop all other type messages
             # including error message
@@ -249,14 +269,14 @@ class TornadoConnection(object):
                 # still streaming, keep it for record
                 future = self._outbound_pending_call.get(message.id)
             else:
-                future = self._outbound_pending_call.pop(message.id)
+                future = self._pop_outbound_pending(message.id)
 
             if response and future.running():
                 future.set_result(response)
                 return
 
         def _handle_error_message(message):
-            future = self._outbound_pending_call.pop(message.id)
+            future = self._pop_outbound_pending(message.id)
             if future.running():
                 error = TChannelError.from_code(
                     message.code,
@@ -295,10 +315,18 @@ class TornadoConnection(object):
         )
 
         future = tornado.gen.Future()
-        self._outbound_pending_call[message.id] = future
+        self._add_outbound_pending(message.id, future)
         self.write(message)
         return future
 
+    def _add_outbound_pending(self, message_id, future):
+        self._outbound_pending_call[message_id] = future
+        self._outbound_pending_started[message_id] = time.time()
+
+    def _pop_outbound_pending(self, message_id):
+        self._outbound_pending_started.pop(message_id, None)
+        return self._outbound_pending_call.pop(message_id, None)
+
     def write(self, message):
         """Writes the given message up the wire.
 
@@ -534,10 +562,9 @@ class TornadoConnection(object):
         write_future = self.writer.put(error_message)
         write_future.add_done_callback(
             lambda f: IOLoop.current().add_callback(
-                self.tchannel.event_emitter.fire(
-                    EventType.after_send_error,
-                    error,
-                )
+                self.tchannel.event_emitter.fire,
+                EventType.after_send_error,
+                error,
             )
         )
         return write_future
@@ -558,6 +585,33 @@ class TornadoConnection(object):
         if self._outbound_pending_change_cb:
             self._outbound_pending_change_cb()
 
+    def introspect(self):
+        """Describe the state of this connection, for debugging.
+
+        :returns:
+            A JSON-serializable dictionary.
+        """
+        oldest_pending_age = None
+        if self._outbound_pending_started:
+            oldest_pending_age = time.time() - min(
+                self._outbound_pending_started.itervalues()
+            )
+
+        return {
+            'direction': 'out' if self.direction is OUTGOING else 'in',
+            'remote_process_name': self.remote_process_name,
+            'closed': self.closed,
+            'outbound_pending_calls': len(self._outbound_pending_call),
+            'oldest_outbound_pending_age': oldest_pending_age,
+            'total_outbound_pendings': self.total_outbound_pendings,
+            'tombstones': len(self._request_tombstones),
+            'bytes_read': self.reader.bytes_read,
+            'bytes_written': self.writer.bytes_written,
+            'read_queue': self.reader.queue.qsize(),
+            'write_queue': self.writer.queue.qsize(),
+            'incoming_calls_queue': self._messages.qsize(),
+        }
+
 
 class StreamConnection(TornadoConnection):
     """Streaming request/response into protocol messages and sent by tornado
@@ -673,7 +727,7 @@ class StreamConnection(TornadoConnection):
         )
 
         future = tornado.gen.Future()
-        self._outbound_pending_call[request.id] = future
+        self._add_outbound_pending(request.id, future)
         self.add_pending_outbound()
         self.stream_request(request, future).add_done_callback(
             lambda f: self.remove_pending_outbound()
@@ -704,11 +758,12 @@ class StreamConnection(TornadoConnection):
         else:
             response = f.result()
             response.tracing = request.tracing
+            response.connection = self
             response_future.set_result(response)
 
     def remove_outstanding_request(self, request):
         """Remove request from pending request list"""
-        self._outbound_pending_call.pop(request.id, None)
+        self._pop_outbound_pending(request.id)
 
     def _add_timeout(self, request, future):
         """Adds a timeout for the given request to the given future."""
@@ -742,15 +797,18 @@ class StreamConnection(TornadoConnection):
             )
         ))
         self._request_tombstones.add(req_id, req_ttl)
-        self._outbound_pending_call.pop(req_id)
+        self._pop_outbound_pending(req_id)
 
 
 class Reader(object):
 
-    def __init__(self, io_stream):
+    def __init__(self, io_stream, profiler=None):
         self.queue = queues.Queue()
         self.filling = False
         self.io_stream = io_stream
+        self.profiler = profiler
+        # Number of bytes read off the wire.
+        self.bytes_read = 0
 
     def fill(self):
         self.filling = True
@@ -772,7 +830,7 @@ class Reader(object):
                 lambda f: io_loop.spawn_callback(self.fill),
             )
 
-        read_message(self.io_stream).add_done_callback(keep_reading)
+        read_message(self.io_stream, self).add_done_callback(keep_reading)
 
     def get(self):
         """Receive the next message off the wire.
@@ -801,19 +859,25 @@ class Reader(object):
 
 class Writer(object):
 
-    def __init__(self, io_stream):
+    def __init__(self, io_stream, profiler=None):
         self.queue = queues.Queue()
         self.draining = False
         self.io_stream = io_stream
+        self.profiler = profiler
         # Tracks message IDs for this connection.
         self._id_sequence = 0
+        # Number of bytes written to the wire.
+        self.bytes_written = 0
 
     def drain(self):
         self.draining = True
 
         io_loop = IOLoop.current()
 
-        def on_write(f, done):
+        def on_write(f, done, started):
+            if started is not None:
+                self.profiler.record('write', started)
+
             if f.exception():
                 log.error("write failed", exc_info=f.exc_info())
                 done.set_exc_info(f.exc_info())
@@ -828,7 +892,12 @@ class Writer(object):
                 log.error("queue get failed", exc_info=f.exc_info())
                 return
 
-            message, done = f.result()
+            message, done, enqueued = f.result()
+            started = None
+            if enqueued is not None:
+                self.profiler.record('write.queue', enqueued)
+                started = time.time()
+
             try:
                 # write() may raise if the stream was closed while we were
                 # waiting for an entry in the queue.
@@ -837,7 +906,10 @@ class Writer(object):
                 io_loop.spawn_callback(next_write)
                 done.set_exc_info(sys.exc_info())
             else:
-                io_loop.add_future(write_future, lambda f: on_write(f, done))
+                self.bytes_written += len(message)
+                io_loop.add_future(
+                    write_future, lambda f: on_write(f, done, started)
+                )
 
         def next_write():
             if self.io_stream.closed():
@@ -891,8 +963,9 @@ class Writer(object):
             if f.exception():
                 done_writing_future.set_exc_info(f.exc_info())
 
+        enqueued = time.time() if self.profiler is not None else None
         self.queue.put(
-            (body, done_writing_future)
+            (body, done_writing_future, enqueued)
         ).add_done_callback(on_queue_error)
         return done_writing_future
 
@@ -902,21 +975,25 @@ class Writer(object):
 FRAME_SIZE_WIDTH = frame.frame_rw.size_rw.width()
 
 
-def read_message(stream):
+def read_message(stream, reader=None):
     """Reads a message from the given IOStream.
 
     :param IOStream stream:
         IOStream to read from.
+    :param Reader reader:
+        If given, the size of the frame is added to its ``bytes_read``, and
+        the time spent reading it is recorded by its ``profiler``.
     """
     answer = tornado.gen.Future()
     io_loop = IOLoop.current()
+    profiler = reader.profiler if reader is not None else None
 
     def on_error(future):
         log.info('Failed to read data: %s', future.exception())
         return answer.set_exc_info(future.exc_info())
 
     @fail_to(answer)
-    def on_body(size, future):
+    def on_body(size, started, future):
         if future.exception():
             return on_error(future)
 
@@ -932,6 +1009,8 @@ def read_message(stream):
 
         message = message_rw.read(BytesIO(f.payload))
         message.id = f.header.message_id
+        if started is not None:
+            profiler.record('read', started)
         answer.set_result(message)
 
     @fail_to(answer)
@@ -941,9 +1020,12 @@ def read_message(stream):
 
         size_bytes = future.result()
         size = frame.frame_rw.size_rw.read(BytesIO(size_bytes))
+        if reader is not None:
+            reader.bytes_read += size
+        started = time.time() if profiler is not None else None
         io_loop.add_future(
             stream.read_bytes(size - FRAME_SIZE_WIDTH),
-            lambda f: on_body(size, f)
+            lambda f: on_body(size, started, f)
         )
 
     try:
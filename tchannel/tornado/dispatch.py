@@ -22,6 +22,7 @@ from __future__ import absolute_import
 
 import logging
 import sys
+import time
 from collections import namedtuple
 
 import tornado
@@ -32,19 +33,29 @@ from tornado.iostream import StreamClosedError
 from tchannel.request import Request
 from tchannel.request import TransportHeaders
 from tchannel.response import response_from_mixed
+from .. import compression
+from .. import transport
 from ..errors import BadRequestError
 from ..errors import UnexpectedError
 from ..errors import TChannelError
 from ..event import EventType
 from ..messages import Types
+from ..messages.error import ErrorMessage
+from ..glossary import INBOUND
 from ..serializer.raw import RawSerializer
 from .response import Response as DeprecatedResponse
+from .response import StatusCode
+from .stream import InMemStream
+from .stream import Stream
+from .util import get_arg
 from .. import tracing
 
 log = logging.getLogger('tchannel')
 
 
-Handler = namedtuple('Handler', 'endpoint req_serializer resp_serializer')
+Handler = namedtuple(
+    'Handler', 'endpoint req_serializer resp_serializer streaming'
+)
 
 
 class RequestDispatcher(object):
@@ -102,8 +113,13 @@ class RequestDispatcher(object):
         :param connection: tornado connection
         """
         req = None
+        profiler = connection.profiler
         try:
+            if profiler is not None:
+                started = time.time()
             req = connection.request_message_factory.build(message)
+            if profiler is not None:
+                profiler.record('build', started)
             # message_factory will create Request only when it receives
             # CallRequestMessage. It will return None, if it receives
             # CallRequestContinueMessage.
@@ -157,6 +173,24 @@ class RequestDispatcher(object):
 
             raise gen.Return(None)
 
+        if transport.COMPRESSION in request.headers and (
+            # Handlers of the deprecated API read the args as they were sent.
+            not self._handler_returns_response or
+            # Channels only advertise compression if they are configured for
+            # it.
+            tchannel.compressor is None
+        ):
+            connection.send_error(BadRequestError(
+                description=(
+                    "Endpoint '%s' does not accept compressed requests"
+                    % request.endpoint
+                ),
+                id=request.id,
+                tracing=request.tracing,
+            ))
+
+            raise gen.Return(None)
+
         request.serializer = handler.req_serializer
         response = DeprecatedResponse(
             id=request.id,
@@ -185,42 +219,95 @@ class RequestDispatcher(object):
         )
         tracer.start_basic_span(request)
 
+        metrics = tchannel.metrics
+        if metrics is not None:
+            start = time.time()
+        profiler = connection.profiler
+        request_bytes = response_bytes = None
+
         try:
             # New impl - the handler takes a request and returns a response
             if self._handler_returns_response:
-                # convert deprecated req to new top-level req
-                b = yield request.get_body()
-                he = yield request.get_header()
                 t = TransportHeaders.from_dict(request.headers)
-                new_req = Request(
-                    body=b,
-                    headers=he,
-                    transport=t,
-                    endpoint=request.endpoint,
-                    service=request.service,
-                    timeout=request.ttl,
-                )
+                if handler.streaming:
+                    # hand arg2/arg3 over as streams, as they arrive
+                    arg2, arg3 = request.argstreams[1], request.argstreams[2]
+                    if t.compression is not None:
+                        # Callers only compress args they have in full, so
+                        # nothing is lost by reading them before the handler.
+                        raw_he = yield get_arg(request, 1)
+                        b = yield get_arg(request, 2)
+                        raw_he, b = self._decompress(
+                            tchannel.compressor, t.compression, raw_he, b
+                        )
+                        t.compression = None
+                        arg2, arg3 = InMemStream(raw_he), InMemStream(b)
+                        arg2.close()
+                        arg3.close()
+                    new_req = Request(
+                        body=arg3,
+                        headers=arg2,
+                        transport=t,
+                        endpoint=request.endpoint,
+                        service=request.service,
+                        timeout=request.ttl,
+                    )
+                    he = {}
+                else:
+                    # convert deprecated req to new top-level req; the body
+                    # and headers are only deserialized if the handler uses
+                    # them.
+                    b = yield get_arg(request, 2)
+                    raw_he = yield get_arg(request, 1)
+                    request_bytes = len(raw_he) + len(b)
+                    if t.compression is not None:
+                        raw_he, b = self._decompress(
+                            tchannel.compressor, t.compression, raw_he, b
+                        )
+                        t.compression = None
+                    new_req = Request(
+                        raw_body=b,
+                        raw_headers=raw_he,
+                        serializer=request.serializer,
+                        offloader=tchannel.offloader,
+                        transport=t,
+                        endpoint=request.endpoint,
+                        service=request.service,
+                        timeout=request.ttl,
+                    )
+                    he = self._tracing_headers(tchannel.tracer, new_req)
                 with tracer.start_span(
                     request=request, headers=he,
                     peer_host=connection.remote_host,
                     peer_port=connection.remote_host_port
                 ) as span:
                     context_provider = tchannel.context_provider_fn()
+                    if profiler is not None:
+                        started = time.time()
                     with context_provider.span_in_context(span):
                         # Cannot yield while inside the StackContext
                         f = handler.endpoint(new_req)
                     new_resp = yield gen.maybe_future(f)
+                    if profiler is not None:
+                        profiler.record('handler', started)
 
                 # instantiate a tchannel.Response
                 new_resp = response_from_mixed(new_resp)
 
                 response.code = new_resp.status
 
-                # assign resp values to dep response
-                response.write_header(new_resp.headers)
+                body = None
+                offloader = tchannel.offloader
+                if offloader is not None and new_resp.body is not None and \
+                        not _is_stream(new_resp):
+                    body = yield offloader.serialize_body(
+                        request.endpoint, response.serializer, new_resp.body
+                    )
 
-                if new_resp.body is not None:
-                    response.write_body(new_resp.body)
+                response_bytes = self._write_response(
+                    response, new_resp, tchannel.compressor,
+                    t.accept_compression, body,
+                )
 
             # Dep impl - the handler is provided with a req & resp writer
             else:
@@ -230,17 +317,36 @@ class RequestDispatcher(object):
                     peer_port=connection.remote_host_port
                 ) as span:
                     context_provider = tchannel.context_provider_fn()
+                    if profiler is not None:
+                        started = time.time()
                     with context_provider.span_in_context(span):
                         # Cannot yield while inside the StackContext
                         f = handler.endpoint(request, response)
 
                     yield gen.maybe_future(f)
+                    if profiler is not None:
+                        profiler.record('handler', started)
 
             response.flush()
+
+            if metrics is not None:
+                metrics.record_call(
+                    INBOUND,
+                    request.headers.get('cn'),
+                    request.service,
+                    request.endpoint,
+                    _peer(connection),
+                    response.code == StatusCode.ok,
+                    (time.time() - start) * 1000,
+                    request_bytes,
+                    response_bytes,
+                )
         except TChannelError as e:
             e.tracing = request.tracing
             e.id = request.id
             connection.send_error(e)
+            if metrics is not None:
+                _record_error(metrics, request, connection, e)
         except Exception as e:
             # Maintain a reference to our original exc info because we stomp
             # the traceback below.
@@ -267,6 +373,8 @@ class RequestDispatcher(object):
                 connection.request_message_factory.remove_buffer(response.id)
 
                 connection.send_error(error)
+                if metrics is not None:
+                    _record_error(metrics, request, connection, error)
                 yield tchannel.event_emitter.fire(
                     EventType.on_exception,
                     request,
@@ -280,6 +388,91 @@ class RequestDispatcher(object):
                 del exc_info
         raise gen.Return(response)
 
+    @staticmethod
+    def _decompress(compressor, codec, arg2, arg3):
+        max_size = compressor.max_size
+        try:
+            return (
+                compression.decompress(codec, arg2, max_size),
+                compression.decompress(codec, arg3, max_size),
+            )
+        except ValueError as e:
+            raise BadRequestError(description=str(e))
+
+    @staticmethod
+    def _tracing_headers(tracer, request):
+        """Application headers of ``request`` needed by the server tracer.
+
+        Headers are only deserialized if the tracer can use them and they
+        contain tracing keys, which callers only inject for sampled traces or
+        to propagate baggage.
+        """
+        raw_headers = request.raw_headers
+        if tracing.is_noop(tracer) or not raw_headers or \
+                tracing.TRACING_KEY_PREFIX not in raw_headers:
+            return {}
+        return request.headers
+
+    @staticmethod
+    def _write_response(response, new_resp, compressor, accepted,
+                        body=None):
+        """Write a handler's ``tchannel.Response`` to the dep response.
+
+        Streams (e.g. from ``TChannel.forward``) are relayed as-is, along
+        with their compression. Otherwise the response is compressed if the
+        caller accepts our codec. Either way, if the channel is configured
+        for compression, the response advertises the codecs that requests
+        may be compressed with.
+
+        :param body:
+            The response's body, if it has already been serialized.
+
+        :returns:
+            Size of the response's ``arg2`` and ``arg3`` as written, or None
+            if they are relayed streams.
+        """
+        if compressor is not None:
+            response.headers[transport.ACCEPT_COMPRESSION] = (
+                compression.ACCEPTED
+            )
+
+        if _is_stream(new_resp):
+            if new_resp.transport is not None and \
+                    new_resp.transport.compression is not None:
+                response.headers[transport.COMPRESSION] = (
+                    new_resp.transport.compression
+                )
+
+            if isinstance(new_resp.headers, Stream):
+                response.set_header_s(new_resp.headers)
+            else:
+                response.write_header(new_resp.headers)
+
+            if isinstance(new_resp.body, Stream):
+                response.set_body_s(new_resp.body)
+            elif new_resp.body is not None:
+                response.write_body(new_resp.body)
+            return None
+
+        serializer = response.serializer
+        header = serializer.serialize_header(new_resp.headers) or b''
+        if body is None:
+            body = b''
+            if new_resp.body is not None:
+                body = serializer.serialize_body(new_resp.body)
+
+        if compressor is not None and \
+                compression.accepts(accepted, compressor.codec):
+            header, body, codec = compressor.compress(header, body)
+            if codec is not None:
+                response.headers[transport.COMPRESSION] = codec
+
+        # already serialized
+        response.serializer = RawSerializer()
+        response.write_header(header)
+        response.write_body(body)
+        return len(header) + len(body)
+
     def get_endpoint(self, name):
         handler = self.handlers.get(name)
 
@@ -293,7 +486,8 @@ class RequestDispatcher(object):
             rule,
             handler,
             req_serializer=None,
-            resp_serializer=None
+            resp_serializer=None,
+            streaming=False,
     ):
         """Register a new endpoint with the given name.
 
@@ -321,12 +515,22 @@ class RequestDispatcher(object):
         :param resp_serializer:
             Arg scheme serializer of this endpoint. It should be
             ``RawSerializer``, ``JsonSerializer``, and ``ThriftSerializer``.
+
+        :param streaming:
+            Only applies to handlers that return responses. If True, the
+            handler is invoked as soon as ``arg1`` has been received, and the
+            request's ``headers`` and ``body`` are the raw ``arg2`` and
+            ``arg3`` streams. Use this with
+            :py:meth:`tchannel.TChannel.forward` to relay requests without
+            buffering them.
         """
 
         assert handler, "handler must not be None"
         req_serializer = req_serializer or RawSerializer()
         resp_serializer = resp_serializer or RawSerializer()
-        self.handlers[rule] = Handler(handler, req_serializer, resp_serializer)
+        self.handlers[rule] = Handler(
+            handler, req_serializer, resp_serializer, streaming
+        )
 
     @staticmethod
     def not_found(request, response=None):
@@ -336,3 +540,23 @@ class RequestDispatcher(object):
                 request.endpoint,
             ),
         )
+
+
+def _peer(connection):
+    return '%s:%s' % (connection.remote_host, connection.remote_host_port)
+
+
+def _record_error(metrics, request, connection, error):
+    metrics.record_error(
+        INBOUND,
+        request.headers.get('cn'),
+        request.service,
+        request.endpoint,
+        _peer(connection),
+        ErrorMessage.ERROR_CODES.get(error.code, None),
+    )
+
+
+def _is_stream(response):
+    return isinstance(response.headers, Stream) or \
+        isinstance(response.body, Stream)
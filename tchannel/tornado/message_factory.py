@@ -73,6 +73,21 @@ class MessageFactory(object):
         self.in_checksum = {}
         self.out_checksum = {}
 
+        # Futures for writes to argstreams that are waiting for their reader.
+        self._blocked = []
+
+    def blocked(self):
+        """Wait for the readers of argstreams that are full.
+
+        :return:
+            A future that resolves once a full argstream has been read from,
+            or None if no argstream is full.
+        """
+        self._blocked = [f for f in self._blocked if not f.done()]
+        if self._blocked:
+            return self._blocked[0]
+        return None
+
     def build_raw_request_message(self, request, args, is_completed=False):
         """build protocol level message based on request and args.
 
@@ -278,7 +293,9 @@ class MessageFactory(object):
 
             src = 0
             while src < len(message.args):
-                context.argstreams[dst].write(message.args[src])
+                written = context.argstreams[dst].write(message.args[src])
+                if written is not None and not written.done():
+                    self._blocked.append(written)
                 dst += 1
                 src += 1
 
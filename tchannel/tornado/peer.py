@@ -24,12 +24,15 @@ from __future__ import (
 
 import sys
 import logging
+import time
 
 from collections import deque
 from itertools import takewhile, dropwhile
 
 import six
+from tchannel import compression
 from tchannel import tracing
+from tchannel import transport
 from tchannel.tracing import ClientTracer
 from tornado import gen
 from tornado.iostream import StreamClosedError
@@ -69,6 +72,7 @@ class Peer(object):
         'chosen_count',
         'on_conn_change',
         'connections',
+        'accept_compression',
 
         '_connecting',
         '_on_conn_change_cb',
@@ -105,6 +109,10 @@ class Peer(object):
         #: the right side.
         self.connections = deque()
 
+        #: Codecs that requests to this peer may be compressed with, as
+        #: advertised by its last response.
+        self.accept_compression = None
+
         # This contains a future to the TornadoConnection if we're already in
         # the process of making an outgoing connection to the peer. This
         # helps avoid making multiple outgoing connections.
@@ -245,6 +253,20 @@ class Peer(object):
 
         return len(self.connections) > 0
 
+    def introspect(self):
+        """Describe the state of this peer, for debugging.
+
+        :returns:
+            A JSON-serializable dictionary.
+        """
+        return {
+            'hostport': self.hostport,
+            'rank': self.rank,
+            'chosen_count': self.chosen_count,
+            'total_outbound_pendings': self.total_outbound_pendings,
+            'connections': [c.introspect() for c in self.connections],
+        }
+
     def close(self):
         for connection in list(self.connections):
             # closing the connection will mutate the deque so create a copy
@@ -377,21 +399,22 @@ class PeerClientOperation(object):
             Future that contains the response from the peer.
         """
 
+        profiler = self.tchannel.profiler
+        if profiler is not None:
+            started = time.time()
+
         # find a peer connection
         # If we can't find available peer at the first time, we throw
         # NoAvailablePeerError. Later during retry, if we can't find available
         # peer, we throw exceptions from retry not NoAvailablePeerError.
         peer, connection = yield self._get_peer_connection()
 
-        arg1, arg2, arg3 = (
-            maybe_stream(arg1), maybe_stream(arg2), maybe_stream(arg3)
-        )
-
         if retry_limit is None:
             retry_limit = DEFAULT_RETRY_LIMIT
 
         ttl = ttl or DEFAULT_TIMEOUT
         # hack to get endpoint from arg_1 for trace name
+        arg1 = maybe_stream(arg1)
         arg1.close()
         endpoint = yield read_full(arg1)
 
@@ -400,13 +423,26 @@ class PeerClientOperation(object):
         for k, v in self.headers.iteritems():
             headers.setdefault(k, v)
 
+        # Requests are only compressed for callers that handle compressed
+        # responses, and for peers known to decompress them.
+        compressor = self.tchannel.compressor
+        if compressor is not None and \
+                transport.ACCEPT_COMPRESSION in headers and \
+                compression.accepts(peer.accept_compression, compressor.codec):
+            arg2, arg3, codec = compressor.compress(arg2, arg3)
+            if codec is not None:
+                headers[transport.COMPRESSION] = codec
+
         if self.tracing_span is None:
             tracer = ClientTracer(channel=self.tchannel)
             self.tracing_span, _ = tracer.start_span(
                 service=self.service, endpoint=endpoint,
-                hostport=self._hostport, encoding=self.headers.get('as')
+                hostport=self._hostport, encoding=self.headers.get('as'),
+                # the deprecated API does not honor the trace flag
+                trace=True,
             )
 
+        arg2, arg3 = maybe_stream(arg2), maybe_stream(arg3)
         request = Request(
             service=self.service,
             argstreams=[InMemStream(endpoint), arg2, arg3],
@@ -432,11 +468,15 @@ class PeerClientOperation(object):
         except Exception as e:
             # event: on_exception
             exc_info = sys.exc_info()
+            if profiler is not None:
+                profiler.record('send', started)
             yield self.tchannel.event_emitter.fire(
                 EventType.on_exception, request, e,
             )
             six.reraise(*exc_info)
 
+        if profiler is not None:
+            profiler.record('send', started)
         log.debug("Got response %s", response)
 
         raise gen.Return(response)
@@ -482,6 +522,9 @@ class PeerClientOperation(object):
         for num_of_attempt in range(retry_limit + 1):
             try:
                 response = yield self._send(connection, request)
+                peer.accept_compression = response.headers.get(
+                    transport.ACCEPT_COMPRESSION
+                )
                 raise gen.Return(response)
             except TChannelError:
                 (typ, error, tb) = sys.exc_info()
@@ -522,8 +565,15 @@ class PeerClientOperation(object):
 
     @gen.coroutine
     def prepare_next_request(self, request, blacklist):
-        # find new peer
-        peer = self._choose(blacklist=blacklist,)
+        # find new peer, which must be able to decompress the request if it
+        # is compressed
+        codec = request.headers.get(transport.COMPRESSION)
+        while True:
+            peer = self._choose(blacklist=blacklist,)
+            if peer is None or codec is None or \
+                    compression.accepts(peer.accept_compression, codec):
+                break
+            blacklist.add(peer.hostport)
 
         # no peer is available
         if not peer:
@@ -694,6 +744,17 @@ class PeerGroup(object):
         """Get all Peers managed by this PeerGroup."""
         return self._peers.values()
 
+    def introspect(self):
+        """Describe the state of all peers, for debugging.
+
+        :returns:
+            A list of JSON-serializable dictionaries, ordered by rank.
+        """
+        return [
+            peer.introspect()
+            for peer in sorted(self._peers.values(), key=lambda p: p.rank)
+        ]
+
     def request(self, service, hostport=None, **kwargs):
         """Initiate a new request through this PeerGroup.
 
@@ -725,8 +786,13 @@ class PeerGroup(object):
 
         blacklist = blacklist or set()
         if hostport:
-            return self._get_isolated(hostport)
+            peer = self._get_isolated(hostport)
+        else:
+            peer = self.peer_heap.smallest_peer(
+                (lambda p: p.hostport not in blacklist and
+                 not p.is_ephemeral),
+            )
 
-        return self.peer_heap.smallest_peer(
-            (lambda p: p.hostport not in blacklist and not p.is_ephemeral),
-        )
+        if peer is not None:
+            peer.chosen_count += 1
+        return peer
@@ -110,6 +110,10 @@ class InMemStream(Stream):
         self.exception = None
         self.exc_info = None
 
+        # Writes wait for the reader once this many chunks are buffered.
+        self.max_buffered = None
+        self._writable = None
+
     def clone(self):
         new_stream = InMemStream()
         new_stream.state = self.state
@@ -132,6 +136,7 @@ class InMemStream(Stream):
             while len(self._stream) and len(chunk) < common.MAX_PAYLOAD_SIZE:
                 chunk += self._stream.popleft()
 
+            self._release()
             future.set_result(chunk)
             return future
 
@@ -159,10 +164,40 @@ class InMemStream(Stream):
             self._stream.append(chunk)
             self._condition.notify()
 
-        # This needs to return a future to match the async interface.
-        r = tornado.concurrent.Future()
-        r.set_result(None)
-        return r
+        return self.writable()
+
+    def writable(self):
+        """Wait until the stream accepts more chunks.
+
+        :return:
+            A future that resolves once fewer than ``max_buffered`` chunks
+            are buffered, the bound is lifted or the stream is closed.
+        """
+        writable = self._writable
+        if writable is None:
+            writable = self._writable = tornado.concurrent.Future()
+            self._release()
+        return writable
+
+    def set_max_buffered(self, max_buffered):
+        """Bound the number of chunks buffered before writes wait.
+
+        :param max_buffered:
+            Maximum number of chunks, or None to buffer without bound.
+        """
+        self.max_buffered = max_buffered
+        self._release()
+
+    def _release(self):
+        if self._writable is None or self._writable.done():
+            return
+        if (
+            self.max_buffered is None or
+            len(self._stream) < self.max_buffered or
+            self.state == StreamState.completed
+        ):
+            writable, self._writable = self._writable, None
+            writable.set_result(None)
 
     def set_exception(self, exception, exc_info=None):
         self.exception = exception
@@ -172,6 +207,7 @@ class InMemStream(Stream):
     def close(self):
         self.state = StreamState.completed
         self._condition.notify()
+        self._release()
 
 
 class PipeStream(Stream):
@@ -36,11 +36,13 @@ import tornado.tcpserver
 from tornado.netutil import bind_sockets
 
 from . import hyperbahn
+from ..compression import compressor_from
 from ..deprecate import deprecate
 from ..enum import enum
 from ..errors import AlreadyListeningError
 from ..event import EventEmitter
 from ..event import EventRegistrar
+from ..event import EventType
 from ..glossary import (
     TCHANNEL_LANGUAGE,
     TCHANNEL_LANGUAGE_VERSION,
@@ -78,7 +80,9 @@ class TChannel(object):
     def __init__(self, name, hostport=None, process_name=None,
                  known_peers=None, trace=False, dispatcher=None,
                  reuse_port=False, context_provider_fn=None,
-                 tracer=None, _from_new_api=False):
+                 tracer=None, json_backend=None, compression=None,
+                 metrics=None, profiler=None, offload=None,
+                 _from_new_api=False):
         """Build or re-use a TChannel.
 
         :param name:
@@ -111,6 +115,28 @@ class TChannel(object):
             A getter function to retrieve an instance of
             ``tracing.TracingContextProvider`` used to manage tracing span
             in a thread-local request context.
+
+        :param json_backend:
+            JSON library used to serialize requests and responses of JSON
+            endpoints. See :py:func:`tchannel.serializer.json.get_backend`.
+
+        :param compression:
+            Compression used for responses of handlers that return
+            responses, when the caller accepts it. A codec name or a
+            :py:class:`tchannel.compression.Compressor`.
+
+        :param metrics:
+            A :py:class:`tchannel.metrics.MetricsRegistry` in which calls
+            served by handlers that return responses are recorded.
+
+        :param profiler:
+            A :py:class:`tchannel.profiling.Profiler` recording the duration
+            of the stages of calls made and served by this channel.
+
+        :param offload:
+            A :py:class:`tchannel.offload.Offloader` serializing large
+            responses of handlers that return responses, and deserializing
+            large requests to them.
         """
 
         self._state = State.ready
@@ -144,6 +170,11 @@ class TChannel(object):
 
         self.name = name
         self._trace = trace
+        self._json_serializer = JsonSerializer(json_backend)
+        self.compressor = compressor_from(compression)
+        self.metrics = metrics
+        self.profiler = profiler
+        self.offloader = offload
         self._tracer = tracer
 
         # register event hooks
@@ -241,6 +272,7 @@ class TChannel(object):
 
         self._state = State.closing
         try:
+            self.event_emitter.fire(EventType.on_close)
             self.peers.clear()
             if self._server:
                 self._server.stop()
@@ -356,6 +388,21 @@ class TChannel(object):
 
         return False
 
+    def introspect(self):
+        """Describe the state of this TChannel, for debugging.
+
+        :returns:
+            A JSON-serializable dictionary with the state of every known peer
+            and of its connections.
+        """
+        return {
+            'name': self.name,
+            'hostport': self.hostport,
+            'listening': self.is_listening(),
+            'closed': self.closed,
+            'peers': self.peers.introspect(),
+        }
+
     def receive_call(self, message, connection):
 
         if not self._handler:
@@ -365,7 +412,7 @@ class TChannel(object):
             return
         return self._handler.handle(message, connection)
 
-    def _register_simple(self, endpoint, scheme, f):
+    def _register_simple(self, endpoint, scheme, f, streaming=False):
         """Register a simple endpoint with this TChannel.
 
         :param endpoint:
@@ -375,15 +422,19 @@ class TChannel(object):
             registered.
         :param f:
             Callable handler for the endpoint.
+        :param streaming:
+            Whether the handler receives ``arg2`` and ``arg3`` as streams.
+            See :py:meth:`RequestDispatcher.register`.
         """
         assert scheme in DEFAULT_NAMES, ("Unsupported arg scheme %s" % scheme)
         if scheme == JSON:
-            req_serializer = JsonSerializer()
-            resp_serializer = JsonSerializer()
+            req_serializer = resp_serializer = self._json_serializer
         else:
             req_serializer = RawSerializer()
             resp_serializer = RawSerializer()
-        self._handler.register(endpoint, f, req_serializer, resp_serializer)
+        self._handler.register(
+            endpoint, f, req_serializer, resp_serializer, streaming
+        )
         return f
 
     def _register_thrift(self, service_module, handler, **kwargs):
@@ -451,7 +502,9 @@ class TChannel(object):
         assert endpoint is not None, "endpoint is required"
 
         if endpoint is TChannel.FALLBACK:
-            decorator = partial(self._handler.register, TChannel.FALLBACK)
+            decorator = partial(
+                self._handler.register, TChannel.FALLBACK, **kwargs
+            )
             if handler is not None:
                 return decorator(handler)
             else:
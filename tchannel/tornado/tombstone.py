@@ -75,6 +75,10 @@ class Cemetery(object):
         self.ttl_offset_secs = ttl_offset_secs
         self.max_ttl_secs = max_ttl_secs
 
+    def __len__(self):
+        """Number of requests currently known to have timed out."""
+        return len(self._tombstones)
+
     def __contains__(self, id):
         """Check if the request with the given id is known to have timed
         out."""
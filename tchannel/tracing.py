@@ -94,6 +94,47 @@ class TracingContextProvider(object):
         return opentracing_instrumentation.span_in_stack_context(span)
 
 
+class UnsampledSpan(opentracing.Span):
+    """No-op stand-in for a client span that is known not to be sampled.
+
+    Starting a real span, tagging it and injecting it into the application
+    headers is wasted work when the trace is not going to be recorded. An
+    ``UnsampledSpan`` only carries the Zipkin-style IDs needed to propagate
+    the trace in the binary ``tracing`` field of the protocol.
+    """
+
+    def __init__(self, tracer, tracing):
+        """
+        :param tracer: the OpenTracing Tracer
+        :param tracing: ``tchannel.messages.common.Tracing`` of this span
+        """
+        super(UnsampledSpan, self).__init__(
+            tracer=tracer, context=opentracing.SpanContext(),
+        )
+        self.tracing = tracing
+
+
+def is_sampled(span):
+    """Check whether ``span`` is sampled, if the tracer lets us know.
+
+    :return:
+        True or False, or None if the span does not expose its sampling
+        decision.
+    """
+    if isinstance(span, UnsampledSpan):
+        return False
+    # jaeger_client.Span
+    is_span_sampled = getattr(span, 'is_sampled', None)
+    if is_span_sampled is None:
+        return None
+    return bool(is_span_sampled())
+
+
+def is_noop(tracer):
+    """Whether ``tracer`` is the no-op Tracer of the OpenTracing API."""
+    return type(tracer) is opentracing.Tracer
+
+
 class ServerTracer(object):
     """Helper class for creating server-side spans."""
 
@@ -133,7 +174,8 @@ class ServerTracer(object):
     def start_span(self, request, headers, peer_host, peer_port):
         """
         Start a new server-side span. If the span has already been started
-        by `start_basic_span`, this method only adds baggage from the headers.
+        by `start_basic_span`, this method only adds baggage from the headers,
+        and tags the span if it is sampled.
 
         :param request: inbound tchannel.tornado.request.Request
         :param headers: dictionary containing parsed application headers
@@ -148,10 +190,13 @@ class ServerTracer(object):
                     for k, v in headers.iteritems()
                     if k.startswith(TRACING_KEY_PREFIX)
                 }
-                parent_context = self.tracer.extract(
-                    format=opentracing.Format.TEXT_MAP,
-                    carrier=tracing_headers
-                )
+                # If the span has already been started, the headers are
+                # only needed for their baggage.
+                if tracing_headers or self.span is None:
+                    parent_context = self.tracer.extract(
+                        format=opentracing.Format.TEXT_MAP,
+                        carrier=tracing_headers
+                    )
                 if self.span and parent_context:
                     # we already started a span from Tracing fields,
                     # so only copy baggage from the headers.
@@ -165,6 +210,8 @@ class ServerTracer(object):
                 child_of=parent_context,
                 tags={tags.SPAN_KIND: tags.SPAN_KIND_RPC_SERVER},
             )
+        if is_sampled(self.span) is False:
+            return self.span  # tags would not be recorded
         if 'cn' in request.headers:
             self.span.set_tag(tags.PEER_SERVICE, request.headers['cn'])
         if peer_host:
@@ -185,26 +232,57 @@ class ClientTracer(object):
         self.channel = channel
 
     def start_span(self, service, endpoint, headers=None,
-                   hostport=None, encoding=None):
+                   hostport=None, encoding=None, trace=None):
+        """
+        Start a new client-side span and inject it into the headers.
+
+        If the request is known not to be sampled, because tracing is
+        disabled or the parent span is not sampled, and there is no baggage
+        to propagate, an ``UnsampledSpan`` is returned instead and the
+        headers are left untouched. Spans that the tracer's sampler decides
+        not to sample are neither tagged nor injected into the headers.
+
+        :param trace:
+            Whether to trace this request. Defaults to the channel's
+            ``trace`` setting.
+        :return: a tuple of the span and the headers
+        """
+        tracer = self.channel.tracer
         parent_span = self.channel.context_provider.get_current_span()
+        if headers is None:
+            headers = {}
+
+        if self._is_unsampled(tracer, parent_span, trace):
+            if parent_span is None:
+                tracing = common.random_tracing()
+            else:
+                parent = span_to_tracing_field(parent_span)
+                tracing = common.random_tracing()._replace(
+                    trace_id=parent.trace_id, parent_id=parent.span_id,
+                )
+            return UnsampledSpan(tracer, tracing), headers
+
         parent_ctx = parent_span.context if parent_span else None
-        span = self.channel.tracer.start_span(
+        span = tracer.start_span(
             operation_name=endpoint,
             child_of=parent_ctx
         )
+        if is_sampled(span) is False and not span.context.baggage:
+            # The sampler decided against a new trace: only the binary
+            # tracing field, taken from the span, is propagated.
+            return span, headers
+
         span.set_tag(tags.SPAN_KIND, tags.SPAN_KIND_RPC_CLIENT)
         span.set_tag(tags.PEER_SERVICE, service)
         set_peer_host_port(span, hostport)
         if encoding:
             span.set_tag('as', encoding)
 
-        if headers is None:
-            headers = {}
         if isinstance(headers, dict):
             # noinspection PyBroadException
             try:
                 tracing_headers = {}
-                self.channel.tracer.inject(
+                tracer.inject(
                     span.context, opentracing.Format.TEXT_MAP, tracing_headers)
                 for k, v in tracing_headers.iteritems():
                     headers[TRACING_KEY_PREFIX + k] = v
@@ -213,6 +291,23 @@ class ClientTracer(object):
 
         return span, headers
 
+    def _is_unsampled(self, tracer, parent_span, trace):
+        if is_noop(tracer):
+            return True
+
+        if trace is None:
+            trace = self.channel.trace
+        trace = trace() if callable(trace) else trace
+        if parent_span is None:
+            return trace is False
+
+        # baggage has to be propagated in the headers even when the trace
+        # is not sampled
+        return (
+            (trace is False or is_sampled(parent_span) is False) and
+            not parent_span.context.baggage
+        )
+
 
 def set_peer_host_port(span, hostport):
     if hostport:
@@ -232,6 +327,8 @@ def span_to_tracing_field(span):
     """
     if span is None:
         return common.random_tracing()
+    if isinstance(span, UnsampledSpan):
+        return span.tracing
     # noinspection PyBroadException
     try:
         carrier = {}
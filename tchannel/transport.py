@@ -22,9 +22,11 @@ from __future__ import (
     absolute_import, division, print_function, unicode_literals
 )
 
+ACCEPT_COMPRESSION = "ae"
 CALLER_NAME = "cn"
 CLAIM_AT_START = "cas"
 CLAIM_AT_FINISH = "caf"
+COMPRESSION = "ce"
 FAILURE_DOMAIN = "fd"
 RETRY_FLAGS = "re"
 ROUTING_DELEGATE = "rd"
@@ -0,0 +1,339 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Batched reporting of TChannel spans to a TCollector service.
+
+:py:class:`SpanReporter` is an event hook recording a span for every sampled
+call made or served by a TChannel. Finished spans are kept in a bounded
+buffer and submitted in batches to the collector on a timer.
+
+.. code-block:: python
+
+    tchannel = TChannel('foo')
+
+    reporter = SpanReporter(tchannel)
+    tchannel.hooks.register(reporter)
+    reporter.start()
+
+A call is sampled if the sampled bit is set in the ``tracing`` field of its
+messages, which is set from the OpenTracing span of the call.
+
+Nothing on the request path waits for the collector: when the buffer is
+full, the oldest spans are dropped.
+"""
+
+from __future__ import absolute_import
+
+import collections
+import logging
+import os
+import socket
+import struct
+import sys
+import time
+
+import tornado.gen
+import tornado.ioloop
+
+from .. import retry
+from .. import thrift
+from ..event import EventHook
+
+log = logging.getLogger('tchannel')
+
+base = os.path.dirname(__file__)
+_tcollector = None
+
+__all__ = ['SpanReporter', 'load_tcollector']
+
+CLIENT = 'client'
+SERVER = 'server'
+
+# Bit of the traceflags set for sampled traces.
+_SAMPLED = 0x01
+
+# Annotations marking the start and end of client and server spans.
+_ANNOTATIONS = {
+    CLIENT: ('cs', 'cr'),
+    SERVER: ('sr', 'ss'),
+}
+
+FinishedSpan = collections.namedtuple(
+    'FinishedSpan',
+    'kind tracing service endpoint encoding start end error',
+)
+
+
+def load_tcollector():
+    """Return the module compiled from ``tcollector.thrift``.
+
+    It is only compiled the first time this is called, when spans are first
+    submitted, so that importing this module doesn't parse Thrift.
+    """
+    global _tcollector
+    if _tcollector is None:
+        _tcollector = thrift.load(
+            os.path.join(base, 'tcollector.thrift'), service='tcollector',
+        )
+        sys.modules[__name__ + '.tcollector'] = _tcollector
+    return _tcollector
+
+
+class SpanReporter(EventHook):
+    """Event hook that reports spans to a TCollector in batches.
+
+    :param tchannel:
+        TChannel to report spans through. It does not need to be the
+        channel the hook is registered with.
+    :param service:
+        Name of the collector service.
+    :param hostport:
+        Address of the collector, if it is not reachable through the
+        channel's peers.
+    :param capacity:
+        Maximum number of finished spans waiting to be submitted, and of
+        calls in progress.
+    :param batch_size:
+        Maximum number of spans submitted in a single request.
+    :param interval:
+        Number of seconds between submissions.
+    :param timeout:
+        Timeout of submission requests, in seconds.
+    :param max_duration:
+        Number of seconds after which a call that has not finished is
+        forgotten, e.g. because its response could not be written.
+    """
+
+    def __init__(self, tchannel, service='tcollector', hostport=None,
+                 capacity=10000, batch_size=100, interval=1.0, timeout=1.0,
+                 max_duration=60.0):
+        self.tchannel = tchannel
+        self.service = service
+        self.hostport = hostport
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.interval = interval
+        self.timeout = timeout
+        self.max_duration = max_duration
+
+        self.buffer = collections.deque(maxlen=capacity)
+        # Calls in progress, oldest first.
+        self._client_spans = collections.OrderedDict()
+        self._server_spans = collections.OrderedDict()
+        self._callback = None
+        self._submitting = None
+
+        #: Number of spans dropped because the buffer was full.
+        self.dropped = 0
+        #: Number of spans that could not be submitted.
+        self.failed = 0
+        #: Number of calls forgotten because they did not finish within
+        #: ``max_duration``.
+        self.expired = 0
+
+    def start(self):
+        """Start submitting spans on the current IOLoop."""
+        if self._callback is None:
+            self._callback = tornado.ioloop.PeriodicCallback(
+                self.flush, self.interval * 1000
+            )
+            self._callback.start()
+
+    def stop(self):
+        """Stop submitting spans on a timer.
+
+        :returns:
+            A future for the submission of what's left in the buffer.
+        """
+        if self._callback is not None:
+            self._callback.stop()
+            self._callback = None
+        return self.flush()
+
+    def before_send_request(self, request):
+        self._start(self._client_spans, request)
+
+    def after_receive_response(self, request, response):
+        self._finish(self._client_spans, request.tracing, None)
+
+    def after_receive_error(self, request, err):
+        self._finish(self._client_spans, request.tracing, err)
+
+    def before_receive_request(self, request):
+        self._start(self._server_spans, request)
+
+    def after_send_response(self, response):
+        self._finish(self._server_spans, response.tracing, None)
+
+    def after_send_error(self, err):
+        self._finish(self._server_spans, err.tracing, err)
+
+    def _start(self, spans, request):
+        tracing = request.tracing
+        if not tracing.traceflags & _SAMPLED:
+            return
+        now = time.time()
+        self._expire(spans, now - self.max_duration)
+        if len(spans) >= self.capacity:
+            self.dropped += 1
+            return
+        spans[tracing] = (
+            now,
+            request.service,
+            request.endpoint,
+            request.headers.get('as'),
+        )
+
+    def _expire(self, spans, cutoff):
+        # Finish hooks are not called for every call, e.g. when the
+        # connection is closed before a response is written.
+        while spans:
+            tracing = next(iter(spans))
+            if spans[tracing][0] >= cutoff:
+                break
+            del spans[tracing]
+            self.expired += 1
+
+    def _finish(self, spans, tracing, error):
+        if tracing is None:
+            return
+        started = spans.pop(tracing, None)
+        if started is None:
+            return
+
+        start, service, endpoint, encoding = started
+        if len(self.buffer) == self.capacity:
+            self.dropped += 1  # the oldest span is replaced
+        self.buffer.append(FinishedSpan(
+            kind=CLIENT if spans is self._client_spans else SERVER,
+            tracing=tracing,
+            service=service,
+            endpoint=endpoint,
+            encoding=encoding,
+            start=start,
+            end=time.time(),
+            error=error,
+        ))
+
+    def flush(self):
+        """Submit a batch of finished spans to the collector.
+
+        Only one batch is in flight at any time; if the previous batch has
+        not been submitted yet, this does nothing.
+
+        :returns:
+            A future for the submission.
+        """
+        if self._submitting is not None and not self._submitting.done():
+            return self._submitting
+
+        batch = []
+        while self.buffer and len(batch) < self.batch_size:
+            batch.append(self.buffer.popleft())
+
+        self._submitting = self._submit(batch)
+        return self._submitting
+
+    @tornado.gen.coroutine
+    def _submit(self, batch):
+        if not batch:
+            return
+
+        tcollector = load_tcollector()
+        request = tcollector.TCollector.submitBatch(
+            [self._to_thrift(tcollector, span) for span in batch]
+        )
+        request.service = self.service
+        try:
+            # The submission must not be traced itself, or each batch would
+            # produce a span for the next one.
+            yield self.tchannel.thrift(
+                request,
+                hostport=self.hostport,
+                timeout=self.timeout,
+                retry_on=retry.NEVER,
+                trace=False,
+            )
+        except Exception:
+            self.failed += len(batch)
+            log.warning(
+                'failed to submit %d spans to %s', len(batch), self.service,
+                exc_info=True,
+            )
+
+    def _to_thrift(self, tcollector, span):
+        tracing = span.tracing
+        start, end = _ANNOTATIONS[span.kind]
+        if span.kind == CLIENT:
+            host = _endpoint(
+                tcollector, self.tchannel.hostport, self.tchannel.name,
+            )
+        else:
+            host = _endpoint(tcollector, self.tchannel.hostport, span.service)
+
+        binary_annotations = []
+        if span.encoding:
+            binary_annotations.append(
+                _string_annotation(tcollector, 'as', span.encoding)
+            )
+        if span.error is not None:
+            binary_annotations.append(
+                _string_annotation(
+                    tcollector, 'error', type(span.error).__name__,
+                )
+            )
+
+        return tcollector.Span(
+            traceId=_id(tracing.trace_id),
+            host=host,
+            name=span.endpoint,
+            id=_id(tracing.span_id),
+            parentId=_id(tracing.parent_id),
+            annotations=[
+                tcollector.Annotation(
+                    timestamp=span.start * 1000, value=start,
+                ),
+                tcollector.Annotation(timestamp=span.end * 1000, value=end),
+            ],
+            binaryAnnotations=binary_annotations,
+        )
+
+
+def _id(value):
+    return struct.pack('>Q', value)
+
+
+def _endpoint(tcollector, hostport, service):
+    host, _, port = hostport.rpartition(':')
+    try:
+        ipv4 = struct.unpack('>i', socket.inet_aton(host))[0]
+    except socket.error:
+        ipv4 = 0
+    return tcollector.Endpoint(
+        ipv4=ipv4, port=int(port or 0), serviceName=service,
+    )
+
+
+def _string_annotation(tcollector, key, value):
+    return tcollector.BinaryAnnotation(
+        key=key,
+        stringValue=value,
+        annotationType=tcollector.AnnotationType.STRING,
+    )
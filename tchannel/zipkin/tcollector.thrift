@@ -0,0 +1,43 @@
+struct Endpoint {
+    1: required i32 ipv4
+    2: required i32 port
+    3: required string serviceName
+}
+
+struct Annotation {
+    // milliseconds since the epoch
+    1: required double timestamp
+    2: required string value
+}
+
+enum AnnotationType { BOOL, BYTES, I16, I32, I64, DOUBLE, STRING }
+
+struct BinaryAnnotation {
+    1: required string key
+    2: optional string stringValue
+    3: optional double doubleValue
+    4: optional bool boolValue
+    5: optional binary bytesValue
+    6: optional i64 intValue
+    7: required AnnotationType annotationType
+}
+
+struct Span {
+    1: required binary traceId
+    2: required Endpoint host
+    3: required string name
+    4: required binary id
+    5: required binary parentId
+    6: required list<Annotation> annotations
+    7: required list<BinaryAnnotation> binaryAnnotations
+    8: optional bool debug = false
+}
+
+struct Response {
+    1: required bool ok
+}
+
+service TCollector {
+    Response submit(1: Span span)
+    list<Response> submitBatch(1: list<Span> spans)
+}
@@ -23,6 +23,8 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import json
+
 import pytest
 
 from tchannel import TChannel, Response, schemes
@@ -115,3 +117,44 @@ def test_invalid_headers():
         )
 
     assert 'headers must be a map[string]string' in str(exc_info)
+
+
+@pytest.mark.gen_test
+@pytest.mark.call
+def test_json_backend():
+
+    class Backend(object):
+        calls = 0
+
+        def dumps(self, obj):
+            Backend.calls += 1
+            return json.dumps(obj)
+
+        def loads(self, s):
+            Backend.calls += 1
+            return json.loads(s)
+
+    server = TChannel(name='server', json_backend=Backend())
+
+    @server.json.register
+    def endpoint(request):
+        assert request.headers == {'req': 'headers'}
+        return Response(request.body, headers={'resp': 'headers'})
+
+    server.listen()
+
+    client = TChannel(name='client', json_backend=Backend())
+
+    resp = yield client.json(
+        service='server',
+        endpoint='endpoint',
+        headers={'req': 'headers'},
+        body={'req': 'body'},
+        hostport=server.hostport,
+    )
+
+    assert resp.headers == {'resp': 'headers'}
+    assert resp.body == {'req': 'body'}
+
+    # request headers/body and response headers/body on both ends
+    assert Backend.calls == 8
@@ -19,9 +19,12 @@
 # THE SOFTWARE.
 
 from __future__ import absolute_import
+
+import json
+
 import pytest
 
-from tchannel.serializer.json import JsonSerializer
+from tchannel.serializer.json import JsonSerializer, get_backend
 
 
 @pytest.mark.parametrize('v1', [
@@ -60,3 +63,82 @@ def test_exception():
 
     with pytest.raises(ValueError):
         serializer.deserialize_body('{sss')
+
+
+class CountingBackend(object):
+
+    def __init__(self):
+        self.dumped = []
+        self.loaded = []
+
+    def dumps(self, obj):
+        self.dumped.append(obj)
+        return json.dumps(obj)
+
+    def loads(self, s):
+        self.loaded.append(s)
+        return json.loads(s)
+
+
+def test_custom_backend():
+    backend = CountingBackend()
+    serializer = JsonSerializer(backend)
+
+    assert '{"a": "d"}' == serializer.serialize_body({'a': 'd'})
+    assert {'a': 'd'} == serializer.deserialize_body('{"a": "d"}')
+    assert {'k': 'v'} == serializer.deserialize_header(
+        serializer.serialize_header({'k': 'v'})
+    )
+
+    assert backend.dumped == [{'a': 'd'}, {'k': 'v'}]
+    assert backend.loaded == ['{"a": "d"}', '{"k": "v"}']
+
+
+def test_empty_headers_skip_backend():
+    backend = CountingBackend()
+    serializer = JsonSerializer(backend)
+
+    assert {} == serializer.deserialize_header(
+        serializer.serialize_header(None)
+    )
+    assert {} == serializer.deserialize_header(
+        serializer.serialize_header({})
+    )
+    assert not backend.dumped
+    assert not backend.loaded
+
+
+def test_header_string_subclasses():
+
+    class Key(str):
+        pass
+
+    serializer = JsonSerializer()
+    assert {'k': 'v'} == serializer.deserialize_header(
+        serializer.serialize_header({Key('k'): u'v'})
+    )
+
+
+@pytest.mark.parametrize('headers', [
+    {'foo': ['bar']},
+    {'foo': 1},
+    {1: 'foo'},
+])
+def test_header_invalid(headers):
+    serializer = JsonSerializer()
+    with pytest.raises(ValueError) as exc_info:
+        serializer.serialize_header(headers)
+
+    assert 'headers must be a map[string]string' in str(exc_info)
+
+
+def test_get_backend():
+    assert get_backend() is json
+    assert get_backend('json') is json
+    assert get_backend('auto') is not None
+
+    backend = CountingBackend()
+    assert get_backend(backend) is backend
+
+    with pytest.raises(ImportError):
+        get_backend('not_a_json_library')
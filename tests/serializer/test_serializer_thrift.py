@@ -19,6 +19,10 @@
 # THE SOFTWARE.
 
 import pytest
+
+from tchannel import io
+from tchannel import rw
+from tchannel.errors import ReadError
 from tchannel.serializer.thrift import ThriftSerializer
 from tests.data.generated.ThriftTest.ThriftTest import (
     testStruct_result,
@@ -43,3 +47,59 @@ def test_body():
     assert result == serializer.deserialize_body(
         serializer.serialize_body(result)
     )
+
+
+@pytest.mark.parametrize('headers', [
+    {},
+    {'a': 'd'},
+    {'foo': 'bar', 'baz': ''},
+    {u'\u2603': u'snow\u2603man'},
+])
+def test_header_matches_rw(headers):
+    headers_rw = rw.headers(
+        rw.number(2),
+        rw.len_prefixed_string(rw.number(2)),
+        rw.len_prefixed_string(rw.number(2)),
+    )
+    serializer = ThriftSerializer(None)
+    payload = serializer.serialize_header(headers)
+
+    assert payload == headers_rw.write(headers, io.BytesIO()).getvalue()
+    assert headers == dict(headers_rw.read(io.BytesIO(payload)))
+    assert headers == serializer.deserialize_header(payload)
+
+
+@pytest.mark.parametrize('payload', [
+    b'\x00',
+    b'\x00\x01\x00\x03ab',
+    b'\x00\x01\x00\x01a',
+    b'\x00\x01\x00\x01a\x00\x02b',
+])
+def test_header_truncated(payload):
+    serializer = ThriftSerializer(None)
+    with pytest.raises(ReadError):
+        serializer.deserialize_header(payload)
+
+
+@pytest.mark.parametrize('headers', [
+    {'key': 1},
+    {1: 'value'},
+    100,
+    True,
+])
+def test_header_invalid(headers):
+    serializer = ThriftSerializer(None)
+    with pytest.raises((AttributeError, TypeError)):
+        serializer.serialize_header(headers)
+
+
+def test_body_matches_protocol():
+    from thrift.protocol import TBinaryProtocol
+    from thrift.transport import TTransport
+
+    result = testStruct_result(Xtruct("s", 0, 1, 2))
+    trans = TTransport.TMemoryBuffer()
+    result.write(TBinaryProtocol.TBinaryProtocol(trans))
+
+    serializer = ThriftSerializer(testStruct_result)
+    assert trans.getvalue() == serializer.serialize_body(result)
@@ -20,11 +20,23 @@
 
 from __future__ import absolute_import
 
+import threading
+
+import mock
 import pytest
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from jaeger_client import ConstSampler, Tracer
+from jaeger_client.reporter import InMemoryReporter
+from opentracing_instrumentation.request_context import get_current_span
+
 from tchannel import thrift
+from tchannel.event import EventHook
 from tchannel import TChannel as AsyncTchannel
 from tchannel.sync import TChannel
 from tchannel.errors import UnexpectedError, BadRequestError
+from tchannel.metrics import MetricsRegistry
+from tchannel.offload import Offloader
 
 
 @pytest.mark.integration
@@ -121,7 +133,7 @@ def register_json(tchannel):
 
     @tchannel.json.register
     def hello(request):
-        return {}
+        return {'thread': threading.current_thread().name}
 
 
 def register_thrift(tchannel):
@@ -132,14 +144,14 @@ def register_thrift(tchannel):
     ).SecondService
 
     @tchannel.thrift.register(ThriftTest)
-    def hello(request):
-        return
+    def blahBlah(request):
+        assert threading.current_thread().name != 'MainThread'
 
 
 def register_from_top(tchannel):
 
     def hello(request):
-        pass
+        return threading.current_thread().name
 
     tchannel.register('raw', 'hello', hello)
 
@@ -148,7 +160,7 @@ def register_raw(tchannel):
 
     @tchannel.raw.register
     def hello(request):
-        return ""
+        return threading.current_thread().name
 
 
 def request_json(tchannel, hostport):
@@ -192,8 +204,210 @@ def test_sync_register(register_endpoint, make_request):
     sync_client.listen()
 
     async_client = AsyncTchannel('async')
-    with pytest.raises(BadRequestError):
-        yield make_request(async_client, sync_client.hostport)
+    response = yield make_request(async_client, sync_client.hostport)
+    assert response.status == 0
+
+    response = yield make_request(sync_client, sync_client.hostport)
+    assert response.status == 0
+
+
+def test_sync_handlers_run_concurrently():
+    server = TChannel('server', executor=ThreadPoolExecutor(2))
+    entered = threading.Semaphore(0)
+    release = threading.Event()
+
+    @server.json.register('block')
+    def block(request):
+        entered.release()
+        release.wait(1)
+        return request.body
 
+    server.listen()
+
+    client = TChannel('client')
+    futures = [
+        client.json('server', 'block', body=i, hostport=server.hostport)
+        for i in range(2)
+    ]
+    # Both handlers are blocked at the same time, and the IOLoop still
+    # serves other requests.
+    entered.acquire()
+    entered.acquire()
     with pytest.raises(BadRequestError):
-        yield make_request(sync_client, sync_client.hostport)
+        client.json('server', 'missing', hostport=server.hostport).result()
+    release.set()
+
+    assert sorted(f.result().body for f in futures) == [0, 1]
+
+
+def test_sync_handler_calls_are_traced():
+    reporter = InMemoryReporter()
+    tracer = Tracer(
+        service_name='test', sampler=ConstSampler(True), reporter=reporter,
+    )
+
+    backend = TChannel('backend', trace=True)
+
+    @backend.json.register('inner')
+    def inner(request):
+        return {'trace_id': get_current_span().context.trace_id}
+
+    server = TChannel('server', trace=True)
+
+    @server.json.register('outer')
+    def outer(request):
+        trace_id = get_current_span().context.trace_id
+        response = server.json(
+            'backend', 'inner', hostport=backend.hostport
+        ).result()
+        return {'trace_ids': [trace_id, response.body['trace_id']]}
+
+    with mock.patch('opentracing.tracer', tracer):
+        backend.listen()
+        server.listen()
+        client = TChannel('client', trace=True)
+        response = client.json(
+            'server', 'outer', hostport=server.hostport
+        ).result()
+    tracer.close()
+
+    trace_ids = response.body['trace_ids']
+    assert trace_ids[0] == trace_ids[1]
+    # The client, server and backend spans of both calls are in one trace.
+    spans = reporter.get_spans()
+    assert len(spans) == 4
+    assert set(span.context.trace_id for span in spans) == set(trace_ids)
+
+
+def double(request):
+    return request.body * 2
+
+
+def test_sync_register_process_pool():
+    server = TChannel('server')
+    server.raw.register('double', executor=ProcessPoolExecutor(1))(double)
+    server.listen()
+
+    client = TChannel('client')
+    future = client.raw('server', 'double', body='a', hostport=server.hostport)
+
+    assert future.result().body == 'aa'
+
+
+def test_sync_register_process_pool_with_tracer():
+    tracer = Tracer(
+        service_name='test', sampler=ConstSampler(True),
+        reporter=InMemoryReporter(),
+    )
+    server = TChannel('server', trace=True)
+    server.raw.register('double', executor=ProcessPoolExecutor(1))(double)
+
+    with mock.patch('opentracing.tracer', tracer):
+        server.listen()
+        client = TChannel('client', trace=True)
+        future = client.raw(
+            'server', 'double', body='a', hostport=server.hostport,
+            timeout=5,
+        )
+        assert future.result().body == 'aa'
+    tracer.close()
+
+
+@pytest.mark.integration
+def test_thrift_many(loop):
+    service = thrift.load(
+        path='tests/data/idls/ThriftTest.thrift',
+        service='server',
+    )
+    server = AsyncTchannel('server')
+
+    @server.thrift.register(service.ThriftTest)
+    def testString(request):
+        return request.body.thing
+
+    loop.submit(server.listen).result()
+
+    client = TChannel('test-client')
+    futures = client.thrift_many(
+        [service.ThriftTest.testString(s) for s in 'abc'],
+        hostport=server.hostport,
+    )
+
+    assert [f.result().body for f in futures] == ['a', 'b', 'c']
+
+
+@pytest.mark.integration
+def test_many_in_order(mock_server):
+    mock_server.expect_call('echo', 'json').and_write(body={'ok': True})
+    mock_server.expect_call('fail', 'json').and_raise(Exception('nope'))
+
+    client = TChannel('test-client')
+    futures = client.json.many([
+        ('test', 'echo', {}),
+        ('test', 'fail', {}),
+        ('test', 'echo', {}),
+    ], hostport=mock_server.hostport)
+
+    assert len(futures) == 3
+    assert futures[0].result().body == {'ok': True}
+    with pytest.raises(UnexpectedError):
+        futures[1].result()
+    assert futures[2].result().body == {'ok': True}
+
+
+@pytest.mark.integration
+def test_loops(mock_server):
+    mock_server.expect_call('health').and_write(headers='', body='OK')
+    mock_server.expect_call('batch').and_write(headers='', body='OK')
+
+    calls = []
+
+    class Hook(EventHook):
+        def before_send_request(self, request):
+            calls.append(
+                (request.endpoint, threading.current_thread().ident)
+            )
+
+    client = TChannel('test-client', loops=3)
+    client.hooks.register(Hook())
+
+    futures = [
+        client.raw('foo', 'health', hostport=mock_server.hostport)
+        for _ in range(6)
+    ]
+    futures.extend(client.raw.many(
+        [('foo', 'batch')] * 3, hostport=mock_server.hostport,
+    ))
+
+    assert [f.result().body for f in futures] == ['OK'] * 9
+    # Every loop thread made calls, and the batch was made from one of them.
+    assert len(set(thread for _, thread in calls)) == 3
+    assert len(set(thread for e, thread in calls if e == 'batch')) == 1
+
+
+@pytest.mark.integration
+def test_loops_share_metrics(mock_server):
+    mock_server.expect_call('health').and_write(headers='', body='OK')
+
+    registry = MetricsRegistry()
+    offload = Offloader(ThreadPoolExecutor(1))
+    client = TChannel(
+        'test-client', loops=3, metrics=registry, offload=offload
+    )
+    offloaders = [c.offloader for c in client._channels]
+    assert offloaders[0] is offload
+    assert len(set(map(id, offloaders))) == 3
+    assert all(o.executor is offload.executor for o in offloaders)
+
+    for _ in range(3):
+        futures = [
+            client.raw('foo', 'health', hostport=mock_server.hostport)
+            for _ in range(100)
+        ]
+        assert [f.result().body for f in futures] == ['OK'] * 100
+
+    snapshot = dict(
+        (name, metric) for name, _, metric in registry.flush()
+    )
+    assert snapshot['tchannel.outbound.calls.success'].value == 300
+    assert snapshot['tchannel.outbound.calls.latency'].count == 300
@@ -22,6 +22,11 @@ from __future__ import (
     absolute_import, division, print_function, unicode_literals
 )
 
+import subprocess
+import sys
+import textwrap
+import threading
+
 import pytest
 
 from tchannel.sync.singleton import TChannel
@@ -46,3 +51,126 @@ def test_stored_seperately_from_async_singleton():
 
     assert isinstance(instance,  SyncTChannel)
     assert AsyncSingleton.get_instance() is not instance
+
+
+def _instances_by_thread(count=8):
+    instances = []
+    threads = [
+        threading.Thread(
+            target=lambda: instances.append(TChannel.get_instance())
+        )
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return instances
+
+
+def test_instance_per_thread():
+
+    TChannel.reset()
+    TChannel.prepare('sync-app')
+
+    instances = _instances_by_thread()
+
+    assert len(set(map(id, instances))) == len(instances)
+
+
+def test_shared_instance():
+
+    TChannel.reset()
+    TChannel.prepare('sync-app', shared=True)
+
+    instances = _instances_by_thread()
+
+    assert set(instances) == {TChannel.get_instance()}
+    assert TChannel.get_instance().name == 'sync-app'
+
+    TChannel.reset()
+    TChannel.prepare('sync-app')
+    assert TChannel.get_instance() not in instances
+
+
+@pytest.mark.integration
+def test_shared_instance_calls_from_threads(mock_server):
+    mock_server.expect_call('echo', 'json').and_write(body={'ok': True})
+
+    TChannel.reset()
+    TChannel.prepare('sync-app', shared=True)
+
+    responses = []
+
+    def call():
+        responses.append(TChannel.get_instance().json(
+            'mock_server', 'echo', hostport=mock_server.hostport
+        ).result())
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [r.body for r in responses] == [{'ok': True}] * 8
+    peer = TChannel.get_instance()._dep_tchannel.peers.get(
+        mock_server.hostport
+    )
+    assert len(peer.connections) == 1
+    TChannel.reset()
+
+
+def test_reset_stops_shared_instance():
+    TChannel.reset()
+    TChannel.prepare('sync-app', shared=True)
+    instance = TChannel.get_instance()
+    instance.listen()
+    thread = instance._threadloop._thread
+    assert thread.is_alive()
+
+    TChannel.reset()
+    assert not thread.is_alive()
+    assert instance.is_closed()
+
+
+def test_shared_instance_in_fork_while_locks_are_held():
+    # Another thread holds the locks when the process forks.
+    script = textwrap.dedent("""
+        import os
+        import threading
+        import time
+
+        from tchannel.sync import client
+        from tchannel.sync.singleton import TChannel
+
+        TChannel.prepare('sync-app', shared=True)
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with TChannel._lock:
+                with client._start_lock:
+                    held.set()
+                    release.wait()
+
+        threading.Thread(target=hold).start()
+        held.wait()
+        pid = os.fork()
+        if pid == 0:
+            TChannel.get_instance().listen()
+            os._exit(0)
+        release.set()
+
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                assert status == 0, status
+                break
+            time.sleep(0.01)
+        else:
+            os.kill(pid, 9)
+            raise AssertionError('deadlocked')
+    """)
+    subprocess.check_call([sys.executable, '-c', script])
@@ -0,0 +1,129 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+import pickle
+
+import pytest
+
+from tchannel import TChannel
+from tchannel.bench import Stats
+from tchannel.bench import format_result
+from tchannel.bench import parse_args
+from tchannel.bench import run
+from tchannel.errors import BadRequestError
+
+
+@pytest.fixture
+def server(io_loop):
+    server = TChannel(name='server')
+
+    @server.json.register
+    def echo(request):
+        return request.body
+
+    @server.json.register
+    def fail(request):
+        raise BadRequestError('nope')
+
+    server.listen()
+    return server
+
+
+def bench_args(server, *extra):
+    return parse_args([
+        '-s', 'server',
+        '--host', server.hostport,
+        '--body', '{"thing": "foo"}',
+        '--duration', '0.2',
+    ] + list(extra))
+
+
+def test_parse_args_defaults_to_concurrency():
+    args = parse_args(['-s', 'larry', '--endpoint', 'foo'])
+    assert args.concurrency == 10
+    assert args.rate is None
+    assert args.processes == 1
+
+
+def test_parse_args_rate_and_concurrency(capsys):
+    with pytest.raises(SystemExit):
+        parse_args([
+            '-s', 'larry', '--endpoint', 'foo', '--rate', '10', '-c', '2',
+        ])
+
+    out, err = capsys.readouterr()
+    assert "can't use --rate and --concurrency together" in err
+
+
+@pytest.mark.gen_test
+def test_run_concurrency(server):
+    args = bench_args(server, '--endpoint', 'echo', '-c', '2')
+    stats = yield run(args, concurrency=args.concurrency)
+
+    assert stats.calls > 0
+    assert stats.latency.count == stats.calls
+    assert not stats.errors
+    assert stats.elapsed >= 0.2
+
+
+@pytest.mark.gen_test
+def test_run_rate(server):
+    args = bench_args(server, '--endpoint', 'echo', '--rate', '100')
+    stats = yield run(args, rate=args.rate)
+
+    # Calls are issued on a timer, so allow for a few missed ticks.
+    assert 10 <= stats.calls <= 21
+    assert not stats.errors
+
+
+@pytest.mark.gen_test
+def test_run_counts_errors(server):
+    args = bench_args(server, '--endpoint', 'fail', '-c', '1')
+    stats = yield run(args, concurrency=args.concurrency)
+
+    assert stats.calls > 0
+    assert stats.latency.count == 0
+    assert stats.errors == {'BadRequestError (0x06)': stats.calls}
+
+
+def test_stats_pickle_and_merge():
+    a = Stats()
+    a.latency.record(1000)
+    a.errors['TimeoutError (0x01)'] += 1
+    a.elapsed = 1.0
+
+    b = pickle.loads(pickle.dumps(a))
+    assert b.latency.count == 1
+    assert b.errors == a.errors
+
+    b.merge(a)
+    assert b.calls == 4
+    assert b.errors['TimeoutError (0x01)'] == 2
+    assert b.elapsed == 1.0
+
+    result = b.to_dict()
+    assert result['throughput'] == 4
+    assert result['latency_ms']['max'] == 1.0
+
+    output = format_result(result)
+    assert 'p99' in output
+    assert 'TimeoutError (0x01)' in output
@@ -0,0 +1,360 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+import zlib
+
+import pytest
+from tornado import gen
+
+from tchannel import Response
+from tchannel import TChannel
+from tchannel import compression
+from tchannel import transport
+from tchannel.compression import Compressor
+from tchannel.errors import BadRequestError
+from tchannel.errors import UnexpectedError
+from tchannel.event import EventHook
+from tchannel.response import TransportHeaders
+from tchannel.tornado import TChannel as DeprecatedTChannel
+from tchannel.tornado.stream import InMemStream
+from tchannel.tornado.stream import read_full
+
+BIG = {'document': 'x' * 4096}
+
+
+def test_compressor_skips_small_args():
+    compressor = Compressor(threshold=100)
+    assert compressor.compress(b'a' * 10, b'b' * 10) == (
+        b'a' * 10, b'b' * 10, None
+    )
+
+
+def test_compressor_skips_incompressible_args():
+    compressor = Compressor(threshold=0)
+    assert compressor.compress(b'', b'ab') == (b'', b'ab', None)
+
+
+def test_compressor_round_trip():
+    compressor = Compressor(threshold=0)
+    arg2, arg3, codec = compressor.compress(b'', u'\u2603' * 1000)
+
+    assert codec == compression.ZLIB
+    assert arg2 == b''
+    assert len(arg3) < 3000
+    assert compression.decompress(codec, arg2) == b''
+    assert compression.decompress(codec, arg3) == (
+        u'\u2603' * 1000
+    ).encode('utf-8')
+
+
+def test_compressor_unknown_codec():
+    with pytest.raises(ValueError):
+        Compressor('snappy')
+
+
+def test_decompress_invalid():
+    with pytest.raises(ValueError):
+        compression.decompress('snappy', b'foo')
+
+    with pytest.raises(ValueError):
+        compression.decompress(compression.ZLIB, b'not zlib')
+
+
+def test_decompress_max_size():
+    data = zlib.compress(b'x' * 1000)
+    assert compression.decompress(compression.ZLIB, data, 1000) == b'x' * 1000
+
+    with pytest.raises(ValueError):
+        compression.decompress(compression.ZLIB, data, 999)
+
+
+def test_accepts():
+    assert compression.accepts('zlib', 'zlib')
+    assert compression.accepts('lz4,zlib', 'zlib')
+    assert not compression.accepts('lz4', 'zlib')
+    assert not compression.accepts(None, 'zlib')
+
+
+@pytest.mark.gen_test
+@pytest.mark.parametrize('server_compression', [None, 'zlib'])
+@pytest.mark.parametrize('client_compression', [None, 'zlib'])
+def test_json_round_trip(server_compression, client_compression):
+    server = TChannel('server', compression=server_compression)
+    server.listen()
+
+    @server.json.register
+    def echo(request):
+        assert request.transport.compression is None
+        assert request.headers == {'hello': 'world'}
+        return request.body
+
+    client = TChannel(
+        'client',
+        known_peers=[server.hostport],
+        compression=client_compression,
+    )
+    res = yield client.json(
+        'server', 'echo', BIG, headers={'hello': 'world'}
+    )
+
+    assert res.body == BIG
+    assert res.transport.compression is None
+
+
+class RecordCompression(EventHook):
+
+    def __init__(self):
+        self.codecs = []
+
+    def before_receive_request(self, request):
+        self.codecs.append(request.headers.get(transport.COMPRESSION))
+
+
+@pytest.mark.gen_test
+@pytest.mark.parametrize('streaming', [True, False])
+def test_request_is_compressed_once_accepted(streaming):
+    server = TChannel('server', compression='zlib')
+    server.listen()
+    hook = RecordCompression()
+    server.hooks.register(hook)
+
+    @server.register('raw', 'echo', streaming=streaming)
+    @gen.coroutine
+    def echo(request):
+        assert request.transport.compression is None
+        assert request.transport.accept_compression == compression.ACCEPTED
+
+        body = request.body
+        if streaming:
+            body = yield read_full(body)
+        raise gen.Return(body)
+
+    client = TChannel(
+        'client', known_peers=[server.hostport], compression='zlib'
+    )
+    for _ in range(2):
+        res = yield client.raw('server', 'echo', b'x' * 4096)
+        assert res.body == b'x' * 4096
+
+    # the first response tells the client that the server decompresses zlib
+    assert hook.codecs == [None, compression.ZLIB]
+
+
+@pytest.mark.gen_test
+def test_request_is_not_compressed_for_deprecated_handlers():
+    server = DeprecatedTChannel('server')
+    server.listen()
+    hook = RecordCompression()
+    server.hooks.register(hook)
+
+    @server.register('echo', 'raw')
+    @gen.coroutine
+    def echo(request, response):
+        body = yield request.get_body()
+        response.write_body(body)
+
+    client = TChannel(
+        'client', known_peers=[server.hostport], compression='zlib'
+    )
+    for _ in range(2):
+        res = yield client.raw('server', 'echo', b'x' * 5000)
+        assert res.body == b'x' * 5000
+
+    assert hook.codecs == [None, None]
+
+
+@pytest.mark.gen_test
+def test_compressed_request_to_deprecated_handler_is_rejected():
+    server = DeprecatedTChannel('server')
+    server.listen()
+
+    @server.register('echo', 'raw')
+    @gen.coroutine
+    def echo(request, response):
+        body = yield request.get_body()
+        response.write_body(body)
+
+    client = TChannel('client')
+    headers = {
+        transport.SCHEME: 'raw',
+        transport.CALLER_NAME: 'client',
+        transport.COMPRESSION: compression.ZLIB,
+    }
+
+    with pytest.raises(BadRequestError):
+        yield client._dep_tchannel.request(
+            hostport=server.hostport, service='server',
+        ).send('echo', b'', zlib.compress(b'x' * 100), headers=headers)
+
+
+@pytest.mark.gen_test
+def test_corrupt_response_raises_tchannel_error():
+    server = TChannel('server')
+    server.listen()
+
+    @server.register('raw', 'corrupt', streaming=True)
+    def corrupt(request):
+        body = InMemStream(b'not zlib')
+        body.close()
+        return Response(
+            body=body,
+            transport=TransportHeaders(compression=compression.ZLIB),
+        )
+
+    client = TChannel('client', known_peers=[server.hostport])
+    with pytest.raises(UnexpectedError):
+        yield client.raw('server', 'corrupt', b'')
+
+
+@pytest.mark.gen_test
+@pytest.mark.parametrize('accept, compressed', [
+    (None, False),
+    ('lz4', False),
+    (compression.ACCEPTED, True),
+])
+def test_response_is_compressed_if_accepted(accept, compressed):
+    server = TChannel('server', compression=Compressor(threshold=10))
+    server.listen()
+
+    @server.raw.register
+    def echo(request):
+        return request.body
+
+    client = TChannel('client')
+    headers = {transport.SCHEME: 'raw', transport.CALLER_NAME: 'client'}
+    if accept:
+        headers[transport.ACCEPT_COMPRESSION] = accept
+
+    response = yield client._dep_tchannel.request(
+        hostport=server.hostport, service='server',
+    ).send('echo', b'', b'y' * 100, headers=headers)
+    body = yield response.get_body()
+
+    if compressed:
+        assert response.headers[transport.COMPRESSION] == compression.ZLIB
+        assert zlib.decompress(body) == b'y' * 100
+    else:
+        assert transport.COMPRESSION not in response.headers
+        assert body == b'y' * 100
+
+
+@pytest.mark.gen_test
+def test_corrupt_request_is_rejected():
+    server = TChannel('server', compression='zlib')
+    server.listen()
+
+    @server.raw.register
+    def echo(request):
+        return request.body
+
+    client = TChannel('client')
+    headers = {
+        transport.SCHEME: 'raw',
+        transport.CALLER_NAME: 'client',
+        transport.COMPRESSION: compression.ZLIB,
+    }
+
+    with pytest.raises(BadRequestError):
+        yield client._dep_tchannel.request(
+            hostport=server.hostport, service='server',
+        ).send('echo', b'', b'not zlib', headers=headers)
+
+
+@pytest.mark.gen_test
+def test_forward_relays_compressed_payloads():
+    server = TChannel('server', compression='zlib')
+    server.listen()
+
+    @server.json.register
+    def echo(request):
+        return request.body
+
+    proxy = TChannel('proxy', compression='zlib')
+    proxy.listen()
+
+    @proxy.register(TChannel.FALLBACK, streaming=True)
+    def relay(request):
+        # compressed requests are decompressed before they are relayed
+        assert request.transport.compression is None
+        return proxy.forward(request, hostport=server.hostport)
+
+    client = TChannel(
+        'client', known_peers=[proxy.hostport], compression='zlib'
+    )
+    for _ in range(2):
+        res = yield client.json('server', 'echo', BIG)
+        assert res.body == BIG
+
+
+@pytest.mark.gen_test
+@pytest.mark.parametrize('server_compression', [None, 'zlib'])
+def test_compression_is_only_accepted_if_enabled(server_compression):
+    server = TChannel('server', compression=server_compression)
+    server.listen()
+
+    @server.raw.register
+    def echo(request):
+        return request.body
+
+    client = TChannel('client')
+    headers = {transport.SCHEME: 'raw', transport.CALLER_NAME: 'client'}
+
+    response = yield client._dep_tchannel.request(
+        hostport=server.hostport, service='server',
+    ).send('echo', b'', b'y' * 100, headers=dict(headers))
+    yield response.get_body()
+    assert response.headers.get(transport.ACCEPT_COMPRESSION) == (
+        server_compression and compression.ACCEPTED
+    )
+
+    headers[transport.COMPRESSION] = compression.ZLIB
+    request = client._dep_tchannel.request(
+        hostport=server.hostport, service='server',
+    ).send('echo', b'', zlib.compress(b'y' * 100), headers=headers)
+    if server_compression is None:
+        with pytest.raises(BadRequestError):
+            yield request
+    else:
+        response = yield request
+        assert (yield response.get_body()) == b'y' * 100
+
+
+@pytest.mark.gen_test
+def test_request_decompressing_to_more_than_max_size_is_rejected():
+    server = TChannel('server', compression=Compressor(max_size=1024))
+    server.listen()
+
+    @server.raw.register
+    def echo(request):
+        return request.body
+
+    client = TChannel('client')
+    headers = {
+        transport.SCHEME: 'raw',
+        transport.CALLER_NAME: 'client',
+        transport.COMPRESSION: compression.ZLIB,
+    }
+
+    with pytest.raises(BadRequestError):
+        yield client._dep_tchannel.request(
+            hostport=server.hostport, service='server',
+        ).send('echo', b'', zlib.compress(b'\0' * 10 ** 6), headers=headers)
@@ -21,9 +21,14 @@
 from __future__ import absolute_import
 
 import pytest
+from jaeger_client import ConstSampler
+from jaeger_client import Tracer
+from jaeger_client.reporter import InMemoryReporter
 
 from tchannel import TChannel
 from tchannel import thrift
+from tchannel.request import Request
+from tchannel.serializer.json import JsonSerializer
 from tchannel.serializer.raw import RawSerializer
 from tchannel.tornado.dispatch import RequestDispatcher
 
@@ -95,3 +100,113 @@ def test_routing_delegate_is_propagated_thrift(tmpdir):
         thrift_module.Service.healthy(), routing_delegate='delegate'
     )
     assert res.body is True
+
+
+class CountingSerializer(JsonSerializer):
+
+    def __init__(self):
+        super(CountingSerializer, self).__init__()
+        self.bodies = 0
+        self.headers = 0
+
+    def deserialize_body(self, obj):
+        self.bodies += 1
+        return super(CountingSerializer, self).deserialize_body(obj)
+
+    def deserialize_header(self, headers):
+        self.headers += 1
+        return super(CountingSerializer, self).deserialize_header(headers)
+
+
+def test_request_deserializes_lazily():
+    serializer = CountingSerializer()
+    request = Request(
+        raw_body=b'{"foo": "bar"}',
+        raw_headers=b'{"hello": "world"}',
+        serializer=serializer,
+    )
+
+    assert request.raw_body == b'{"foo": "bar"}'
+    assert serializer.bodies == 0
+    assert serializer.headers == 0
+
+    assert request.body == {'foo': 'bar'}
+    assert request.body == {'foo': 'bar'}
+    assert serializer.bodies == 1
+    assert serializer.headers == 0
+
+    assert request.headers == {'hello': 'world'}
+    assert serializer.headers == 1
+
+    request.body = 'overridden'
+    assert request.body == 'overridden'
+    assert request.raw_body == b'{"foo": "bar"}'
+
+
+def test_request_without_serializer():
+    request = Request(body={'foo': 'bar'}, headers={})
+    assert request.body == {'foo': 'bar'}
+    assert request.headers == {}
+    assert request.raw_body is None
+    assert request.raw_headers is None
+
+
+@pytest.mark.gen_test
+def test_handler_body_is_not_deserialized_unless_used():
+    server = TChannel('server')
+    server.listen()
+
+    serializer = CountingSerializer()
+
+    def forward(request):
+        return request.raw_body
+
+    server._dep_tchannel._handler.register(
+        'forward', forward, serializer, RawSerializer()
+    )
+
+    client = TChannel('client', known_peers=[server.hostport])
+    res = yield client.json('service', 'forward', {'big': 'document'})
+    assert res.body == {'big': 'document'}
+    assert serializer.bodies == 0
+    assert serializer.headers == 0
+
+
+@pytest.mark.gen_test
+def test_handler_headers_are_deserialized_for_tracing():
+    tracer = Tracer(
+        service_name='test', sampler=ConstSampler(True),
+        reporter=InMemoryReporter(),
+    )
+    server = TChannel('server', tracer=tracer)
+    server.listen()
+
+    serializer = CountingSerializer()
+
+    def handler(request):
+        span = server.context_provider.get_current_span()
+        return {'baggage': span.get_baggage_item('key')}
+
+    server._dep_tchannel._handler.register(
+        'traced', handler, serializer, JsonSerializer()
+    )
+
+    client = TChannel('client', known_peers=[server.hostport], tracer=tracer)
+    res = yield client.json('service', 'traced', {})
+    assert res.body == {'baggage': None}
+    assert serializer.headers == 1
+
+    # unsampled traces only carry application headers for their baggage
+    root = tracer.start_span('root')
+    root.set_tag('sampling.priority', 0)
+    with client.context_provider.span_in_context(root):
+        future = client.json('service', 'traced', {})
+    res = yield future
+    assert serializer.headers == 1
+
+    root.set_baggage_item('key', 'value')
+    with client.context_provider.span_in_context(root):
+        future = client.json('service', 'traced', {})
+    res = yield future
+    assert res.body == {'baggage': 'value'}
+    assert serializer.headers == 2
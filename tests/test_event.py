@@ -23,6 +23,7 @@ from __future__ import absolute_import
 import mock
 import pytest
 from mock import MagicMock
+from tornado.concurrent import Future
 from tornado.gen import maybe_future
 
 from tchannel import TChannel
@@ -69,6 +70,53 @@ def test_decorator_registration():
     assert called[1] is True
 
 
+def test_fire_without_hooks_is_resolved():
+    event_emitter = EventEmitter()
+
+    future = event_emitter.fire(EventType.before_send_request, None)
+    assert future.done()
+    assert future is event_emitter.fire(EventType.after_send_request)
+
+
+def test_fire_sync_hooks_is_resolved():
+    event_emitter = EventEmitter()
+    called = []
+
+    def fails(request):
+        raise Exception('great sadness')
+
+    event_emitter.register_hook(fails, EventType.before_send_request)
+    event_emitter.register_hook(called.append, EventType.before_send_request)
+
+    future = event_emitter.fire(EventType.before_send_request, 'request')
+    assert future.done()
+    assert called == ['request']
+
+
+@pytest.mark.gen_test
+def test_fire_waits_for_async_hooks():
+    event_emitter = EventEmitter()
+    hook_future = Future()
+    called = []
+
+    event_emitter.register_hook(
+        lambda: called.append(1) or hook_future,
+        EventType.before_send_request,
+    )
+    event_emitter.register_hook(
+        lambda: called.append(2),
+        EventType.before_send_request,
+    )
+
+    future = event_emitter.fire(EventType.before_send_request)
+    assert not future.done()
+    assert called == [1]
+
+    hook_future.set_exception(Exception('great sadness'))
+    yield future
+    assert called == [1, 2]
+
+
 @pytest.mark.gen_test
 def test_after_send_error_event_called():
     tchannel = TChannel('test')
@@ -25,7 +25,8 @@ from __future__ import (
 import pytest
 from tornado import gen
 
-from tchannel import TChannel, thrift
+from tchannel import Response, TChannel, thrift
+from tchannel.messages import common
 
 
 @pytest.fixture
@@ -168,3 +169,141 @@ def test_forwarding_json(client):
         'value': 'world',
     }, timeout=1.0)
     assert json_response.body == {'success': True}
+
+
+@pytest.fixture(params=[True, False], ids=['streaming', 'buffered'])
+def relay_server(request, keyvalue_server):
+    server = TChannel(name='keyvalue-relay')
+    server.listen()
+
+    relay_client = TChannel(
+        name='relay-client', known_peers=[keyvalue_server.hostport],
+    )
+
+    @server.register(TChannel.FALLBACK, streaming=request.param)
+    def handler(request):
+        return relay_client.forward(request)
+
+    return server
+
+
+@pytest.fixture
+def relay_client(relay_server):
+    return TChannel(name='client', known_peers=[relay_server.hostport])
+
+
+@pytest.mark.gen_test
+def test_relay_thrift_exception(keyvalue, relay_client):
+    with pytest.raises(keyvalue.ItemDoesNotExist):
+        yield relay_client.thrift(
+            keyvalue.KeyValue.getItem('foo'),
+            headers={'expect': 'failure'},
+        )
+
+
+@pytest.mark.gen_test
+def test_relay_thrift_success(keyvalue, relay_client, keyvalue_data):
+    keyvalue_data['hello'] = 'world'
+    response = yield relay_client.thrift(
+        keyvalue.KeyValue.getItem('hello'),
+        headers={'expect': 'success'},
+    )
+    assert response.body == 'world'
+    assert response.transport.scheme == 'thrift'
+
+
+@pytest.mark.gen_test
+def test_relay_json(relay_client):
+    json_response = yield relay_client.json('keyvalue', 'putItem', {
+        'key': 'hello',
+        'value': 'world',
+    }, timeout=0.5)
+    assert json_response.body == {'success': True}
+
+
+@pytest.mark.gen_test
+@pytest.mark.parametrize('streaming', [True, False])
+def test_relay_large_payload(streaming):
+    server = TChannel(name='echo')
+    server.listen()
+
+    @server.raw.register('echo')
+    def echo(request):
+        assert request.transport.caller_name == 'client'
+        return Response(request.body, headers=request.headers)
+
+    relay = TChannel(name='relay')
+    relay.listen()
+    relay_client = TChannel(name='relay-client')
+
+    @relay.register(TChannel.FALLBACK, streaming=streaming)
+    def handler(request):
+        return relay_client.forward(request, hostport=server.hostport)
+
+    client = TChannel(name='client')
+    body = b'x' * (common.MAX_PAYLOAD_SIZE * 3 + 17)
+    headers = b'y' * (common.MAX_PAYLOAD_SIZE + 1)
+
+    response = yield client.raw(
+        'echo', 'echo', body, headers=headers, hostport=relay.hostport,
+    )
+    assert response.body == body
+    assert response.headers == headers
+
+
+@pytest.mark.gen_test
+def test_bounded_argstream_pauses_reading():
+    server = TChannel(name='server')
+    server.listen()
+    buffered = []
+
+    @server.register(TChannel.FALLBACK, streaming=True)
+    @gen.coroutine
+    def slow_reader(request):
+        request.body.set_max_buffered(2)
+        chunks = []
+        chunk = yield request.body.read()
+        while chunk:
+            chunks.append(chunk)
+            buffered.append(len(request.body._stream))
+            yield gen.sleep(0.01)
+            chunk = yield request.body.read()
+        raise gen.Return(Response(b''.join(chunks)))
+
+    client = TChannel(name='client')
+    body = b'x' * (common.MAX_PAYLOAD_SIZE * 20)
+
+    response = yield client.raw(
+        'server', 'slow', body, hostport=server.hostport,
+    )
+    assert response.body == body
+    # The connection stops reading a frame or two after the bound is hit.
+    assert max(buffered) <= 4
+
+
+@pytest.mark.gen_test
+def test_relay_large_payload_bounded():
+    server = TChannel(name='echo')
+    server.listen()
+
+    @server.raw.register('echo')
+    def echo(request):
+        return Response(request.body, headers=request.headers)
+
+    relay = TChannel(name='relay')
+    relay.listen()
+    relay_client = TChannel(name='relay-client')
+
+    @relay.register(TChannel.FALLBACK, streaming=True)
+    def handler(request):
+        return relay_client.forward(
+            request, hostport=server.hostport, max_buffered=1,
+        )
+
+    client = TChannel(name='client')
+    body = b'x' * (common.MAX_PAYLOAD_SIZE * 8 + 17)
+
+    response = yield client.raw(
+        'echo', 'echo', body, hostport=relay.hostport,
+    )
+    assert response.body == body
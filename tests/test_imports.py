@@ -0,0 +1,52 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize('module', [
+    'crcmod',
+    'thriftrw',
+    'tornado.web',
+    'tchannel.metrics',
+    'tchannel.statsd',
+    'tchannel.testing',
+    'tchannel.zipkin',
+])
+def test_import_is_lazy(module):
+    # In a new interpreter, since other tests already imported everything.
+    subprocess.check_call([sys.executable, '-c', '\n'.join([
+        'import sys',
+        'import tchannel',
+        'assert %r not in sys.modules, "imported by tchannel"' % module,
+    ])])
+
+
+def test_span_reporter_import_is_lazy():
+    subprocess.check_call([sys.executable, '-c', '\n'.join([
+        'import sys',
+        'import tchannel.zipkin.reporter',
+        'assert "thriftrw" not in sys.modules, "tcollector.thrift was loaded"',
+    ])])
@@ -0,0 +1,98 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+import pytest
+from tornado import gen
+
+from tchannel import TChannel
+
+
+@pytest.mark.gen_test
+def test_introspect():
+    server = TChannel('server')
+    server.listen()
+
+    @server.json.register
+    def echo(request):
+        return request.body
+
+    client = TChannel('client', known_peers=[server.hostport])
+    yield client.json('server', 'echo', {'hello': 'world'})
+
+    state = client.introspect()
+    assert state['name'] == 'client'
+    assert state['listening'] is False
+    assert state['closed'] is False
+
+    (peer,) = state['peers']
+    assert peer['hostport'] == server.hostport
+    assert peer['chosen_count'] == 1
+
+    (connection,) = peer['connections']
+    assert connection['direction'] == 'out'
+    assert connection['outbound_pending_calls'] == 0
+    assert connection['oldest_outbound_pending_age'] is None
+    assert connection['bytes_read'] > 0
+    assert connection['bytes_written'] > 0
+
+    (peer,) = server.introspect()['peers']
+    (connection,) = peer['connections']
+    assert connection['direction'] == 'in'
+    assert connection['bytes_read'] == state['peers'][0]['connections'][0][
+        'bytes_written'
+    ]
+
+
+@pytest.mark.gen_test
+def test_introspect_pending_calls():
+    server = TChannel('server')
+    server.listen()
+    done = gen.Future()
+
+    @server.json.register
+    def slow(request):
+        return done
+
+    client = TChannel('client', known_peers=[server.hostport])
+    future = client.json('server', 'slow', {})
+    yield gen.sleep(0.05)
+
+    (connection,) = client.introspect()['peers'][0]['connections']
+    assert connection['outbound_pending_calls'] == 1
+    assert connection['oldest_outbound_pending_age'] > 0
+
+    done.set_result({})
+    yield future
+
+
+@pytest.mark.gen_test
+def test_introspect_endpoint():
+    server = TChannel('server')
+    server.listen()
+
+    client = TChannel('client', known_peers=[server.hostport])
+    resp = yield client.json('server', 'introspect')
+
+    assert resp.body['name'] == 'server'
+    assert resp.body['hostport'] == server.hostport
+    (peer,) = resp.body['peers']
+    assert peer['connections'][0]['direction'] == 'in'
@@ -0,0 +1,115 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+import threading
+import time
+
+import mock
+import pytest
+from tornado import gen
+
+from tchannel.loop_monitor import LoopMonitor
+from tchannel.metrics import MetricsRegistry
+from tchannel.sync import TChannel as SyncTChannel
+
+
+def block_for(seconds):
+    time.sleep(seconds)
+
+
+@pytest.mark.gen_test
+def test_lag():
+    monitor = LoopMonitor(interval=0.01, threshold=1)
+    monitor.start()
+    try:
+        yield gen.sleep(0.1)
+        assert monitor.lag.count >= 3
+        assert monitor.blocked.value == 0
+
+        block_for(0.05)
+        yield gen.sleep(0.02)
+        assert monitor.lag.max >= 30
+    finally:
+        monitor.stop()
+
+
+@pytest.mark.gen_test
+def test_blocked():
+    registry = MetricsRegistry()
+    monitor = LoopMonitor(registry, interval=0.01, threshold=0.05)
+    with mock.patch('tchannel.loop_monitor.log') as log:
+        monitor.start()
+        try:
+            yield gen.sleep(0.02)
+            block_for(0.3)
+            yield gen.sleep(0.02)
+        finally:
+            monitor.stop()
+
+    assert monitor.blocked.value == 1
+    assert log.warning.call_count == 1
+    message, blocked_for, stack = log.warning.call_args[0]
+    assert 'IOLoop blocked' in message
+    assert blocked_for >= 0.05
+    assert 'in block_for' in stack
+
+    names = [name for name, _, _ in registry.flush()]
+    assert 'tchannel.loop.lag' in names
+    assert 'tchannel.loop.blocked' in names
+
+
+@pytest.mark.gen_test
+def test_short_stall_between_lag_probes():
+    monitor = LoopMonitor(interval=10, threshold=0.05)
+    with mock.patch('tchannel.loop_monitor.log') as log:
+        monitor.start()
+        try:
+            yield gen.sleep(0.02)
+            block_for(0.1)
+            yield gen.sleep(0.02)
+        finally:
+            monitor.stop()
+
+    assert monitor.blocked.value == 1
+    assert 'in block_for' in log.warning.call_args[0][2]
+
+
+@pytest.mark.gen_test
+def test_start_stop_idempotent():
+    monitor = LoopMonitor(interval=0.01)
+    monitor.start()
+    monitor.start()
+    monitor.stop()
+    monitor.stop()
+    assert monitor._watchdog is None
+
+
+def test_sync_client():
+    client = SyncTChannel('test-client')
+    monitor = LoopMonitor(interval=0.01, threshold=1)
+    client.monitor_loop(monitor).result(timeout=1)
+    try:
+        time.sleep(0.1)
+        assert monitor.lag.count > 0
+        assert monitor._thread_id != threading.current_thread().ident
+    finally:
+        client._threadloop.submit(monitor.stop).result(timeout=1)
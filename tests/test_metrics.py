@@ -0,0 +1,290 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+import logging
+import sys
+import threading
+
+import mock
+import pytest
+
+from tchannel import TChannel
+from tchannel.errors import BadRequestError
+from tchannel.metrics import Counter
+from tchannel.metrics import Histogram
+from tchannel.metrics import LogSink
+from tchannel.metrics import MetricsRegistry
+from tchannel.metrics import MetricsReporter
+from tchannel.metrics import PrometheusSink
+from tchannel.metrics import StatsdSink
+
+TAGS = (('service', 'foo'), ('endpoint', 'bar'))
+
+
+def test_histogram_percentiles():
+    h = Histogram()
+    for v in range(1, 10001):
+        h.record(v)
+
+    assert h.count == 10000
+    assert h.max == 10000
+    for q in (0.5, 0.9, 0.99):
+        assert abs(h.percentile(q) - q * 10000) <= q * 10000 * 0.0625
+    assert h.percentile(1) == 10000
+
+
+def test_histogram_small_values_are_exact():
+    h = Histogram()
+    for v in (0, 1, 2, 3):
+        h.record(v)
+
+    assert h.percentile(0.5) == 1
+    assert h.percentile(1) == 3
+
+
+def test_histogram_resolution():
+    h = Histogram(resolution=0.001)
+    h.record(1.5)
+    h.record(250.0)
+
+    assert abs(h.percentile(0.5) - 1.5) <= 1.5 * 0.0625
+    assert h.percentile(1) == 250.0
+
+
+def test_histogram_merge():
+    a, b = Histogram(), Histogram()
+    for v in range(1, 5001):
+        a.record(v)
+    for v in range(5001, 10001):
+        b.record(v)
+
+    a.merge(b)
+    assert a.count == 10000
+    assert a.sum == sum(range(1, 10001))
+    assert a.max == 10000
+    assert abs(a.percentile(0.9) - 9000) <= 9000 * 0.0625
+
+
+def test_registry_caches_metrics():
+    registry = MetricsRegistry()
+    assert registry.counter('calls', TAGS) is registry.counter('calls', TAGS)
+    assert registry.histogram('latency') is registry.histogram('latency')
+
+
+def test_registry_flush():
+    registry = MetricsRegistry()
+    counter = registry.counter('calls', TAGS)
+    counter.inc()
+    counter.inc(2)
+    registry.histogram('latency').record(5)
+    registry.counter('unused')
+
+    snapshot = dict(
+        ((name, tags), metric) for name, tags, metric in registry.flush()
+    )
+    assert sorted(snapshot) == [('calls', TAGS), ('latency', ())]
+    assert snapshot[('calls', TAGS)].value == 3
+    assert snapshot[('latency', ())].count == 1
+
+    assert counter.value == 0
+    assert registry.flush() == []
+
+
+def test_record_call():
+    registry = MetricsRegistry()
+    for latency in (1, 2):
+        registry.record_call(
+            'outbound', 'caller', 'foo', 'bar', 'peer', True, latency, 10, 20
+        )
+    registry.record_call('outbound', 'caller', 'foo', 'bar', 'peer', False, 3)
+    registry.record_error(
+        'outbound', 'caller', 'foo', 'bar', 'peer', 'timeout'
+    )
+
+    snapshot = dict(
+        (name, (tags, metric)) for name, tags, metric in registry.flush()
+    )
+    tags = (
+        ('caller', 'caller'),
+        ('service', 'foo'),
+        ('endpoint', 'bar'),
+        ('peer', 'peer'),
+    )
+    assert snapshot['tchannel.outbound.calls.success'] == (
+        tags, mock.ANY
+    )
+    assert snapshot['tchannel.outbound.calls.success'][1].value == 2
+    assert snapshot['tchannel.outbound.calls.app-errors'][1].value == 1
+    assert snapshot['tchannel.outbound.calls.latency'][1].count == 3
+    assert snapshot['tchannel.outbound.calls.request-bytes'][1].count == 2
+    assert snapshot['tchannel.outbound.calls.response-bytes'][1].sum == 40
+
+    errors_tags, errors = snapshot['tchannel.outbound.calls.system-errors']
+    assert errors_tags == tags + (('type', 'timeout'),)
+    assert errors.value == 1
+
+
+def test_record_call_from_threads():
+    registry = MetricsRegistry()
+    interval = sys.getcheckinterval()
+    sys.setcheckinterval(1)  # switch threads as often as possible
+
+    def record():
+        for _ in range(2000):
+            registry.record_call(
+                'outbound', 'caller', 'foo', 'bar', 'peer', True, 1
+            )
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    try:
+        for thread in threads:
+            thread.start()
+        snapshots = []
+        while any(thread.is_alive() for thread in threads):
+            snapshots.extend(registry.flush())
+        for thread in threads:
+            thread.join()
+        snapshots.extend(registry.flush())
+    finally:
+        sys.setcheckinterval(interval)
+
+    totals = {}
+    for name, _, metric in snapshots:
+        if name.endswith('success'):
+            totals[name] = totals.get(name, 0) + metric.value
+        else:
+            totals[name] = totals.get(name, 0) + metric.count
+    assert totals == {
+        'tchannel.outbound.calls.success': 8000,
+        'tchannel.outbound.calls.latency': 8000,
+    }
+
+
+def test_reporter_flushes_to_sinks():
+    registry = MetricsRegistry()
+    sink = mock.Mock()
+    broken_sink = mock.Mock()
+    broken_sink.report.side_effect = Exception('great sadness')
+    reporter = MetricsReporter(registry, [broken_sink, sink])
+
+    reporter.flush()
+    assert not sink.report.called
+
+    registry.counter('calls').inc()
+    reporter.flush()
+    sink.report.assert_called_once_with([('calls', (), mock.ANY)])
+
+
+def test_statsd_sink():
+    statsd = mock.Mock()
+    h = Histogram()
+    h.record(7)
+
+    StatsdSink(statsd).report([
+        ('calls', (('service', 'a.b'), ('peer', None)), Counter(3)),
+        ('latency', (), h),
+    ])
+
+    statsd.count.assert_any_call('calls.a-b.no-peer', 3)
+    statsd.count.assert_any_call('latency.count', 1)
+    statsd.gauge.assert_any_call('latency.p50', 7)
+    statsd.gauge.assert_any_call('latency.p999', 7)
+    statsd.gauge.assert_any_call('latency.max', 7)
+
+
+def test_log_sink():
+    logger = mock.Mock()
+    LogSink(logger).report([('calls', TAGS, Counter(3))])
+    logger.log.assert_called_once_with(
+        logging.INFO, '%s{%s} %s', 'calls', 'service=foo,endpoint=bar', 3
+    )
+
+
+def test_prometheus_sink():
+    sink = PrometheusSink()
+    h = Histogram()
+    h.record(7)
+
+    sink.report([('tchannel.calls', TAGS, Counter(3)), ('latency', (), h)])
+    sink.report([('tchannel.calls', TAGS, Counter(2))])
+
+    assert sink.render().splitlines() == [
+        '# TYPE tchannel_calls counter',
+        'tchannel_calls{service="foo",endpoint="bar"} 5',
+        '# TYPE latency summary',
+        'latency{quantile="0.5"} 7',
+        'latency{quantile="0.9"} 7',
+        'latency{quantile="0.99"} 7',
+        'latency{quantile="0.999"} 7',
+        'latency_sum 7',
+        'latency_count 1',
+    ]
+
+
+@pytest.mark.gen_test
+def test_calls_are_recorded():
+    server_metrics = MetricsRegistry()
+    server = TChannel('server', metrics=server_metrics)
+    server.listen()
+
+    @server.json.register
+    def echo(request):
+        return request.body
+
+    @server.json.register
+    def fail(request):
+        raise BadRequestError('great sadness')
+
+    client_metrics = MetricsRegistry()
+    client = TChannel(
+        'client', known_peers=[server.hostport], metrics=client_metrics
+    )
+
+    yield client.json('server', 'echo', {'hello': 'world'})
+    with pytest.raises(BadRequestError):
+        yield client.json('server', 'fail', {})
+
+    for direction, registry in (
+        ('outbound', client_metrics), ('inbound', server_metrics)
+    ):
+        snapshot = dict(
+            ((name, dict(tags)['endpoint']), (dict(tags), metric))
+            for name, tags, metric in registry.flush()
+        )
+        prefix = 'tchannel.%s.calls.' % direction
+
+        tags, success = snapshot[(prefix + 'success', 'echo')]
+        assert success.value == 1
+        assert tags['caller'] == 'client'
+        assert tags['service'] == 'server'
+        assert tags['peer']
+
+        _, request_bytes = snapshot[(prefix + 'request-bytes', 'echo')]
+        assert request_bytes.sum == len('{}{"hello": "world"}')
+        _, response_bytes = snapshot[(prefix + 'response-bytes', 'echo')]
+        assert response_bytes.sum == len('{}{"hello": "world"}')
+        _, latency = snapshot[(prefix + 'latency', 'echo')]
+        assert latency.count == 1
+
+        tags, errors = snapshot[(prefix + 'system-errors', 'fail')]
+        assert errors.value == 1
+        assert tags['type'] == 'bad request'
@@ -0,0 +1,203 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+import threading
+
+import pytest
+from tornado import gen
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+
+from tchannel import Request
+from tchannel import TChannel
+from tchannel import thrift
+from tchannel.offload import Offloader
+from tchannel.serializer.json import JsonSerializer
+
+BIG = {'document': 'x' * 4096}
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """Counts the bodies serialized on it."""
+
+    def __init__(self):
+        super(RecordingExecutor, self).__init__(1)
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        return super(RecordingExecutor, self).submit(fn, *args, **kwargs)
+
+
+@pytest.mark.gen_test
+def test_small_bodies_are_serialized_inline():
+    executor = RecordingExecutor()
+    offloader = Offloader(executor, threshold=100)
+    serializer = JsonSerializer()
+
+    body = yield offloader.serialize_body('foo', serializer, {'a': 1})
+    assert body == '{"a": 1}'
+    assert (yield offloader.deserialize_body(serializer, body)) == {'a': 1}
+    assert executor.submitted == 0
+
+
+@pytest.mark.gen_test
+def test_large_bodies_are_offloaded():
+    executor = RecordingExecutor()
+    offloader = Offloader(executor, threshold=100)
+    serializer = JsonSerializer()
+
+    # The first body of an endpoint is serialized inline: its size is only
+    # known afterwards.
+    body = yield offloader.serialize_body('foo', serializer, BIG)
+    assert executor.submitted == 0
+
+    assert (yield offloader.serialize_body('foo', serializer, BIG)) == body
+    assert executor.submitted == 1
+    yield offloader.serialize_body('bar', serializer, BIG)
+    assert executor.submitted == 1
+
+    assert (yield offloader.deserialize_body(serializer, body)) == BIG
+    assert executor.submitted == 2
+
+
+@pytest.mark.gen_test
+def test_process_pool():
+    offloader = Offloader(ProcessPoolExecutor(1), threshold=0)
+    serializer = JsonSerializer()
+
+    yield offloader.serialize_body('foo', serializer, BIG)
+    body = yield offloader.serialize_body('foo', serializer, BIG)
+    assert (yield offloader.deserialize_body(serializer, body)) == BIG
+    offloader.executor.shutdown()
+
+
+@pytest.mark.gen_test
+def test_json_round_trip():
+    server_executor = RecordingExecutor()
+    server = TChannel(
+        'server', offload=Offloader(server_executor, threshold=1024)
+    )
+    server.listen()
+    loop_thread = threading.current_thread()
+
+    @server.json.register
+    @gen.coroutine
+    def echo(request):
+        assert threading.current_thread() is loop_thread
+        body = yield request.read_body()
+        raise gen.Return(body)
+
+    client_executor = RecordingExecutor()
+    client = TChannel(
+        'client', offload=Offloader(client_executor, threshold=1024)
+    )
+    for _ in range(2):
+        res = yield client.json(
+            'server', 'echo', BIG, hostport=server.hostport
+        )
+        assert res.body == BIG
+
+    # Request and response bodies are decoded on the executor every time,
+    # and encoded there once one was seen to be large.
+    assert client_executor.submitted == 3
+    assert server_executor.submitted == 3
+
+
+@pytest.mark.gen_test
+def test_thrift_round_trip():
+    service = thrift.load(
+        path='tests/data/idls/ThriftTest.thrift',
+        service='server',
+    )
+    server_executor = RecordingExecutor()
+    server = TChannel(
+        'server', offload=Offloader(server_executor, threshold=1024)
+    )
+
+    @server.thrift.register(service.ThriftTest)
+    @gen.coroutine
+    def testString(request):
+        body = yield request.read_body()
+        raise gen.Return(body.thing)
+
+    server.listen()
+
+    client_executor = RecordingExecutor()
+    client = TChannel(
+        'client', offload=Offloader(client_executor, threshold=1024)
+    )
+    for _ in range(2):
+        res = yield client.thrift(
+            service.ThriftTest.testString('x' * 4096),
+            hostport=server.hostport,
+        )
+        assert res.body == 'x' * 4096
+
+    assert client_executor.submitted == 3
+    assert server_executor.submitted == 3
+
+
+@pytest.mark.gen_test
+def test_request_bodies_are_decoded_when_read():
+    executor = RecordingExecutor()
+    server = TChannel('server', offload=Offloader(executor, threshold=1024))
+    server.listen()
+
+    @server.json.register
+    def ignore(request):
+        return {}
+
+    @server.json.register
+    def inline(request):
+        return {'size': len(request.body['document'])}
+
+    client = TChannel('client')
+    for endpoint in ('ignore', 'inline'):
+        yield client.json('server', endpoint, BIG, hostport=server.hostport)
+
+    # Only the handler's own reads decode the body, and ``body`` decodes it
+    # on the IOLoop.
+    assert executor.submitted == 0
+
+
+@pytest.mark.gen_test
+def test_read_body():
+    executor = RecordingExecutor()
+    serializer = JsonSerializer()
+    raw_body = serializer.serialize_body(BIG)
+
+    request = Request(
+        raw_body=raw_body,
+        serializer=serializer,
+        offloader=Offloader(executor, threshold=1024),
+    )
+    assert (yield request.read_body()) == BIG
+    assert request.body == BIG
+    assert (yield request.read_body()) == BIG
+    assert executor.submitted == 1
+
+    request = Request(raw_body=raw_body, serializer=serializer)
+    assert (yield request.read_body()) == BIG
+
+    request = Request(body={'a': 1})
+    assert (yield request.read_body()) == {'a': 1}
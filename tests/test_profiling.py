@@ -0,0 +1,127 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+import time
+
+import pytest
+
+from tchannel import TChannel
+from tchannel import thrift
+from tchannel.metrics import MetricsRegistry
+from tchannel.profiling import Profiler
+
+service = thrift.load(
+    'tests/data/idls/ThriftTest.thrift', service='server',
+)
+
+
+def test_record():
+    profiler = Profiler()
+    profiler.record('serialize', time.time() - 0.01)
+
+    summary = profiler.summary()
+    assert summary.keys() == ['serialize']
+    assert summary['serialize']['count'] == 1
+    assert 9 <= summary['serialize']['max'] <= 100
+    assert set(summary['serialize']) == {
+        'count', 'max', 'p50', 'p90', 'p99', 'p999',
+    }
+
+
+def test_shared_registry():
+    registry = MetricsRegistry()
+    profiler = Profiler(registry)
+    profiler.record('handler', time.time())
+
+    [(name, tags, histogram)] = registry.flush()
+    assert name == 'tchannel.profile.handler'
+    assert tags == ()
+    assert histogram.count == 1
+
+    # flushing the registry resets the profile
+    assert profiler.summary() == {}
+    profiler.record('handler', time.time())
+    assert profiler.summary()['handler']['count'] == 1
+
+
+@pytest.mark.gen_test
+def test_stages():
+    server_profiler = Profiler()
+    server = TChannel('server', profiler=server_profiler)
+
+    @server.thrift.register(service.ThriftTest)
+    def testString(request):
+        return request.body.thing
+
+    @server.json.register
+    def echo(request):
+        return request.body
+
+    server.listen()
+
+    client_profiler = Profiler()
+    client = TChannel('client', profiler=client_profiler)
+    assert client.profiler is client_profiler
+
+    response = yield client.thrift(
+        service.ThriftTest.testString('hi'), hostport=server.hostport,
+    )
+    assert response.body == 'hi'
+
+    response = yield client.json(
+        'server', 'echo', {'hi': 'there'}, hostport=server.hostport,
+    )
+    assert response.body == {'hi': 'there'}
+
+    client_stages = client_profiler.summary()
+    assert set(client_stages) == {
+        'serialize', 'deserialize', 'send', 'write.queue', 'write', 'read',
+        'build',
+    }
+    assert client_stages['serialize']['count'] == 2
+    assert client_stages['send']['count'] == 2
+
+    server_stages = server_profiler.summary()
+    assert {'write.queue', 'write', 'read', 'build', 'handler'} <= set(
+        server_stages
+    )
+    assert server_stages['handler']['count'] == 2
+    assert 'send' not in server_stages
+
+
+@pytest.mark.gen_test
+def test_disabled():
+    server = TChannel('server')
+
+    @server.json.register
+    def echo(request):
+        return request.body
+
+    server.listen()
+
+    client = TChannel('client')
+    assert client.profiler is None
+
+    response = yield client.json(
+        'server', 'echo', {'hi': 'there'}, hostport=server.hostport,
+    )
+    assert response.body == {'hi': 'there'}
@@ -72,6 +72,26 @@ def test_put_then_get_nowait(items):
     assert 42 == (yield future)
 
 
+@pytest.mark.gen_test
+def test_qsize(items):
+    queue = Queue()
+    assert queue.qsize() == 0
+
+    for item in items:
+        yield queue.put(item)
+    assert queue.qsize() == len(items)
+
+    queue.get_nowait()
+    yield queue.get()
+    assert queue.qsize() == len(items) - 2
+
+    empty = Queue()
+    future = empty.get()
+    yield empty.put(42)
+    yield future
+    assert empty.qsize() == 0
+
+
 @pytest.mark.gen_test
 def test_get_then_put(items):
     queue = Queue()
@@ -20,16 +20,25 @@
 
 from __future__ import absolute_import
 
+import sys
+import threading
+
+import mock
 import pytest
 from mock import MagicMock
 
+from tchannel import TChannel
 from tchannel.errors import TChannelError
 from tchannel.errors import TimeoutError
 from tchannel.messages import ErrorCode
 from tchannel.statsd import StatsdHook
+from tchannel.statsd import _LRUCache
+from tchannel.statsd import clean
 from tchannel.tornado import Request
 from tchannel.tornado import Response
 from tchannel.tornado.response import StatusCode
+from tornado import gen
+from tornado.ioloop import IOLoop
 
 
 @pytest.fixture
@@ -103,3 +112,105 @@ def test_on_operational_error_per_attempt(statsd_hook, request):
         "tchannel.outbound.calls.per-attempt.operational-errors.no-service." +
         "test.endpoint1.timeout", 1
     )
+
+
+def test_prefixes_are_cached(statsd_hook, request):
+    with mock.patch('tchannel.statsd.clean', wraps=clean) as mock_clean:
+        statsd_hook.before_send_request(request)
+        statsd_hook.after_receive_response(
+            request, Response(code=StatusCode.ok)
+        )
+
+    assert mock_clean.call_count == 3
+    statsd_hook._statsd.count.assert_called_with(
+        "tchannel.outbound.calls.success.no-service.test.endpoint1", 1
+    )
+
+
+def test_prefix_cache_is_bounded():
+    cache = _LRUCache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.get('a') == 1
+
+    cache['c'] = 3
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_counts_are_aggregated(request):
+    statsd = MagicMock()
+    statsd_hook = StatsdHook(statsd, flush_interval=60)
+
+    for _ in range(3):
+        statsd_hook.before_send_request(request)
+    statsd_hook.on_operational_error(request, TimeoutError())
+    assert not statsd.count.called
+
+    statsd_hook.flush()
+    assert sorted(statsd.count.call_args_list) == [
+        mock.call(
+            "tchannel.outbound.calls.operational-errors.no-service." +
+            "test.endpoint1.timeout", 1
+        ),
+        mock.call("tchannel.outbound.calls.sent.no-service.test.endpoint1", 3),
+    ]
+
+    statsd.reset_mock()
+    statsd_hook.flush()
+    assert not statsd.count.called
+    statsd_hook.on_close()
+
+
+def test_counts_from_threads(request):
+    statsd = MagicMock()
+    statsd_hook = StatsdHook(statsd, flush_interval=60)
+    interval = sys.getcheckinterval()
+    sys.setcheckinterval(1)  # switch threads as often as possible
+
+    def count():
+        for _ in range(2000):
+            statsd_hook.before_send_request(request)
+
+    threads = [threading.Thread(target=count) for _ in range(4)]
+    try:
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            statsd_hook.flush()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setcheckinterval(interval)
+    statsd_hook.on_close()
+
+    assert sum(c[0][1] for c in statsd.count.call_args_list) == 8000
+
+
+def test_close_flushes_counts(request):
+    # The request fixture shadows pytest's, which gen_test needs.
+    io_loop = IOLoop()
+    io_loop.make_current()
+    statsd = MagicMock()
+    statsd_hook = StatsdHook(statsd, flush_interval=60)
+    tchannel = TChannel('test')
+    tchannel.hooks.register(statsd_hook)
+
+    statsd_hook.before_send_request(request)
+    callback = statsd_hook._flush_callback
+    assert callback.is_running()
+    assert not statsd.count.called
+
+    tchannel.close()
+    statsd.count.assert_called_once_with(
+        "tchannel.outbound.calls.sent.no-service.test.endpoint1", 1
+    )
+    io_loop.run_sync(lambda: gen.moment)
+    assert not callback.is_running()
+
+    # Without a timer, later counts are sent right away.
+    statsd_hook.before_send_request(request)
+    assert statsd.count.call_count == 2
+    io_loop.clear_current()
+    io_loop.close()
@@ -95,3 +95,29 @@ def test_error_during_stream(io_loop):
 
     with pytest.raises(ZeroDivisionError):
         yield stream.write("a")
+
+
+@pytest.mark.gen_test
+def test_InMemStream_max_buffered():
+    stream = InMemStream()
+    stream.set_max_buffered(2)
+
+    assert stream.write("1").done()
+    written = stream.write("2")
+    assert not written.done()
+    assert stream.writable() is written
+
+    buf = yield stream.read()
+    assert buf == "12"
+    assert written.done()
+
+    assert stream.write("3").done()
+    assert not stream.write("4").done()
+    stream.set_max_buffered(None)
+    assert stream.writable().done()
+
+    stream.set_max_buffered(1)
+    written = stream.write("5")
+    assert not written.done()
+    stream.close()
+    assert written.done()
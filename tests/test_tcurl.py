@@ -20,8 +20,12 @@
 
 from __future__ import absolute_import
 
+import json
+from datetime import timedelta
+
 import mock
 import tornado.gen
+import tornado.locks
 import pytest
 
 from tchannel import TChannel, thrift
@@ -249,3 +253,140 @@ def test_catch_errors_verbose(capsys):
     out, err = capsys.readouterr()
 
     assert 'Traceback' in err
+
+
+@pytest.mark.parametrize('input, message', [
+    (
+        ['-s', 'larry', '--body', '{}', '--body-file', 'foo.jsonl'],
+        'No such file or directory',
+    ),
+    (
+        [
+            '-s', 'larry', '--body', '{}',
+            '--body-file', 'tests/data/idls/ThriftTest.thrift',
+        ],
+        "can't use --body-file and --body together",
+    ),
+    (
+        ['-s', 'larry', '--requests', '0'],
+        '--requests must be at least 1',
+    ),
+    (
+        ['-s', 'larry', '--requests', '2', '--concurrency', '0'],
+        '--concurrency must be at least 1',
+    ),
+])
+def test_parse_invalid_batch_args(input, message, capsys):
+    with pytest.raises(SystemExit):
+        parse_args(input)
+
+    out, err = capsys.readouterr()
+    assert message in err
+
+
+@pytest.mark.gen_test
+def test_tcurl_batch_requests(capsys):
+    server = TChannel(name='server')
+    in_flight = [0]
+    max_in_flight = [0]
+    full = tornado.locks.Event()
+
+    @server.json.register
+    @tornado.gen.coroutine
+    def test(request):
+        in_flight[0] += 1
+        max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+        if in_flight[0] == 3:
+            full.set()
+        try:
+            # Hold requests until all three callers have one in flight.
+            yield full.wait(timeout=timedelta(seconds=0.5))
+        finally:
+            in_flight[0] -= 1
+        raise tornado.gen.Return(request.body)
+
+    server.listen()
+
+    result = yield main([
+        '-s', 'server',
+        '--host', server.hostport,
+        '--body', '{"thing": "foo"}',
+        '--endpoint', 'test',
+        '--requests', '6',
+        '--concurrency', '3',
+    ])
+
+    assert result['calls'] == 6
+    assert result['successes'] == 6
+    assert max_in_flight[0] == 3
+
+    out, err = capsys.readouterr()
+    lines = [json.loads(line) for line in out.splitlines()]
+    assert sorted(line['request'] for line in lines) == range(6)
+    assert all(line['body'] == {'thing': 'foo'} for line in lines)
+    assert 'latency (ms):' in err
+
+
+@pytest.mark.gen_test
+def test_tcurl_batch_body_file(tmpdir, capsys):
+    server = TChannel(name='server')
+
+    @server.json.register
+    def test(request):
+        return request.body['n'] * 2
+
+    server.listen()
+
+    path = tmpdir.join('bodies.jsonl')
+    path.write('{"n": 1}\n\n{"n": 2}\n{"n": 3}\n')
+
+    result = yield main([
+        '-s', 'server',
+        '--host', server.hostport,
+        '--endpoint', 'test',
+        '--body-file', str(path),
+        '--requests', '2',
+    ])
+
+    assert result['calls'] == 2
+
+    out, err = capsys.readouterr()
+    lines = [json.loads(line) for line in out.splitlines()]
+    assert [(line['request'], line['body']) for line in lines] == [
+        (0, 2), (1, 4),
+    ]
+
+
+@pytest.mark.gen_test
+def test_tcurl_batch_errors(tmpdir, capsys):
+    server = TChannel(name='server')
+
+    @server.raw.register
+    def test(request):
+        if request.body == 'fail':
+            raise Exception('great sadness')
+        return request.body
+
+    server.listen()
+
+    path = tmpdir.join('bodies')
+    path.write('hello\nfail\n')
+
+    with mock.patch('sys.exit') as exit:
+        result = yield main([
+            '-s', 'server',
+            '--host', server.hostport,
+            '--endpoint', 'test',
+            '--body-file', str(path),
+            '--raw',
+        ])
+
+    exit.assert_called_once_with(1)
+    assert result['calls'] == 2
+    assert result['successes'] == 1
+
+    out, err = capsys.readouterr()
+    lines = [json.loads(line) for line in out.splitlines()]
+    assert lines[0]['body'] == 'hello'
+    assert 'UnexpectedError' in lines[1]['error']
+    assert 'errors:' in err
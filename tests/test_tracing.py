@@ -538,3 +538,86 @@ def test_tracing_field_in_error_message():
     assert hook.error_trace
     assert hook.request_trace
     assert hook.error_trace == hook.request_trace
+
+
+def test_unsampled_client_span_skips_headers(tracer):
+    tchannel = TChannel('client', tracer=tracer, trace=True)
+    client_tracer = tracing.ClientTracer(channel=tchannel)
+
+    span, headers = client_tracer.start_span(
+        service='svc', endpoint='foo', headers={'key': 'value'}, trace=False,
+    )
+    assert isinstance(span, tracing.UnsampledSpan)
+    assert headers == {'key': 'value'}
+    assert tracing.span_to_tracing_field(span) == span.tracing
+    assert span.tracing.traceflags == 0
+
+    root = tracer.start_span('root')
+    root.set_tag('sampling.priority', 0)
+    with tchannel.context_provider.span_in_context(root):
+        span, headers = client_tracer.start_span(
+            service='svc', endpoint='foo',
+        )
+    assert isinstance(span, tracing.UnsampledSpan)
+    assert headers == {}
+    assert span.tracing.trace_id == root.trace_id
+    assert span.tracing.parent_id == root.span_id
+    assert span.tracing.span_id != root.span_id
+
+    # baggage has to be propagated even if the trace is not sampled
+    root.set_baggage_item(BAGGAGE_KEY, 'value')
+    with tchannel.context_provider.span_in_context(root):
+        span, headers = client_tracer.start_span(
+            service='svc', endpoint='foo',
+        )
+    assert not isinstance(span, tracing.UnsampledSpan)
+    assert not span.is_sampled()
+    assert any(k.startswith(tracing.TRACING_KEY_PREFIX) for k in headers)
+
+
+def test_root_span_not_sampled_by_tracer_skips_headers():
+    tracer = Tracer(
+        service_name='test-tracer',
+        sampler=ConstSampler(False),
+        reporter=InMemoryReporter(),
+    )
+    try:
+        tchannel = TChannel('client', tracer=tracer, trace=True)
+        client_tracer = tracing.ClientTracer(channel=tchannel)
+
+        span, headers = client_tracer.start_span(
+            service='svc', endpoint='foo', headers={'key': 'value'},
+            hostport='127.0.0.1:4040', encoding='json',
+        )
+        assert not span.is_sampled()
+        assert not span.tags
+        assert headers == {'key': 'value'}
+
+        field = tracing.span_to_tracing_field(span)
+        assert field.trace_id == span.trace_id
+        assert field.span_id == span.span_id
+        assert field.traceflags == 0
+    finally:
+        tracer.close()
+
+
+@pytest.mark.gen_test
+def test_unsampled_trace_propagation(tracer):
+    server = TChannel('server', tracer=tracer)
+    server.listen()
+
+    @server.json.register('foo')
+    def handler(_):
+        span = server.context_provider.get_current_span()
+        return {'trace_id': span.trace_id, 'sampled': span.is_sampled()}
+
+    client = TChannel('client', tracer=tracer, trace=False)
+    root = tracer.start_span('root')
+    root.set_tag('sampling.priority', 0)
+    with root:
+        with client.context_provider.span_in_context(root):
+            future = client.json('server', 'foo', {}, hostport=server.hostport)
+        res = yield future
+
+    assert res.body == {'trace_id': root.trace_id, 'sampled': False}
+    assert not [s for s in tracer.reporter.get_spans() if s.is_sampled()]
@@ -443,3 +443,116 @@ def test_old_recording_without_tracing(mock_server, tracer):
             body='world',
         )
         assert 'world' == response.body
+
+
+@pytest.mark.gen_test
+@pytest.mark.parametrize('record_in_process, replay_in_process', [
+    (True, True),
+    (True, False),
+    (False, True),
+])
+def test_in_process(
+    tmpdir, mock_server, call, get_body, record_in_process, replay_in_process
+):
+    path = tmpdir.join('data.yaml')
+
+    mock_server.expect_call('hello').and_write('world').once()
+
+    with vcr.use_cassette(str(path), in_process=record_in_process) as cass:
+        response = yield call('hello', 'world', service='hello_service')
+        assert 'world' == (yield get_body(response))
+
+    assert cass.play_count == 0
+    assert path.check(file=True)
+
+    with vcr.use_cassette(str(path), in_process=replay_in_process) as cass:
+        response = yield call('hello', 'world', service='hello_service')
+        assert 'world' == (yield get_body(response))
+
+    assert cass.play_count == 1
+
+
+@pytest.mark.gen_test
+def test_in_process_thrift(
+    tmpdir, mock_server, thrift_service, thrift_client
+):
+    path = tmpdir.join('data.yaml')
+    expected_item = thrift_service.Item(
+        'foo', thrift_service.Value(stringValue='bar')
+    )
+    mock_server.expect_call(thrift_service, method='getItem').and_result(
+        expected_item
+    ).once()
+    mock_server.expect_call(thrift_service, method='getItem').and_raise(
+        thrift_service.ItemDoesNotExist('bar')
+    ).once()
+
+    for _ in range(2):
+        with vcr.use_cassette(str(path), in_process=True):
+            item = yield thrift_client.getItem('foo')
+            assert item == expected_item
+
+            with pytest.raises(thrift_service.ItemDoesNotExist):
+                yield thrift_client.getItem('bar')
+
+
+@pytest.mark.gen_test
+def test_in_process_protocol_exception(tmpdir, mock_server, call):
+    path = tmpdir.join('data.yaml')
+
+    mock_server.expect_call('hello').and_raise(
+        Exception('great sadness')
+    ).once()
+
+    with pytest.raises(UnexpectedError):
+        with vcr.use_cassette(str(path), in_process=True):
+            yield call('hello', 'world', service='hello_service')
+
+    assert not path.check()
+
+
+@pytest.mark.gen_test
+def test_in_process_ttl_timeout(tmpdir, mock_server, call):
+    path = tmpdir.join('data.yaml')
+
+    mock_server.expect_call('hello').and_write('world', delay=0.1).once()
+
+    with pytest.raises(TimeoutError):
+        with vcr.use_cassette(str(path), in_process=True):
+            yield call('hello', 'world', service='hello_service', ttl=0.05)
+
+    assert not path.check()
+
+
+@pytest.mark.gen_test
+def test_in_process_cannot_record(tmpdir, mock_server, call):
+    path = tmpdir.join('data.yaml')
+
+    with pytest.raises(vcr.proxy.CannotRecordInteractionsError):
+        with vcr.use_cassette(
+            str(path), record_mode=vcr.RecordMode.NONE, in_process=True
+        ):
+            yield call('hello', 'world', service='hello_service')
+
+
+@pytest.mark.gen_test
+def test_in_process_old_recording_with_tracing(mock_server, tracer):
+    from tchannel import TChannel
+
+    path = os.path.join(
+        os.path.dirname(__file__), 'data', 'old_with_tracing.yaml'
+    )
+    ch = TChannel('client', trace=True, tracer=tracer)
+
+    with vcr.use_cassette(
+        path, record_mode=vcr.RecordMode.NONE, in_process=True
+    ) as cass:
+        response = yield ch.json(
+            hostport=mock_server.hostport,
+            service='hello_service',
+            endpoint='hello',
+            body='world',
+        )
+        assert 'world' == response.body
+
+    assert cass.play_count == 1
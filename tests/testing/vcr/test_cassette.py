@@ -20,10 +20,16 @@
 
 from __future__ import absolute_import
 
+import json
+
 import pytest
+from hypothesis import given
 from mock import Mock
 
+from tchannel.testing.vcr import proxy
 from tchannel.testing.vcr.cassette import Cassette
+from tchannel.serializer.thrift import ThriftSerializer
+from tchannel.testing.vcr.cassette import headers_key
 from tchannel.testing.vcr.exceptions import (
     VCRError,
     RequestNotFoundError,
@@ -229,3 +235,94 @@ def test_interactions_cache(path):
         assert not mock_serializer.load.called
         assert len(Cassette._cache) == 1
         assert len(cass._available) == 1
+
+
+@given(requests)
+def test_headers_key_is_hashable(request):
+    assert hash(headers_key(request)) == hash(headers_key(request))
+
+
+def _headers_key(scheme, headers):
+    request = requests.example()
+    request.argScheme = scheme
+    request.headers = headers
+    return headers_key(request)
+
+
+@pytest.mark.parametrize('left, right, match', [
+    ({'a': '1', 'b': '2'}, {'b': '2', 'a': '1'}, True),
+    ({'a': '1', '$tracing$id': '1'}, {'a': '1', '$tracing$id': '2'}, True),
+    ({'a': 1}, {'a': 1.0}, True),
+    ({'a': [1, {'b': 2}]}, {'a': [1, {'b': 2}]}, True),
+    ({'a': '1'}, {'a': '2'}, False),
+    ({'a': [1, 2]}, {'a': [2, 1]}, False),
+    ([['a', 1]], {'a': 1}, False),
+])
+def test_json_headers_key(left, right, match):
+    scheme = proxy.ArgScheme.JSON
+    assert (
+        _headers_key(scheme, json.dumps(left)) ==
+        _headers_key(scheme, json.dumps(right))
+    ) is match
+
+
+def test_json_headers_key_invalid_json():
+    scheme = proxy.ArgScheme.JSON
+    assert _headers_key(scheme, '{') == _headers_key(scheme, '{')
+    assert _headers_key(scheme, '{') != _headers_key(scheme, '[')
+
+
+def test_thrift_headers_key():
+    serializer = ThriftSerializer(None)
+    scheme = proxy.ArgScheme.THRIFT
+    key = _headers_key(scheme, serializer.serialize_header(
+        {'a': '1', '$tracing$id': '1'}
+    ))
+
+    assert key == _headers_key(scheme, serializer.serialize_header(
+        {'a': '1', '$tracing$id': '2'}
+    ))
+    assert key != _headers_key(scheme, serializer.serialize_header(
+        {'a': '2'}
+    ))
+
+
+def test_headers_key_without_parser():
+    scheme = proxy.ArgScheme.RAW
+    assert _headers_key(scheme, 'a') == _headers_key(scheme, 'a')
+    assert _headers_key(scheme, 'a') != _headers_key(scheme, 'b')
+    assert (
+        _headers_key(scheme, '{}') !=
+        _headers_key(proxy.ArgScheme.JSON, '{}')
+    )
+
+
+def test_replay_ignores_tracing_headers(path):
+    request = requests.example()
+    request.argScheme = proxy.ArgScheme.JSON
+    request.headers = json.dumps({'foo': 'bar', '$tracing$id': '1'})
+    response = responses.example()
+
+    with Cassette(str(path)) as cass:
+        cass.record(request, response)
+
+    request.headers = json.dumps({'$tracing$id': '2', 'foo': 'bar'})
+    with Cassette(str(path)) as cass:
+        assert cass.replay(request) == response
+
+
+def test_replay_many_in_order(path):
+    interactions = []
+    with Cassette(str(path)) as cass:
+        for i in range(50):
+            request = requests.example()
+            request.serviceName = 'service-%d' % i
+            response = responses.example()
+            cass.record(request, response)
+            interactions.append((request, response))
+
+    with Cassette(str(path), matchers=('serviceName',)) as cass:
+        for request, response in reversed(interactions):
+            request.endpoint = 'changed'
+            assert cass.replay(request) == response
+        assert len(cass.data) == 50
@@ -0,0 +1,119 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+import pytest
+from hypothesis import given
+
+from tchannel.testing.vcr import jsonl
+from tchannel.testing.vcr.cassette import Cassette
+from tchannel.testing.vcr.cassette import Interaction
+from tchannel.testing.vcr.exceptions import UnsupportedVersionError
+from tchannel.testing.vcr.record_modes import RecordMode
+
+from .strategies import requests, responses
+
+
+@pytest.fixture
+def path(tmpdir):
+    return tmpdir.join('data.jsonl')
+
+
+@given(requests, responses)
+def test_round_trip(request, response):
+    interaction = Interaction(request, response).to_primitive()
+    data = jsonl.load(jsonl.dump({
+        'version': 1, 'interactions': [interaction, interaction],
+    }))
+
+    assert data['version'] == 1
+    assert [Interaction.to_native(i) for i in data['interactions']] == [
+        Interaction(request, response)
+    ] * 2
+
+
+def test_empty_file(path):
+    path.write('')
+    cass = Cassette(str(path), serializer=jsonl)
+    assert cass.existed
+    assert len(cass.data) == 0
+
+
+def test_unsupported_version(path):
+    path.write('{"version": 2}\n')
+
+    with pytest.raises(UnsupportedVersionError):
+        Cassette(str(path), serializer=jsonl)
+
+
+def test_record_appends(path):
+    req1, res1 = requests.example(), responses.example()
+    req2, res2 = requests.example(), responses.example()
+    req2.serviceName = req1.serviceName + 'other'
+
+    with Cassette(str(path), serializer=jsonl) as cass:
+        cass.record(req1, res1)
+
+    recorded = path.read()
+    assert len(recorded.splitlines()) == 2
+
+    with Cassette(
+        str(path), serializer=jsonl, record_mode=RecordMode.NEW_EPISODES
+    ) as cass:
+        assert cass.replay(req1) == res1
+        cass.record(req2, res2)
+
+    assert path.read().startswith(recorded)
+    with Cassette(str(path), serializer=jsonl) as cass:
+        assert cass.replay(req2) == res2
+        assert cass.replay(req1) == res1
+        assert cass.play_count == 2
+
+
+def test_interactions_are_read_as_needed(path):
+    request, response = requests.example(), responses.example()
+
+    with Cassette(str(path), serializer=jsonl) as cass:
+        cass.record(request, response)
+    path.write('not json\n', mode='a')
+
+    with Cassette(str(path), serializer=jsonl) as cass:
+        assert cass.replay(request) == response
+
+        with pytest.raises(ValueError):
+            cass.data
+
+
+def test_record_mode_all_rewrites(path):
+    req = requests.example()
+    res1, res2 = responses.example(), responses.example()
+
+    with Cassette(str(path), serializer=jsonl) as cass:
+        cass.record(req, res1)
+
+    with Cassette(
+        str(path), serializer=jsonl, record_mode=RecordMode.ALL
+    ) as cass:
+        cass.record(req, res2)
+
+    assert len(path.read().splitlines()) == 2
+    with Cassette(str(path), serializer=jsonl) as cass:
+        assert cass.replay(req) == res2
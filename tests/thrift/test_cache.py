@@ -0,0 +1,124 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+import subprocess
+import sys
+
+import mock
+import pytest
+
+from tchannel import thrift
+from tchannel.thrift import cache
+
+
+@pytest.fixture
+def idl(tmpdir):
+    path = tmpdir.join('service.thrift')
+    path.write(
+        'struct Item { 1: required string key }\n'
+        'service Service { Item get(1: string key) }\n'
+    )
+    return path
+
+
+def test_load_caches_parsed_idl(tmpdir, idl):
+    cache_dir = tmpdir.join('cache')
+
+    module = thrift.load(str(idl), service='svc', cache_dir=str(cache_dir))
+    assert module.Item(key='foo').key == 'foo'
+    assert len(cache_dir.listdir()) == 1
+
+    # A fresh loader, as in another process, doesn't parse the IDL again.
+    cache._loaders.clear()
+    parser = cache.get_loader(str(cache_dir)).compiler.parser
+    with mock.patch.object(parser.parser, 'parse') as parse:
+        module = thrift.load(
+            str(idl), service='svc', cache_dir=str(cache_dir)
+        )
+    assert not parse.called
+    assert module.Service.get('foo').call_args.key == 'foo'
+
+
+def test_cache_key_includes_contents(tmpdir, idl):
+    cache_dir = str(tmpdir.join('cache'))
+    parser = cache.get_loader(cache_dir).compiler.parser
+
+    first = parser.parse(idl.read())
+    second = parser.parse(idl.read() + 'const i32 answer = 42\n')
+    assert first != second
+    assert len(tmpdir.join('cache').listdir()) == 2
+
+
+def test_corrupt_entry_is_ignored(tmpdir, idl):
+    cache_dir = tmpdir.join('cache')
+    parser = cache.get_loader(str(cache_dir)).compiler.parser
+
+    program = parser.parse(idl.read())
+    [entry] = cache_dir.listdir()
+    entry.write('not a pickle')
+
+    assert parser.parse(idl.read()) == program
+    assert entry.read() != 'not a pickle'
+
+
+def test_default_dir(tmpdir, idl):
+    cache.set_default_dir(str(tmpdir.join('cache')))
+    try:
+        thrift.load(str(idl))
+    finally:
+        cache.set_default_dir(None)
+    assert len(tmpdir.join('cache').listdir()) == 1
+
+    assert cache.get_loader() is None
+
+
+@pytest.mark.parametrize('version', ['0.5.0', '2.0.0', 'dev'])
+def test_unsupported_thriftrw_is_not_cached(tmpdir, idl, version):
+    cache_dir = tmpdir.join('cache')
+    with mock.patch('thriftrw.__version__', version):
+        assert cache.get_loader(str(cache_dir)) is None
+        module = thrift.load(
+            str(idl), service='svc', cache_dir=str(cache_dir)
+        )
+    assert module.Item(key='foo').key == 'foo'
+    assert not cache_dir.exists()
+
+
+def test_thriftrw_without_compiler_parser_is_not_cached(tmpdir, idl):
+    cache_dir = tmpdir.join('cache')
+    with mock.patch.object(cache, 'Loader') as Loader:
+        Loader.return_value = object()
+        assert cache.get_loader(str(cache_dir)) is None
+
+
+def test_health_meta_is_lazy():
+    # In a new interpreter, since other tests already created TChannels.
+    subprocess.check_call([sys.executable, '-c', '\n'.join([
+        'import sys',
+        'import tchannel',
+        'assert "tchannel.health.health.meta" not in sys.modules',
+        'tchannel.TChannel("foo")',
+        'assert "tchannel.health.health.meta" in sys.modules',
+        'from tchannel.health import Meta, HealthStatus',
+        'assert Meta.health',
+        'assert HealthStatus(ok=True).ok',
+    ])])
@@ -0,0 +1,170 @@
+# Copyright (c) 2016 Uber Technologies, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import absolute_import
+
+import struct
+
+import mock
+import pytest
+from jaeger_client import Tracer, ConstSampler
+from jaeger_client.reporter import InMemoryReporter
+
+from tchannel import TChannel
+from tchannel.messages.common import Tracing
+from tchannel.tornado.request import Request
+from tchannel.tornado.response import Response
+from tchannel.zipkin.reporter import SpanReporter
+from tchannel.zipkin.reporter import load_tcollector
+
+
+@pytest.fixture
+def tracer():
+    return Tracer(
+        service_name='test-tracer',
+        sampler=ConstSampler(True),
+        reporter=InMemoryReporter(),
+    )
+
+
+@pytest.fixture
+def collector(io_loop):
+    collector = TChannel('tcollector')
+    collector.spans = []
+    tcollector = load_tcollector()
+
+    @collector.thrift.register(tcollector.TCollector)
+    def submitBatch(request):
+        collector.spans.extend(request.body.spans)
+        return [tcollector.Response(ok=True) for _ in request.body.spans]
+
+    collector.listen()
+    return collector
+
+
+def request(traceflags=1, span_id=1):
+    return Request(
+        id=span_id,
+        service='service',
+        endpoint='endpoint',
+        headers={'as': 'json'},
+        tracing=Tracing(
+            span_id=span_id, parent_id=0, trace_id=42, traceflags=traceflags,
+        ),
+    )
+
+
+@pytest.mark.gen_test
+def test_reports_sampled_calls(tracer, collector):
+    server = TChannel('server', tracer=tracer)
+
+    @server.json.register('hello')
+    def hello(request):
+        return 'world'
+
+    server.listen()
+
+    client = TChannel('client', tracer=tracer)
+    reporter = SpanReporter(client, hostport=collector.hostport)
+    client.hooks.register(reporter)
+
+    yield client.json('server', 'hello', hostport=server.hostport)
+    yield client.json('server', 'hello', hostport=server.hostport, trace=False)
+
+    assert len(reporter.buffer) == 1
+    yield reporter.flush()
+    assert not reporter.buffer
+    assert reporter.failed == 0
+
+    span, = collector.spans
+    assert span.name == 'hello'
+    assert span.host.serviceName == 'client'
+    assert [a.value for a in span.annotations] == ['cs', 'cr']
+    assert span.annotations[0].timestamp <= span.annotations[1].timestamp
+    assert [(a.key, a.stringValue) for a in span.binaryAnnotations] == [
+        ('as', 'json'),
+    ]
+    assert len(span.traceId) == 8
+
+
+def test_records_server_spans():
+    reporter = SpanReporter(TChannel('server'))
+
+    reporter.before_receive_request(request())
+    reporter.before_receive_request(request(span_id=2))
+    reporter.before_receive_request(request(traceflags=0, span_id=3))
+    reporter.after_send_response(Response(tracing=request().tracing))
+
+    span, = reporter.buffer
+    assert span.kind == 'server'
+    assert span.endpoint == 'endpoint'
+    assert span.error is None
+
+    thrift_span = reporter._to_thrift(load_tcollector(), span)
+    assert thrift_span.host.serviceName == 'service'
+    assert thrift_span.id == struct.pack('>Q', 1)
+    assert [a.value for a in thrift_span.annotations] == ['sr', 'ss']
+
+
+def test_drops_oldest_spans_when_full():
+    reporter = SpanReporter(TChannel('client'), capacity=2)
+
+    for span_id in range(1, 5):
+        reporter.before_send_request(request(span_id=span_id))
+        reporter.after_receive_response(request(span_id=span_id), None)
+
+    assert [s.tracing.span_id for s in reporter.buffer] == [3, 4]
+    assert reporter.dropped == 2
+
+
+def test_forgets_calls_that_never_finish():
+    reporter = SpanReporter(
+        TChannel('server'), capacity=2, max_duration=10,
+    )
+
+    with mock.patch('time.time', return_value=100):
+        reporter.before_receive_request(request(span_id=1))
+        reporter.before_receive_request(request(span_id=2))
+        # full of calls whose response was never sent
+        reporter.before_receive_request(request(span_id=3))
+    assert reporter.dropped == 1
+
+    with mock.patch('time.time', return_value=111):
+        reporter.before_receive_request(request(span_id=4))
+        reporter.after_send_response(
+            Response(tracing=request(span_id=4).tracing)
+        )
+
+    assert reporter.expired == 2
+    assert [s.tracing.span_id for s in reporter.buffer] == [4]
+    assert not reporter._server_spans
+
+
+@pytest.mark.gen_test
+def test_submission_failures_are_counted():
+    # no peers are known for the collector
+    reporter = SpanReporter(TChannel('client'))
+
+    reporter.before_send_request(request())
+    reporter.after_receive_error(request(), Exception('great sadness'))
+
+    yield reporter.flush()
+    assert reporter.failed == 1
+    assert not reporter.buffer